@@ -20,10 +20,16 @@ from flask import (
     flash,
     Response,
     stream_with_context,
+    send_file,
+    abort,
+    g,
+    has_request_context,
 )
+from flask.json.provider import DefaultJSONProvider
 from flask_login import (
     LoginManager,
     UserMixin,
+    current_user,
     login_user,
     logout_user,
     login_required,
@@ -31,15 +37,77 @@ from flask_login import (
 
 from werkzeug.security import check_password_hash, generate_password_hash
 from threading import Lock
-from apscheduler.schedulers.background import BackgroundScheduler
 import signal
 import socket
 import threading
 import queue
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import glob
+import sys
+from collections import Counter, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from werkzeug.utils import secure_filename
-import psutil
 import shutil
+import base64
+import hashlib
+import gzip
+import mimetypes
+import hmac
+import mmap
+import sqlite3
+import math
+import random
+import re
+import struct
+import importlib.util
+import urllib.error
+import urllib.parse
+import urllib.request
+from functools import wraps
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyonel; yoksa yalnızca gzip üretilir
+    brotli = None
+
+class StartupTimer:
+    """Açılış aşamalarının sürelerini kaydet"""
+
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self.wall0 = time.time()
+        self.last = self.t0
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.monotonic()
+        self.phases.append(
+            {
+                "phase": phase,
+                "seconds": round(now - self.last, 4),
+                "at": round(now - self.t0, 4),
+            }
+        )
+        self.last = now
+        logger.debug(f"Açılış aşaması tamamlandı: {phase} ({now - self.t0:.3f} sn)")
+
+    def report(self):
+        """Süreç başlangıcından itibaren aşama dökümü"""
+        interpreter = None
+        try:
+            import psutil
+
+            interpreter = round(self.wall0 - psutil.Process().create_time(), 4)
+        except Exception:
+            pass
+        return {
+            "interpreter_and_imports": interpreter,
+            "phases": list(self.phases),
+            "total": self.phases[-1]["at"] if self.phases else 0.0,
+        }
+
+
+startup_timer = StartupTimer()
 
 # Uygulama dizini
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -48,6 +116,20 @@ LOG_DIR = os.path.join(BASE_DIR, "logs")
 VIDEO_DIR = os.path.join(BASE_DIR, "videos")
 IMAGE_DIR = os.path.join(BASE_DIR, "static", "images")
 MPV_LOG_FILE = os.path.join(LOG_DIR, "mpv.log")
+MPV_SOCKET = "/tmp/mpvsocket"
+PRIMARY_OUTPUT = "main"
+VIDEO_EXTENSIONS = (".mp4",)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+ASSET_CACHE_DIR = os.path.join(BASE_DIR, "cache", "assets")
+ASSET_EXTENSIONS = (".css", ".js")
+ASSET_MAX_AGE = 365 * 24 * 3600
+LIBRARY_INDEX_FILE = os.path.join(BASE_DIR, "cache", "library_index.json")
+HASH_CHUNK_SIZE = 1024 * 1024
+PLAYLIST_DIR = os.path.join(BASE_DIR, "cache", "playlists")
+RECORDING_DIR = os.path.join(BASE_DIR, "recordings")
+PLAYLIST_ORDERS = ("sequential", "shuffle", "weighted")
+PLAYLIST_ITEM_TYPES = ("video", "image", "camera")
 
 
 def load_app_config():
@@ -77,10 +159,10 @@ def load_app_config():
 app_config = load_app_config()
 
 
-def get_mpv_log_tail(lines: int = 10) -> str:
+def get_mpv_log_tail(lines: int = 10, path: str = None) -> str:
     """Return the last few lines of the MPV log file for diagnostics."""
     try:
-        with open(MPV_LOG_FILE, "r", encoding="utf-8") as f:
+        with open(path or MPV_LOG_FILE, "r", encoding="utf-8") as f:
             return "".join(f.readlines()[-lines:])
     except Exception as e:
         logger.error(f"MPV log okunamadi: {e}")
@@ -106,6 +188,7 @@ logging.basicConfig(
     ],
 )
 logger = logging.getLogger("PiEkran")
+startup_timer.mark("config_and_logging")
 
 # Flask uygulaması
 app = Flask(__name__)
@@ -144,16 +227,1089 @@ def unauthorized_callback():
     return redirect(url_for("login"))
 
 
+REQUEST_TIMING_DEFAULTS = {
+    "enabled": True,
+    "server_timing": True,
+    "slow_ms": 500,
+    "slow_log_size": 100,
+    "max_profile_seconds": 60,
+}
+# Oturum yüklenmeden sunulan uç noktalar
+UNAUTHENTICATED_ENDPOINTS = ("static", "asset")
+# Kasıtlı beklemeler yavaş istek eşiğine sayılmaz
+TIMING_WAIT_PHASES = ("cpu",)
+TIMING_WAIT_ENDPOINTS = ("profile", "discover_cameras_stream")
+
+
+class RequestTiming:
+    """İstek başına aşama süreleri.
+
+    ``auth`` oturum yükleme ve şifre doğrulaması, ``lock`` oynatıcı kilidinde
+    bekleme, ``json`` yanıt serileştirme, ``handler`` görünüm fonksiyonu,
+    ``total`` tüm istek süresidir. Süreler yalnızca oturum açmış
+    kullanıcılara ``Server-Timing`` başlığında gönderilir; başarısız
+    girişte ``auth`` süresi kullanıcı adının doğruluğunu ele vermez.
+    Kasıtlı beklemeler dışında ``slow_ms`` üstündeki istekler loglanır ve
+    son ``slow_log_size`` tanesi saklanır.
+    """
+
+    def __init__(self, settings=None, clock=time.perf_counter):
+        self.settings = dict(REQUEST_TIMING_DEFAULTS)
+        self.settings.update(settings or {})
+        self.clock = clock
+        self.slow = deque(maxlen=int(self.settings["slow_log_size"]))
+
+    def active(self):
+        return has_request_context() and "request_timing" in g
+
+    def add(self, name, seconds):
+        """Geçerli isteğin aşamasına süre ekle; istek dışında yok sayılır"""
+        if not self.active():
+            return
+        phases = g.request_timing["phases"]
+        phases[name] = phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add(name, self.clock() - start)
+
+    def begin(self):
+        if self.settings["enabled"]:
+            g.request_timing = {"start": self.clock(), "ready": None, "phases": {}}
+
+    def ready(self):
+        """Ön işlemler bitti; bundan sonrası ``handler`` sayılır"""
+        if self.active():
+            g.request_timing["ready"] = self.clock()
+
+    def finish(self, response):
+        if not self.active():
+            return response
+        timing = g.request_timing
+        now = self.clock()
+        phases = dict(timing["phases"])
+        if timing["ready"] is not None:
+            phases["handler"] = now - timing["ready"]
+        phases["total"] = now - timing["start"]
+        ms = {name: round(seconds * 1000, 2) for name, seconds in phases.items()}
+        if self.settings["server_timing"] and self._authenticated():
+            response.headers["Server-Timing"] = ", ".join(
+                f"{name};dur={value}" for name, value in ms.items()
+            )
+        waited = sum(ms.get(name, 0.0) for name in TIMING_WAIT_PHASES)
+        if (
+            request.endpoint not in TIMING_WAIT_ENDPOINTS
+            and ms["total"] - waited >= float(self.settings["slow_ms"])
+        ):
+            self.slow.append(
+                {
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "phases": ms,
+                }
+            )
+            details = " ".join(f"{name}={value}" for name, value in ms.items() if name != "total")
+            logger.warning(
+                f"Yavaş istek: {request.method} {request.path} {ms['total']} ms ({details})"
+            )
+        return response
+
+    @staticmethod
+    def _authenticated():
+        if request.endpoint in UNAUTHENTICATED_ENDPOINTS:
+            return False
+        return bool(app.config.get("LOGIN_DISABLED") or current_user.is_authenticated)
+
+
+request_timing = RequestTiming(app_config.get("request_timing"))
+
+
+class TimedLock:
+    """İstek içinden alındığında bekleme süresini ``lock`` aşamasına yazan kilit"""
+
+    def __init__(self):
+        self._lock = Lock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        request_timing.add("lock", time.perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON yanıt serileştirmesini ``json`` aşaması olarak ölç"""
+
+    def dumps(self, obj, **kwargs):
+        with request_timing.phase("json"):
+            return super().dumps(obj, **kwargs)
+
+
+app.json = TimedJSONProvider(app)
+
+
+@app.before_request
+def begin_request_timing():
+    request_timing.begin()
+    if request_timing.active() and request.endpoint not in UNAUTHENTICATED_ENDPOINTS:
+        # Oturum çerezi burada çözülür; login_required aynı kullanıcıyı kullanır
+        with request_timing.phase("auth"):
+            current_user._get_current_object()
+    request_timing.ready()
+
+
+@app.after_request
+def finish_request_timing(response):
+    return request_timing.finish(response)
+
+
+class SamplingProfiler:
+    """Çalışan süreçteki iş parçacıklarının yığınlarını örnekleyen profil aracı.
+
+    Yeniden başlatma gerektirmez: ``sys._current_frames`` her ``interval``
+    saniyede okunur ve aynı yığınlar sayılarak toplanır. Örnekleme çağıran
+    iş parçacığında çalışır ve kendisini saymaz; aynı anda tek profil çalışır.
+    """
+
+    def __init__(self, settings=None, frames=sys._current_frames, clock=time.monotonic, sleep=time.sleep):
+        self.settings = dict(REQUEST_TIMING_DEFAULTS)
+        self.settings.update(settings or {})
+        self.frames = frames
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = Lock()
+
+    def sample(self, seconds, interval=0.01):
+        """(thread, yığın) -> örnek sayısı ve toplam örnekleme adımı"""
+        seconds = min(float(seconds), float(self.settings["max_profile_seconds"]))
+        interval = max(float(interval), 0.001)
+        if seconds <= 0:
+            raise ValueError("Süre pozitif olmalı")
+        if not self.lock.acquire(blocking=False):
+            raise RuntimeError("Profil zaten çalışıyor")
+        try:
+            own = threading.get_ident()
+            stacks = Counter()
+            ticks = 0
+            deadline = self.clock() + seconds
+            while self.clock() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in self.frames().items():
+                    if ident == own:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                        frame = frame.f_back
+                    stacks[(names.get(ident, str(ident)), tuple(reversed(stack)))] += 1
+                ticks += 1
+                self.sleep(interval)
+            return stacks, ticks
+        finally:
+            self.lock.release()
+
+    @staticmethod
+    def report(stacks, ticks, top=50):
+        """En sık yığınlar ve fonksiyon başına kendi/kapsayıcı örnek sayıları"""
+        threads = Counter()
+        own = Counter()
+        inclusive = Counter()
+        for (thread, stack), count in stacks.items():
+            threads[thread] += count
+            functions = [frame.rsplit(":", 1)[0] for frame in stack]
+            if functions:
+                own[functions[-1]] += count
+            for function in set(functions):
+                inclusive[function] += count
+        return {
+            "ticks": ticks,
+            "samples": sum(stacks.values()),
+            "threads": dict(threads.most_common()),
+            "stacks": [
+                {"thread": thread, "stack": ";".join(stack), "count": count}
+                for (thread, stack), count in stacks.most_common(top)
+            ],
+            "functions": [
+                {"function": function, "self": own[function], "total": inclusive[function]}
+                for function in sorted(inclusive, key=lambda f: (-own[f], -inclusive[f]))[:top]
+            ],
+        }
+
+    @staticmethod
+    def collapsed(stacks):
+        """flamegraph.pl/speedscope için katlanmış yığın metni"""
+        return "".join(
+            f"{';'.join((thread,) + stack)} {count}\n"
+            for (thread, stack), count in sorted(stacks.items())
+        )
+
+
+profiler = SamplingProfiler(app_config.get("request_timing"))
+
+
+
+# Parmak izli statik dosyalar: mantıksal ad -> {"file", "path", "variants"}
+asset_manifest = {}
+# Parmak izli ad -> mantıksal ad
+asset_lookup = {}
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_static_assets():
+    """CSS/JS dosyalarının içerik özetini çıkar ve sıkıştırılmış kopyalarını yaz.
+
+    Sıkıştırılmış dosyalar özet adıyla saklandığından yalnızca içerik
+    değiştiğinde yeniden üretilir; sonraki açılışlarda yalnızca özet hesaplanır.
+    Sıkıştırılmamış içerik de özet adıyla kopyalanır; ``static/`` yeniden
+    başlatmadan değişse bile eski özet adı eski içeriği sunar.
+    """
+    manifest = {}
+    os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+    for name in sorted(os.listdir(STATIC_DIR)):
+        path = os.path.join(STATIC_DIR, name)
+        if not name.endswith(ASSET_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        stem, ext = os.path.splitext(name)
+        fingerprinted = f"{stem}.{digest}{ext}"
+
+        snapshot = os.path.join(ASSET_CACHE_DIR, fingerprinted)
+        if not os.path.exists(snapshot):
+            _write_atomic(snapshot, data)
+
+        variants = {}
+        gz_path = os.path.join(ASSET_CACHE_DIR, fingerprinted + ".gz")
+        if not os.path.exists(gz_path):
+            _write_atomic(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+        variants["gzip"] = gz_path
+        if brotli is not None:
+            br_path = os.path.join(ASSET_CACHE_DIR, fingerprinted + ".br")
+            if not os.path.exists(br_path):
+                _write_atomic(br_path, brotli.compress(data, quality=11))
+            variants["br"] = br_path
+
+        manifest[name] = {"file": fingerprinted, "path": snapshot, "variants": variants}
+
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+    asset_lookup.clear()
+    asset_lookup.update({entry["file"]: name for name, entry in manifest.items()})
+    logger.info(f"Statik dosyalar hazırlandı: {len(manifest)} dosya")
+    return manifest
+
+
+@app.template_global()
+def asset_url(filename):
+    """Şablonlar için parmak izli statik dosya adresi"""
+    entry = asset_manifest.get(filename)
+    if entry is None:
+        return url_for("static", filename=filename)
+    return url_for("asset", filename=entry["file"])
+
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    """Parmak izli statik dosyayı uygun sıkıştırılmış kopyasıyla sun"""
+    name = asset_lookup.get(filename)
+    if name is None:
+        abort(404)
+    entry = asset_manifest[name]
+
+    path, encoding = entry["path"], None
+    for candidate in ("br", "gzip"):
+        if candidate in entry["variants"] and request.accept_encodings[candidate]:
+            path, encoding = entry["variants"][candidate], candidate
+            break
+
+    response = send_file(
+        path,
+        mimetype=mimetypes.guess_type(name)[0],
+        max_age=ASSET_MAX_AGE,
+        etag=filename + (f".{encoding}" if encoding else ""),
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    return response
+
+
+try:
+    build_static_assets()
+except Exception as e:
+    logger.error(f"Statik dosyalar hazırlanamadı: {e}")
+startup_timer.mark("static_assets")
+
+
+def media_dir(kind):
+    """Medya türüne karşılık gelen dizini döndür"""
+    return VIDEO_DIR if kind == "video" else IMAGE_DIR
+
+
+def media_extensions(kind):
+    return VIDEO_EXTENSIONS if kind == "video" else IMAGE_EXTENSIONS
+
+
+class MediaLibrary:
+    """Video ve görsel dizinleri için önbellekli dosya dizini.
+
+    Dizin yalnızca klasörün mtime değeri değiştiğinde veya uygulama içinden
+    ``invalidate`` çağrıldığında yeniden taranır. Her değişiklikte ``version``
+    artar; liste endpoint'leri ETag'i bu sürümden üretir.
+    """
+
+    SORT_KEYS = ("name", "size", "mtime")
+
+    def __init__(self, index_file=None):
+        self.lock = Lock()
+        self.index_file = index_file
+        self.entries = {"video": {}, "image": {}}
+        self.versions = {"video": 0, "image": 0}
+        self._dir_mtimes = {"video": None, "image": None}
+        self._scanned = set()
+        self.played = {"video": {}, "image": {}}
+        self._known = self._load_index()
+
+    def _load_index(self):
+        """Diskteki dizinden önceden hesaplanmış özetleri oku"""
+        known = {"video": {}, "image": {}}
+        if not self.index_file:
+            return known
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for kind in known:
+                known[kind].update(data.get(kind, {}))
+                self.played[kind].update(data.get("played", {}).get(kind, {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Kütüphane dizini okunamadı: {e}")
+        return known
+
+    def _save_index(self):
+        if not self.index_file:
+            return
+        with self.lock:
+            data = {
+                kind: dict(self.entries[kind] if kind in self._scanned else self._known[kind])
+                for kind in self.entries
+            }
+            data["played"] = {kind: dict(self.played[kind]) for kind in self.played}
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            _write_atomic(self.index_file, json.dumps(data).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Kütüphane dizini kaydedilemedi: {e}")
+
+    def invalidate(self, kind):
+        with self.lock:
+            self._dir_mtimes[kind] = None
+
+    def mark_played(self, kind, names):
+        """Dosyaların son oynatılma zamanını kaydet (disk bütçesi LRU sırası için)"""
+        now = time.time()
+        with self.lock:
+            for name in names:
+                self.played[kind][name] = now
+        self._save_index()
+
+    def last_used(self, kind, entry):
+        """Son oynatılma zamanı; hiç oynatılmadıysa dosyanın mtime değeri"""
+        return max(self.played[kind].get(entry["name"], 0), entry["mtime"])
+
+    def refresh(self, kind):
+        """Dizin değiştiyse dosya listesini yeniden tara"""
+        directory = media_dir(kind)
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+
+        with self.lock:
+            if dir_mtime is not None and dir_mtime == self._dir_mtimes[kind]:
+                return self.entries[kind]
+
+            entries = {}
+            if dir_mtime is not None:
+                exts = media_extensions(kind)
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if not entry.name.lower().endswith(exts):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        previous = self.entries[kind].get(entry.name) or self._known[
+                            kind
+                        ].get(entry.name)
+                        digest = None
+                        loudness = None
+                        if (
+                            previous
+                            and previous.get("size") == st.st_size
+                            and previous.get("mtime") == st.st_mtime
+                        ):
+                            digest = previous.get("hash")
+                            loudness = previous.get("loudness")
+                        entries[entry.name] = {
+                            "name": entry.name,
+                            "size": st.st_size,
+                            "mtime": st.st_mtime,
+                            "inode": st.st_ino,
+                            "hash": digest,
+                        }
+                        if kind == "video":
+                            entries[entry.name]["loudness"] = loudness
+
+            if entries != self.entries[kind]:
+                self.entries[kind] = entries
+                self.versions[kind] += 1
+            self._dir_mtimes[kind] = dir_mtime
+            self._scanned.add(kind)
+            return self.entries[kind]
+
+    def version(self, kind):
+        self.refresh(kind)
+        return self.versions[kind]
+
+    def names(self, kind):
+        return list(self.refresh(kind))
+
+    def query(self, kind, sort="name", order="asc", q=None, cursor=None, limit=None):
+        """Sıralı, filtrelenmiş ve sayfalanmış dosya listesi döndür.
+
+        ``cursor`` bir önceki sayfanın sıralama ölçütünü, yönünü ve son
+        öğesinin (sıralama anahtarı, ad) çiftini taşır; böylece sayfalar
+        arasında dosya eklense veya silinse bile öğeler atlanmaz ya da
+        tekrarlanmaz. Bozuk ya da başka bir sıralamaya ait imleçte
+        ``ValueError`` yükseltilir.
+        """
+        if sort not in self.SORT_KEYS:
+            sort = "name"
+        reverse = order == "desc"
+        order = "desc" if reverse else "asc"
+        last = None
+        if cursor:
+            decoded = decode_cursor(cursor)
+            if decoded is None or len(decoded) != 4:
+                raise ValueError("Geçersiz sayfa imleci")
+            if tuple(decoded[:2]) != (sort, order):
+                raise ValueError("Sayfa imleci farklı bir sıralamaya ait")
+            last = tuple(decoded[2:])
+        items = list(self.refresh(kind).values())
+        if q:
+            needle = q.lower()
+            items = [i for i in items if needle in i["name"].lower()]
+        items.sort(key=lambda i: (i[sort], i["name"]), reverse=reverse)
+        total = len(items)
+
+        if last is not None:
+            if reverse:
+                items = [i for i in items if (i[sort], i["name"]) < last]
+            else:
+                items = [i for i in items if (i[sort], i["name"]) > last]
+
+        next_cursor = None
+        if limit is not None and len(items) > limit:
+            items = items[:limit]
+            tail = items[-1]
+            next_cursor = encode_cursor((sort, order, tail[sort], tail["name"]))
+        return items, total, next_cursor
+
+    def ensure_hashes(self, kind):
+        """Özeti bilinmeyen dosyaların içerik özetini hesapla ve dizine yaz"""
+        pending = [
+            dict(e) for e in self.refresh(kind).values() if e.get("hash") is None
+        ]
+        if not pending:
+            return 0
+        directory = media_dir(kind)
+        computed = 0
+        for entry in pending:
+            try:
+                digest = hash_file(os.path.join(directory, entry["name"]))
+            except FileNotFoundError:
+                continue
+            computed += self.record_hash(kind, entry["name"], digest, entry, save=False)
+        if computed:
+            self._save_index()
+        return computed
+
+    def record_hash(self, kind, name, digest, expected=None, save=True):
+        """Bir dosyanın özetini dizine kaydet.
+
+        ``expected`` verilirse dosya boyutu/mtime değişmişse özet yazılmaz.
+        """
+        return self._update_entry(kind, name, "hash", digest, expected, save)
+
+    def record_loudness(self, kind, name, loudness, expected=None, save=True):
+        """Giriş sırasında ölçülen ses yüksekliğini dizine kaydet"""
+        return self._update_entry(kind, name, "loudness", loudness, expected, save)
+
+    def _update_entry(self, kind, name, field, value, expected=None, save=True):
+        self.refresh(kind)
+        with self.lock:
+            entry = self.entries[kind].get(name)
+            if entry is None:
+                return False
+            if expected and (
+                entry["size"] != expected["size"] or entry["mtime"] != expected["mtime"]
+            ):
+                return False
+            if entry.get(field) == value:
+                return False
+            self.entries[kind] = dict(self.entries[kind])
+            self.entries[kind][name] = dict(entry, **{field: value})
+            self.versions[kind] += 1
+        if save:
+            self._save_index()
+        return True
+
+    def find_by_hash(self, kind, digest, size=None):
+        """Aynı içeriğe sahip ilk dosyanın kaydını döndür.
+
+        Özeti henüz bilinmeyen dosyalardan yalnızca boyutu eşleşenler
+        hesaplanır; boyut verilmezse bunlar arka plan taramasına bırakılır.
+        """
+        entries = self.refresh(kind)
+        for entry in entries.values():
+            if entry.get("hash") == digest and (size is None or entry["size"] == size):
+                return entry
+        if size is None:
+            return None
+        directory = media_dir(kind)
+        for entry in entries.values():
+            if entry.get("hash") is not None or entry["size"] != size:
+                continue
+            try:
+                candidate = hash_file(os.path.join(directory, entry["name"]))
+            except FileNotFoundError:
+                continue
+            self.record_hash(kind, entry["name"], candidate, entry)
+            if candidate == digest:
+                return entry
+        return None
+
+    def duplicates(self, kind):
+        """Aynı içeriğe sahip dosya gruplarını ve boşa harcanan alanı raporla.
+
+        Birbirine sabit bağlı (aynı inode) kopyalar ek yer kaplamadığından
+        israf hesabına katılmaz.
+        """
+        self.ensure_hashes(kind)
+        groups = {}
+        for entry in self.refresh(kind).values():
+            if entry.get("hash"):
+                groups.setdefault(entry["hash"], []).append(entry)
+
+        report = []
+        for digest, members in groups.items():
+            if len(members) < 2:
+                continue
+            inodes = {m["inode"] for m in members}
+            report.append(
+                {
+                    "hash": digest,
+                    "size": members[0]["size"],
+                    "files": sorted(m["name"] for m in members),
+                    "wasted_bytes": members[0]["size"] * (len(inodes) - 1),
+                }
+            )
+        report.sort(key=lambda g: g["wasted_bytes"], reverse=True)
+        return report
+
+    def delete(self, kind, filenames):
+        """Birden fazla dosyayı sil ve dizini tek sefer güncelle"""
+        results = {}
+        directory = media_dir(kind)
+        for filename in filenames:
+            name = secure_filename(filename or "")
+            if not name:
+                results[filename] = "Geçersiz dosya adı"
+                continue
+            path = os.path.join(directory, name)
+            try:
+                os.remove(path)
+                results[filename] = "ok"
+                with self.lock:
+                    self.played[kind].pop(name, None)
+            except FileNotFoundError:
+                results[filename] = "Dosya bulunamadı"
+            except Exception as e:
+                logger.error(f"Dosya silinirken hata ({path}): {e}")
+                results[filename] = str(e)
+        self.invalidate(kind)
+        return results
+
+
+def hash_file(path):
+    """Dosyanın BLAKE2b içerik özetini parça parça okuyarak hesapla"""
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_upload(file, kind, directory):
+    """Yüklenen dosyayı yazarken özetini hesapla.
+
+    Dosya önce geçici ada yazılır; aynı içerik kütüphanede zaten varsa yeni
+    ad mevcut dosyaya sabit bağlanır ve ikinci kopya diskte yer kaplamaz.
+    """
+    filename = secure_filename(file.filename)
+    if not filename:
+        return None, None
+    path = os.path.join(directory, filename)
+    # Aynı adla eşzamanlı yüklemeler birbirinin geçici dosyasını ezmesin
+    tmp_path = f"{path}.{os.urandom(4).hex()}.part"
+    h = hashlib.blake2b(digest_size=32)
+    try:
+        with open(tmp_path, "wb") as out:
+            for chunk in iter(lambda: file.stream.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+                out.write(chunk)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    digest = h.hexdigest()
+
+    existing = library.find_by_hash(kind, digest, os.path.getsize(tmp_path))
+    if existing and existing["name"] != filename:
+        try:
+            link_media(kind, existing["name"], filename)
+            os.remove(tmp_path)
+            logger.info(f"Aynı içerik zaten mevcut, bağlandı: {filename} -> {existing['name']}")
+        except OSError:
+            os.replace(tmp_path, path)
+    else:
+        os.replace(tmp_path, path)
+    library.invalidate(kind)
+    library.record_hash(kind, filename, digest)
+    return filename, digest
+
+
+def link_media(kind, source_name, target_name):
+    """Mevcut bir dosyayı yeni ad altında sabit bağla (olmazsa kopyala)"""
+    directory = media_dir(kind)
+    source = os.path.join(directory, source_name)
+    target = os.path.join(directory, target_name)
+    tmp_target = f"{target}.{os.urandom(4).hex()}.link"
+    try:
+        os.link(source, tmp_target)
+    except OSError:
+        shutil.copy2(source, tmp_target)
+    os.replace(tmp_target, target)
+    library.invalidate(kind)
+
+
+def encode_cursor(key):
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return tuple(value)
+    except Exception:
+        return None
+
+
+def order_playlist_items(items, order="sequential", rng=None):
+    """Oynatma listesi öğelerini istenen sıralama kuralına göre diz.
+
+    ``weighted`` düzgün ağırlıklı round-robin kullanır: ağırlığı 3 olan bir
+    öğe, ağırlığı 1 olanlardan üç kat sık ve aralarına dağılmış şekilde çalar.
+    """
+    items = list(items)
+    if order == "shuffle":
+        (rng or random).shuffle(items)
+        return items
+    if order != "weighted" or not items:
+        return items
+
+    weights = [max(1, int(item.get("weight", 1))) for item in items]
+    total = sum(weights)
+    current = [0] * len(items)
+    sequence = []
+    for _ in range(min(total, 1000)):
+        for i, w in enumerate(weights):
+            current[i] += w
+        best = max(range(len(items)), key=lambda i: current[i])
+        current[best] -= total
+        sequence.append(items[best])
+    return sequence
+
+
+def compile_playlist(playlist, cameras, rng=None):
+    """Oynatma listesi tanımını mpv'nin oynatacağı giriş listesine çevir.
+
+    Her giriş ``{"type", "path", "title", "duration"}`` içerir; eksik dosyalar
+    ve tanımsız kameralar uyarıyla atlanır.
+    """
+    camera_urls = {c.get("name"): c.get("url") for c in cameras}
+    image_duration = playlist.get("image_duration", 5)
+    entries = []
+    for item in order_playlist_items(playlist.get("items", []), playlist.get("order"), rng):
+        kind = item.get("type")
+        duration = item.get("duration")
+        if kind in ("video", "image"):
+            name = secure_filename(item.get("file") or "")
+            path = os.path.join(media_dir(kind), name)
+            if not name or not os.path.exists(path):
+                logger.warning(f"Oynatma listesi öğesi bulunamadı: {item.get('file')}")
+                continue
+            if kind == "image" and not duration:
+                duration = image_duration
+            title = name
+        elif kind == "camera":
+            path = camera_urls.get(item.get("name"))
+            if not path:
+                logger.warning(f"Oynatma listesindeki kamera tanımsız: {item.get('name')}")
+                continue
+            title = item.get("name")
+        else:
+            continue
+        entries.append(
+            {"type": kind, "path": path, "title": title, "duration": duration}
+        )
+    return entries
+
+
+def playlist_file_basename(name):
+    return f"{secure_filename(name) or 'playlist'}.m3u"
+
+
+def write_playlist_file(name, entries):
+    """Girişleri m3u dosyasına yaz ve yolunu döndür"""
+    os.makedirs(PLAYLIST_DIR, exist_ok=True)
+    path = os.path.join(PLAYLIST_DIR, playlist_file_basename(name))
+    lines = ["#EXTM3U"]
+    for entry in entries:
+        lines.append(f"#EXTINF:{entry['duration'] or -1},{entry['title']}")
+        lines.append(entry["path"])
+    _write_atomic(path, ("\n".join(lines) + "\n").encode("utf-8"))
+    return path
+
+
+def validate_playlist(data):
+    """API'den gelen oynatma listesini doğrula; (liste, hata) döndür"""
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return None, "Oynatma listesi öğeleri belirtilmedi"
+    order = data.get("order", "sequential")
+    if order not in PLAYLIST_ORDERS:
+        return None, f"Geçersiz sıralama: {order}"
+    cleaned = []
+    for item in items:
+        if not isinstance(item, dict) or item.get("type") not in PLAYLIST_ITEM_TYPES:
+            return None, "Geçersiz oynatma listesi öğesi"
+        if item["type"] == "camera" and not item.get("name"):
+            return None, "Kamera öğesi için ad gerekli"
+        if item["type"] != "camera" and not item.get("file"):
+            return None, "Dosya adı belirtilmedi"
+        entry = {"type": item["type"]}
+        for key in ("file", "name"):
+            if item.get(key):
+                entry[key] = item[key]
+        for key in ("duration", "weight"):
+            if item.get(key) is not None:
+                try:
+                    value = float(item[key])
+                except (TypeError, ValueError):
+                    return None, f"Geçersiz {key} değeri"
+                if value <= 0:
+                    return None, f"Geçersiz {key} değeri"
+                entry[key] = int(value) if key == "weight" else value
+        cleaned.append(entry)
+    playlist = {"items": cleaned, "order": order, "loop": bool(data.get("loop", True))}
+    if data.get("image_duration"):
+        playlist["image_duration"] = float(data["image_duration"])
+    return playlist, None
+
+
+def wait_for_exit(process, timeout):
+    """Süreç kapanana kadar en fazla ``timeout`` saniye bekle"""
+    deadline = time.monotonic() + timeout
+    while process.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return process.poll() is not None
+
+
+def wait_until(check, timeout, interval=0.1):
+    """``check()`` doğru dönene kadar bekle; zaman aşımında False döndür"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if check():
+                return True
+        except Exception as e:
+            logger.debug(f"Hazırlık kontrolü hatası: {e}")
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def display_ready():
+    """Görüntü sunucusu (Wayland/X11) veya DRM cihazı kullanılabilir mi"""
+    wayland = os.environ.get("WAYLAND_DISPLAY")
+    if wayland:
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+        return os.path.exists(
+            wayland if os.path.isabs(wayland) else os.path.join(runtime_dir, wayland)
+        )
+    display = os.environ.get("DISPLAY")
+    if display:
+        host, _, number = display.rpartition(":")
+        if host not in ("", "unix"):
+            # Uzak X sunucusu: yerelde kontrol edilecek soket yok
+            return True
+        return os.path.exists(f"/tmp/.X11-unix/X{number.split('.')[0]}")
+    return bool(glob.glob("/dev/dri/card*")) or os.path.exists("/dev/fb0")
+
+
+def media_ready(config):
+    """Medya dizini (ve yapılandırılmışsa bağlama noktası) hazır mı"""
+    mount = config.get("media_mount")
+    if mount and not os.path.ismount(mount):
+        return False
+    return os.path.isdir(VIDEO_DIR) and os.access(VIDEO_DIR, os.R_OK | os.X_OK)
+
+
+class MpvIPCError(Exception):
+    """mpv IPC komutu başarısız oldu veya soket erişilemez"""
+
+
+class MpvIPC:
+    """mpv JSON IPC soketi için kalıcı bağlantılı komut istemcisi.
+
+    Yanıtlar ``request_id`` ile eşleştirilir; mpv'nin kendiliğinden gönderdiği
+    olaylar (``end-file``, ``property-change`` vb.) ``add_listener`` ile
+    kaydedilen fonksiyonlara iletilir. mpv yeniden başlatıldığında bağlantı
+    bir sonraki komutta otomatik olarak yenilenir.
+    """
+
+    def __init__(self, path, timeout=1.0):
+        self.path = path
+        self.timeout = timeout
+        self.lock = Lock()
+        self.sock = None
+        self.pending = {}
+        self.next_id = 0
+        self.listeners = []
+        self.observed = {}
+
+    def add_listener(self, callback):
+        """Olay dinleyicisi ekle.
+
+        Dinleyiciler okuma iş parçacığında çağrılır; içlerinden ``command``
+        çağrılmamalıdır (yanıtı okuyacak iş parçacığı beklemede kalır).
+        """
+        self.listeners.append(callback)
+
+    def wait_ready(self, timeout=5.0):
+        """mpv IPC soketi komut kabul edene kadar bekle"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.command("get_property", "pid")
+                return True
+            except MpvIPCError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.1)
+
+    def observe(self, name, observe_id):
+        """Bağlantı her kurulduğunda tekrar gözlenecek bir özellik kaydet"""
+        self.observed[observe_id] = name
+        if self.sock is not None:
+            try:
+                self.command("observe_property", observe_id, name)
+            except MpvIPCError:
+                pass
+
+    def connected(self):
+        return self.sock is not None
+
+    def _connect(self):
+        if not os.path.exists(self.path):
+            raise MpvIPCError("MPV soketi bulunamadı")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            raise MpvIPCError(f"MPV soketine bağlanılamadı: {e}")
+        self.sock = sock
+        threading.Thread(target=self._reader, args=(sock,), daemon=True).start()
+        return sock
+
+    def _reader(self, sock):
+        buffer = b""
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                break
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if "request_id" in msg and "event" not in msg:
+                    waiter = self.pending.pop(msg["request_id"], None)
+                    if waiter is not None:
+                        waiter.put(msg)
+                elif "event" in msg:
+                    for callback in list(self.listeners):
+                        try:
+                            callback(msg)
+                        except Exception as e:
+                            logger.debug(f"IPC olay dinleyicisi hatası: {e}")
+        with self.lock:
+            if self.sock is sock:
+                self.sock = None
+        for waiter in list(self.pending.values()):
+            waiter.put({"error": "disconnected"})
+        for callback in list(self.listeners):
+            try:
+                callback({"event": "ipc-disconnected"})
+            except Exception:
+                pass
+
+    def command(self, *args, timeout=None):
+        """Komutu gönder ve ``data`` alanını döndür"""
+        waiter = queue.Queue(maxsize=1)
+        resubscribe = False
+        with self.lock:
+            sock = self.sock
+            if sock is None:
+                sock = self._connect()
+                resubscribe = bool(self.observed)
+            self.next_id += 1
+            request_id = self.next_id
+            self.pending[request_id] = waiter
+            payload = json.dumps({"command": list(args), "request_id": request_id}) + "\n"
+            try:
+                sock.sendall(payload.encode("utf-8"))
+            except OSError as e:
+                self.pending.pop(request_id, None)
+                self.sock = None
+                sock.close()
+                raise MpvIPCError(f"IPC gönderim hatası: {e}")
+        if resubscribe:
+            for observe_id, name in self.observed.items():
+                self.send_nowait("observe_property", observe_id, name)
+        try:
+            reply = waiter.get(timeout=timeout or self.timeout)
+        except queue.Empty:
+            self.pending.pop(request_id, None)
+            raise MpvIPCError(f"IPC zaman aşımı: {args[0]}")
+        if reply.get("error") != "success":
+            raise MpvIPCError(f"{args[0]}: {reply.get('error')}")
+        return reply.get("data")
+
+    def send_nowait(self, *args):
+        """Yanıt beklemeden komut gönder"""
+        with self.lock:
+            sock = self.sock or self._connect()
+            payload = json.dumps({"command": list(args)}) + "\n"
+            try:
+                sock.sendall(payload.encode("utf-8"))
+            except OSError as e:
+                raise MpvIPCError(f"IPC gönderim hatası: {e}")
+
+    def get_property(self, name, default=None):
+        try:
+            return self.command("get_property", name)
+        except MpvIPCError:
+            return default
+
+    def set_property(self, name, value):
+        return self.command("set_property", name, value)
+
+    def close(self):
+        with self.lock:
+            sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
 
 class MediaPlayer:
     """MPV media player kontrolcüsü"""
 
-    def __init__(self):
+    def __init__(self, output=None, config=None):
         self.current_process = None
         self.current_source = None
-        self.lock = Lock()
+        self.lock = TimedLock()
         self.automation_paused = False
-        self.config = self.load_config()
+        self.config = config if config is not None else self.load_config()
+        self.config_version = 0
+        # Ek çıkışlar yapılandırmayı ana çıkışla paylaşır; kendi ayarları ``output`` içindedir
+        self.output = output
+        if output is None:
+            self.name = self.config.get("output_name", PRIMARY_OUTPUT)
+            self.ipc_socket = self.config.get("ipc_socket", MPV_SOCKET)
+        else:
+            self.name = output["name"]
+            self.ipc_socket = output.get("ipc_socket") or f"{MPV_SOCKET}-{self.name}"
+        self.ipc = MpvIPC(self.ipc_socket)
+        self.current_camera = None
+        self.camera_stalled = False
+        self.camera_fallback = False
+        self.current_playlist = None
+        self.current_replay = None
+        self.playlist_entries = []
+        self.current_media = []
+        # mpv oynatma listesi kimliği -> derlenmiş giriş
+        self._playlist_ids = {}
+        self._loading_entry = None
+        self._shuffle_playlist = None
+        self._item_timer = None
+        self._item_generation = 0
+        self.resume_point = None
+        self.ipc.add_listener(self._on_playlist_event)
 
         log_level = self.config.get("log_level", "INFO").upper()
         level_value = getattr(logging, log_level, logging.INFO)
@@ -162,8 +1318,8 @@ class MediaPlayer:
 
         self.videos = self.get_video_files()
 
-        self.scheduler = BackgroundScheduler(timezone="Europe/Istanbul")
-        self.start_scheduler()
+        # Zamanlayıcı ilk kare ekrana geldikten sonra başlatılır (bkz. startup_sequence)
+        self._scheduler = None
 
         if not os.environ.get("DISPLAY"):
             logger.warning("DISPLAY değişkeni tanımsız. mpv görüntü açamayabilir.")
@@ -202,12 +1358,38 @@ class MediaPlayer:
         try:
             with open(CONFIG_FILE, "w", encoding="utf-8") as f:
                 json.dump(self.config, f, indent=4)
+            self.config_version += 1
             logger.info("Yapılandırma kaydedildi")
             return True
         except Exception as e:
             logger.error(f"Yapılandırma kaydedilemedi: {e}")
             return False
 
+    def mpv_options(self):
+        """Ortak mpv seçenekleri; ek çıkışın seçenekleri (ekran, ses aygıtı) sona eklenir"""
+        options = list(self.config.get("mpv_options", []))
+        if self.output is not None:
+            options += self.output.get("mpv_options", [])
+        return options
+
+    def schedule_rules(self):
+        if self.output is None:
+            return self.config.get("schedule", [])
+        return self.output.get("schedule", [])
+
+    def playlist_file_name(self, name):
+        """Çıkışlar aynı listeyi farklı sırayla oynatabileceğinden dosya adları ayrılır"""
+        return name if self.output is None else f"{self.name}-{name}"
+
+    def playlist_files(self):
+        """Oynatılmakta olan derlenmiş m3u dosyalarının adları; disk bütçesi bunları silmez"""
+        names = []
+        if self.current_playlist:
+            names.append(self.playlist_file_name(self.current_playlist))
+        if self.current_replay:
+            names.append(self.playlist_file_name(f"replay-{self.current_replay}"))
+        return {playlist_file_basename(name) for name in names}
+
     def get_video_files(self):
         try:
             return [f for f in os.listdir(VIDEO_DIR) if f.lower().endswith(".mp4")]
@@ -231,7 +1413,7 @@ class MediaPlayer:
                 try:
                     # Önce kibarca durdur
                     self.current_process.terminate()
-                    time.sleep(1)
+                    wait_for_exit(self.current_process, 1)
 
                     # Hala çalışıyorsa zorla kapat
                     if self.current_process.poll() is None:
@@ -240,6 +1422,10 @@ class MediaPlayer:
 
                     self.current_process = None
                     self.current_source = None
+                    self.current_media = []
+                    self.camera_stalled = False
+                    self.camera_fallback = False
+                    self._clear_playlist()
                     logger.info("Mevcut oynatma durduruldu")
                     return True
                 except Exception as e:
@@ -247,6 +1433,42 @@ class MediaPlayer:
                     return False
             return True
 
+    @property
+    def mpv_log_file(self):
+        """Çıkışa özel mpv günlüğü; başka ekranın hataları karışmaz"""
+        if self.output is None:
+            return MPV_LOG_FILE
+        return os.path.join(os.path.dirname(MPV_LOG_FILE), f"mpv-{self.name}.log")
+
+    def _spawn_mpv(self, cmd):
+        """mpv sürecini başlat; başarısızsa hata mesajını döndür.
+
+        Çağıran ``self.lock`` kilidini tutmalıdır.
+        """
+        if self.config.get("enable_mpv_logging", False):
+            log_target = open(self.mpv_log_file, "a")
+        else:
+            open(self.mpv_log_file, "a").close()
+            log_target = subprocess.DEVNULL
+        try:
+            self.current_process = subprocess.Popen(cmd, stdout=log_target, stderr=log_target)
+            self.ipc.close()
+        finally:
+            if log_target is not subprocess.DEVNULL:
+                log_target.close()
+
+        time.sleep(1)
+        if self.current_process.poll() is not None:
+            logger.error(
+                f"mpv başlatılamadı. Çıkış kodu: {self.current_process.returncode}"
+            )
+            tail = get_mpv_log_tail(path=self.mpv_log_file)
+            msg = "mpv başlatılamadı"
+            if tail:
+                msg += f"\n{tail}"
+            return msg
+        return None
+
     def play_video(self, video_list=None):
         """Video oynat"""
         if not shutil.which("mpv"):
@@ -276,42 +1498,33 @@ class MediaPlayer:
         with self.lock:
             try:
                 # MPV komutunu oluştur
-                cmd = ["mpv"] + self.config.get("mpv_options", [])
-                cmd += ["--input-ipc-server=/tmp/mpvsocket", "--loop-playlist=inf"]
-                cmd += video_paths
+                cmd = ["mpv"] + self.mpv_options()
+                cmd += [f"--input-ipc-server={self.ipc_socket}", "--loop-playlist=inf"]
+                cmd += self._resume_options(video_paths)
+                cmd += self._file_entries(video_paths)
                 if self.config.get("enable_mpv_logging", False):
-                    cmd.append(f"--log-file={MPV_LOG_FILE}")
+                    cmd.append(f"--log-file={self.mpv_log_file}")
 
-                if self.config.get("enable_mpv_logging", False):
-                    log_target = open(MPV_LOG_FILE, "a")
-                else:
-                    open(MPV_LOG_FILE, "a").close()
-                    log_target = subprocess.DEVNULL
-                try:
-                    self.current_process = subprocess.Popen(cmd, stdout=log_target, stderr=log_target)
-                finally:
-                    if log_target is not subprocess.DEVNULL:
-                        log_target.close()
-
-                time.sleep(1)
-                if self.current_process.poll() is not None:
-                    logger.error(
-                        f"mpv başlatılamadı. Çıkış kodu: {self.current_process.returncode}"
-                    )
-                    tail = get_mpv_log_tail()
-                    msg = "mpv başlatılamadı"
-                    if tail:
-                        msg += f"\n{tail}"
-                    return False, msg
+                error = self._spawn_mpv(cmd)
+                if error:
+                    return False, error
 
                 self.current_source = "video"
+                self._set_current_media([("video", p) for p in video_paths])
                 logger.info(f"Video oynatılıyor: {video_paths}")
-                return True, "Video oynatma başlatıldı"
 
             except Exception as e:
                 logger.error(f"Video oynatma hatası: {e}")
                 return False, f"Hata: {str(e)}"
 
+        # Devam konumu tek seferlik atlamadır; döngünün sonraki turları baştan oynar
+        if self._resume_index(video_paths) is not None:
+            if self.ipc.wait_ready():
+                self._seek_resume_point()
+            else:
+                logger.warning("Kayıtlı konum için IPC bağlantısı kurulamadı")
+        return True, "Video oynatma başlatıldı"
+
     def play_camera(self, name=None):
         """Kamera yayınını göster"""
         if not shutil.which("mpv"):
@@ -326,6 +1539,7 @@ class MediaPlayer:
                     break
         if not camera_url and cameras:
             camera_url = cameras[0].get("url")
+            name = cameras[0].get("name")
         if not camera_url:
             logger.error("Kamera URL'si yapılandırılmamış")
             return False, "Kamera yapılandırması eksik"
@@ -337,34 +1551,19 @@ class MediaPlayer:
         with self.lock:
             try:
                 # MPV komutunu oluştur
-                cmd = ["mpv"] + self.config.get("mpv_options", [])
-                cmd += ["--input-ipc-server=/tmp/mpvsocket", camera_url]
+                cmd = ["mpv"] + self.mpv_options()
+                cmd += [f"--input-ipc-server={self.ipc_socket}", camera_url]
                 if self.config.get("enable_mpv_logging", False):
-                    cmd.append(f"--log-file={MPV_LOG_FILE}")
+                    cmd.append(f"--log-file={self.mpv_log_file}")
 
-                if self.config.get("enable_mpv_logging", False):
-                    log_target = open(MPV_LOG_FILE, "a")
-                else:
-                    open(MPV_LOG_FILE, "a").close()
-                    log_target = subprocess.DEVNULL
-                try:
-                    self.current_process = subprocess.Popen(cmd, stdout=log_target, stderr=log_target)
-                finally:
-                    if log_target is not subprocess.DEVNULL:
-                        log_target.close()
-
-                time.sleep(1)
-                if self.current_process.poll() is not None:
-                    logger.error(
-                        f"mpv başlatılamadı. Çıkış kodu: {self.current_process.returncode}"
-                    )
-                    tail = get_mpv_log_tail()
-                    msg = "mpv başlatılamadı"
-                    if tail:
-                        msg += f"\n{tail}"
-                    return False, msg
+                error = self._spawn_mpv(cmd)
+                if error:
+                    return False, error
 
                 self.current_source = "camera"
+                self.current_camera = {"name": name, "url": camera_url}
+                self.camera_stalled = False
+                self.camera_fallback = False
                 logger.info(f"Kamera yayını başlatıldı: {camera_url}")
                 return True, "Kamera yayını başlatıldı"
 
@@ -391,34 +1590,19 @@ class MediaPlayer:
 
         with self.lock:
             try:
-                cmd = ["mpv"] + self.config.get("mpv_options", [])
+                cmd = ["mpv"] + self.mpv_options()
                 cmd += [f"--image-display-duration={interval}", "--loop-playlist=inf"]
+                cmd += [f"--input-ipc-server={self.ipc_socket}"]
+                cmd += self._resume_options(image_paths)
                 if self.config.get("enable_mpv_logging", False):
-                    cmd.append(f"--log-file={MPV_LOG_FILE}")
+                    cmd.append(f"--log-file={self.mpv_log_file}")
                 cmd += image_paths
 
-                if self.config.get("enable_mpv_logging", False):
-                    log_target = open(MPV_LOG_FILE, "a")
-                else:
-                    open(MPV_LOG_FILE, "a").close()
-                    log_target = subprocess.DEVNULL
-                try:
-                    self.current_process = subprocess.Popen(cmd, stdout=log_target, stderr=log_target)
-                finally:
-                    if log_target is not subprocess.DEVNULL:
-                        log_target.close()
-
-                time.sleep(1)
-                if self.current_process.poll() is not None:
-                    logger.error(
-                        f"mpv başlatılamadı. Çıkış kodu: {self.current_process.returncode}"
-                    )
-                    tail = get_mpv_log_tail()
-                    msg = "mpv başlatılamadı"
-                    if tail:
-                        msg += f"\n{tail}"
-                    return False, msg
+                error = self._spawn_mpv(cmd)
+                if error:
+                    return False, error
                 self.current_source = "slayt"
+                self._set_current_media([("image", p) for p in image_paths])
                 logger.info(
                     f"Slayt gösterisi başlatıldı. Gösterilecek resim sayısı: {len(image_paths)}"
                 )
@@ -427,26 +1611,384 @@ class MediaPlayer:
                 logger.error(f"Slayt gösterisi hatası: {e}")
                 return False, f"Hata: {str(e)}"
 
+    def play_playlist(self, name):
+        """Karışık medya oynatma listesini tek mpv çağrısıyla oynat"""
+        if not shutil.which("mpv"):
+            logger.error("mpv oynaticisi bulunamadi")
+            return False, "mpv yüklü değil"
+        playlist = self.config.get("playlists", {}).get(name)
+        if not playlist:
+            return False, "Oynatma listesi bulunamadı"
+        entries = compile_playlist(playlist, self.config.get("cameras", []))
+        if not entries:
+            return False, "Oynatma listesinde oynatılabilir öğe yok"
+        playlist_file = write_playlist_file(self.playlist_file_name(name), entries)
+
+        self.stop_current()
+        self.pause_automation()
+
+        with self.lock:
+            try:
+                cmd = ["mpv"] + self.mpv_options()
+                cmd += [
+                    f"--input-ipc-server={self.ipc_socket}",
+                    # Görsel ve kamera süreleri IPC üzerinden öğe bazında uygulanır
+                    "--image-display-duration=inf",
+                    f"--playlist={playlist_file}",
+                ]
+                cmd += self._resume_options([e["path"] for e in entries])
+                if playlist.get("loop", True):
+                    cmd.append("--loop-playlist=inf")
+                if self.config.get("enable_mpv_logging", False):
+                    cmd.append(f"--log-file={self.mpv_log_file}")
+
+                self.playlist_entries = entries
+                self._playlist_ids = {}
+                self._loading_entry = None
+                # Karışık döngüde her tur yeniden karıştırılır
+                loop = playlist.get("loop", True)
+                self._shuffle_playlist = playlist if loop and playlist.get("order") == "shuffle" else None
+                error = self._spawn_mpv(cmd)
+                if error:
+                    self.playlist_entries = []
+                    return False, error
+
+                self.current_source = "playlist"
+                self.current_playlist = name
+                self._set_current_media(
+                    [(e["type"], e["path"]) for e in entries if e["type"] != "camera"]
+                )
+                logger.info(f"Oynatma listesi başlatıldı: {name} ({len(entries)} öğe)")
+            except Exception as e:
+                logger.error(f"Oynatma listesi hatası: {e}")
+                return False, f"Hata: {str(e)}"
+
+        # Öğe süreleri olaylara bağlı olduğundan IPC bağlantısını hemen kur.
+        # İlk öğe bağlantıdan önce açıldığından süresi burada başlatılır.
+        if self.ipc.wait_ready():
+            self._map_playlist_ids(entries)
+            self._start_current_item(entries)
+            self._seek_resume_point()
+        else:
+            logger.warning("Oynatma listesi için IPC bağlantısı kurulamadı")
+        return True, "Oynatma listesi başlatıldı"
+
+    def play_replay(self, camera, segments):
+        """Kamera kaydı parçalarını oynatma listesiyle göster; bitince canlı yayına dön"""
+        if not shutil.which("mpv"):
+            logger.error("mpv oynaticisi bulunamadi")
+            return False, "mpv yüklü değil"
+        if not segments:
+            return False, "Kayıt bulunamadı"
+        entries = [
+            {
+                "type": "video",
+                "path": s["path"],
+                "title": f"{camera} {datetime.fromtimestamp(s['start']).strftime('%H:%M:%S')}",
+                "duration": None,
+            }
+            for s in segments
+        ]
+        playlist_file = write_playlist_file(self.playlist_file_name(f"replay-{camera}"), entries)
+
+        self.stop_current()
+        self.pause_automation()
+
+        with self.lock:
+            try:
+                cmd = ["mpv"] + self.mpv_options()
+                cmd += [f"--input-ipc-server={self.ipc_socket}", f"--playlist={playlist_file}"]
+                if self.config.get("enable_mpv_logging", False):
+                    cmd.append(f"--log-file={self.mpv_log_file}")
+
+                error = self._spawn_mpv(cmd)
+                if error:
+                    return False, error
+                self.current_source = "tekrar"
+                self.current_replay = camera
+                process = self.current_process
+                logger.info(f"Kamera kaydı oynatılıyor: {camera} ({len(segments)} parça)")
+            except Exception as e:
+                logger.error(f"Kayıt oynatma hatası: {e}")
+                return False, f"Hata: {str(e)}"
+
+        threading.Thread(target=self._resume_after_replay, args=(process, camera), daemon=True).start()
+        return True, "Kayıt oynatma başlatıldı"
+
+    def _resume_after_replay(self, process, camera):
+        process.wait()
+        # Bu arada başka bir kaynağa geçildiyse dokunma
+        if self.current_process is process:
+            logger.info(f"Kayıt bitti, canlı yayına dönülüyor: {camera}")
+            self.play_camera(camera)
+
+    def _file_entries(self, paths):
+        """Dosyaları, girişte ölçülen sabit kazançlarıyla mpv dosya başı seçenek gruplarına sar.
+
+        Grup seçenekleri girişe bağlıdır ve her turda yeniden uygulanır; bu
+        yüzden devam konumu burada değil, ``_seek_resume_point`` ile verilir.
+        """
+        base = 100.0
+        for option in self.mpv_options():
+            if option.startswith("--volume="):
+                base = float(option.split("=", 1)[1])
+        entries, loudest = [], base
+        for path in paths:
+            volume = loudness.volume(os.path.basename(path), base)
+            if volume is None:
+                entries.append(path)
+                continue
+            loudest = max(loudest, volume)
+            entries += ["--{", f"--volume={volume:.1f}", path, "--}"]
+        if loudest > 130:
+            entries.insert(0, f"--volume-max={math.ceil(loudest)}")
+        return entries
+
+    def _resume_index(self, paths):
+        point = self.resume_point
+        if not point or point.get("path") not in paths:
+            return None
+        return paths.index(point["path"])
+
+    def _resume_options(self, paths):
+        """Kayıtlı durumdan devam için oynatma listesi başlangıcı"""
+        index = self._resume_index(paths)
+        return [] if index is None else [f"--playlist-start={index}"]
+
+    def _seek_resume_point(self):
+        """Kayıtlı konuma IPC ile bir kez atla; döngüdeki sonraki turlar baştan oynar"""
+        point = self.resume_point
+        if not point or not point.get("time"):
+            return
+        try:
+            if self.ipc.get_property("path") == point["path"]:
+                self.ipc.command("seek", float(point["time"]), "absolute")
+        except MpvIPCError as e:
+            logger.warning(f"Kayıtlı konuma atlanamadı: {e}")
+
+    def _set_current_media(self, items):
+        """Oynatılan dosyaları kaydet; disk bütçesi bunları silmez"""
+        self.current_media = sorted({(kind, os.path.basename(path)) for kind, path in items})
+        for kind in ("video", "image"):
+            names = [n for k, n in self.current_media if k == kind]
+            if names:
+                library.mark_played(kind, names)
+
+    def _clear_playlist(self):
+        self.current_playlist = None
+        self.current_replay = None
+        self.playlist_entries = []
+        self._playlist_ids = {}
+        self._loading_entry = None
+        self._shuffle_playlist = None
+        self._cancel_item_timer()
+
+    def _cancel_item_timer(self):
+        self._item_generation += 1
+        if self._item_timer is not None:
+            self._item_timer.cancel()
+            self._item_timer = None
+
+    def _map_playlist_ids(self, entries):
+        """mpv ``playlist`` kimliklerini listenin sonundaki girişlerle eşle.
+
+        IPC okuma iş parçacığından çağrılmamalıdır.
+        """
+        items = self.ipc.get_property("playlist", []) or []
+        if len(items) < len(entries):
+            return
+        tail = items[len(items) - len(entries):]
+        self._playlist_ids.update(
+            {item["id"]: entry for item, entry in zip(tail, entries) if "id" in item}
+        )
+
+    def _entry_for_id(self, entry_id):
+        entry = self._playlist_ids.get(entry_id)
+        if entry is None and not self._playlist_ids and isinstance(entry_id, int):
+            # Kimlikler henüz okunmadı; mpv ilk listeye 1'den başlayarak kimlik verir
+            if 0 < entry_id <= len(self.playlist_entries):
+                entry = self.playlist_entries[entry_id - 1]
+        return entry
+
+    def _start_current_item(self, entries):
+        """Olayı kaçırılmış, hâlihazırda açık öğenin süresini başlat"""
+        pos = self.ipc.get_property("playlist-pos")
+        if self._item_timer is None and isinstance(pos, int) and 0 <= pos < len(entries):
+            self._start_item_timer(entries[pos])
+
+    def _start_item_timer(self, entry):
+        self._cancel_item_timer()
+        duration = entry.get("duration")
+        if not duration:
+            return
+        generation = self._item_generation
+        timer = threading.Timer(float(duration), self._advance_playlist, args=[generation])
+        timer.daemon = True
+        self._item_timer = timer
+        timer.start()
+
+    def _on_playlist_event(self, event):
+        """Süreli öğeler için bir sonraki öğeye geçişi zamanla.
+
+        Öğe ``start-file`` olayındaki ``playlist_entry_id`` ile belirlenir,
+        süre ``file-loaded`` ile başlar.
+        """
+        if not self.playlist_entries:
+            return
+        if event.get("event") == "start-file":
+            self._cancel_item_timer()
+            entry = self._entry_for_id(event.get("playlist_entry_id"))
+            self._loading_entry = entry
+            entries = self.playlist_entries
+            if (
+                entry is not None
+                and entry is entries[-1]
+                and self._shuffle_playlist is not None
+                and len(entries) > 1
+            ):
+                threading.Thread(
+                    target=self._reshuffle_playlist, args=(self.current_process,), daemon=True
+                ).start()
+        elif event.get("event") == "file-loaded" and self._loading_entry is not None:
+            self._start_item_timer(self._loading_entry)
+
+    def _reshuffle_playlist(self, process):
+        """Turun son öğesi başladı; sıradaki tur için listeyi yeniden karıştır.
+
+        Çalan öğe dışındaki eski tur silinir ve yeni sıra arkasına eklenir;
+        böylece döngü başa sarmadan yeni tura geçer.
+        """
+        playlist = self._shuffle_playlist
+        if playlist is None or self.current_process is not process:
+            return
+        entries = compile_playlist(playlist, self.config.get("cameras", []))
+        if len(entries) < 2:
+            return
+        path = write_playlist_file(self.playlist_file_name(self.current_playlist), entries)
+        try:
+            self.ipc.command("playlist-clear")
+            self.ipc.command("loadlist", path, "append")
+            self._map_playlist_ids(entries)
+        except MpvIPCError as e:
+            logger.warning(f"Oynatma listesi yeniden karıştırılamadı: {e}")
+            return
+        if self.current_process is process:
+            self.playlist_entries = entries
+
+    def _advance_playlist(self, generation):
+        if generation != self._item_generation or self.current_source != "playlist":
+            return
+        try:
+            self.ipc.command("playlist-next", "force")
+        except MpvIPCError as e:
+            logger.warning(f"Oynatma listesinde sonraki öğeye geçilemedi: {e}")
+
+    def save_playlist(self, name, playlist):
+        self.config.setdefault("playlists", {})[name] = playlist
+        return self.save_config()
+
+    def delete_playlist(self, name):
+        playlists = self.config.get("playlists", {})
+        if name not in playlists:
+            return False
+        del playlists[name]
+        return self.save_config()
+
     def get_status(self):
         """Mevcut durumu getir"""
         with self.lock:
             if self.current_process and self.current_process.poll() is None:
+                status_text = f"{self.current_source.capitalize()} oynatılıyor"
+                if self.current_source == "camera" and self.camera_stalled:
+                    status_text = "Kamera yayını donmuş, yeniden bağlanılıyor"
+                elif self.camera_fallback:
+                    status_text = "Kamera kesintisi, yedek video oynatılıyor"
                 return {
+                    "output": self.name,
                     "playing": True,
                     "source": self.current_source,
-                    "status": f"{self.current_source.capitalize()} oynatılıyor",
+                    "status": status_text,
+                    "stalled": self.camera_stalled,
                     "automation_paused": self.automation_paused,
                 }
             else:
                 return {
+                    "output": self.name,
                     "playing": False,
                     "source": None,
                     "status": "Beklemede",
                     "automation_paused": self.automation_paused,
                 }
 
+    def show_splash(self):
+        """Açılışta içerik hazır olana kadar açılış görselini göster"""
+        splash = self.config.get("splash_image") or os.path.join(BASE_DIR, "logo.png")
+        if not os.path.isabs(splash):
+            splash = os.path.join(BASE_DIR, splash)
+        if not shutil.which("mpv") or not os.path.exists(splash):
+            return False, "Açılış görseli gösterilemedi"
+        with self.lock:
+            cmd = ["mpv"] + self.mpv_options()
+            cmd += [
+                f"--input-ipc-server={self.ipc_socket}",
+                "--image-display-duration=inf",
+                splash,
+            ]
+            error = self._spawn_mpv(cmd)
+            if error:
+                return False, error
+            self.current_source = "splash"
+        return True, "Açılış görseli gösteriliyor"
+
+    def restart_camera(self):
+        """Aynı kamerayı otomasyon durumunu değiştirmeden yeniden aç"""
+        camera = self.current_camera
+        if not camera:
+            return False, "Kamera seçili değil"
+        paused = self.automation_paused
+        try:
+            return self.play_camera(camera["name"])
+        finally:
+            self.automation_paused = paused
+
+    def play_fallback(self):
+        """Kamera kesintisinde varsayılan videoyu göster"""
+        camera = self.current_camera
+        paused = self.automation_paused
+        default = (self.output or {}).get("default_video") or self.config.get("default_video")
+        default = os.path.basename(default or "")
+        if default and not os.path.exists(os.path.join(VIDEO_DIR, default)):
+            default = None
+        try:
+            success, message = self.play_video([default] if default else None)
+        finally:
+            self.automation_paused = paused
+        if success:
+            self.current_camera = camera
+            self.camera_fallback = True
+        return success, message
+
+    @property
+    def scheduler(self):
+        if self._scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+
+            self._scheduler = BackgroundScheduler(timezone="Europe/Istanbul")
+        return self._scheduler
+
     def start_scheduler(self):
-        for rule in self.config.get("schedule", []):
+        self.add_schedule_jobs()
+        self.scheduler.start()
+
+    def reload_schedule(self):
+        """Zamanlama kurallarını yapılandırmadan yeniden yükle"""
+        for job in self.scheduler.get_jobs():
+            if job.id.startswith("schedule-"):
+                job.remove()
+        self.add_schedule_jobs()
+
+    def add_schedule_jobs(self):
+        for index, rule in enumerate(self.schedule_rules()):
             days = [d.lower()[:3] for d in rule.get("days", [])]
             start_h, start_m = map(int, rule.get("start", "0:0").split(":"))
             end_h, end_m = map(int, rule.get("end", "0:0").split(":"))
@@ -454,6 +1996,7 @@ class MediaPlayer:
             self.scheduler.add_job(
                 self.apply_schedule_rule,
                 "cron",
+                id=f"schedule-{index}-start",
                 day_of_week=",".join(days),
                 hour=start_h,
                 minute=start_m,
@@ -463,12 +2006,24 @@ class MediaPlayer:
             self.scheduler.add_job(
                 self.play_default,
                 "cron",
+                id=f"schedule-{index}-end",
                 day_of_week=",".join(days),
                 hour=end_h,
                 minute=end_m,
             )
 
-        self.scheduler.start()
+            remote = dict(REMOTE_DEFAULTS, **(self.config.get("remote_sources") or {}))
+            if remote["enabled"] and rule_media(rule, self.config):
+                pre_days, pre_h, pre_m = shift_schedule(days, start_h, start_m, remote["lead_minutes"])
+                self.scheduler.add_job(
+                    prefetch_rule,
+                    "cron",
+                    id=f"schedule-{index}-prefetch",
+                    day_of_week=",".join(pre_days),
+                    hour=pre_h,
+                    minute=pre_m,
+                    args=[rule],
+                )
 
     def apply_schedule_rule(self, rule):
         if self.automation_paused:
@@ -478,6 +2033,8 @@ class MediaPlayer:
         elif rule.get("source") == "video":
             video = rule.get("video")
             self.play_video([video] if video else None)
+        elif rule.get("source") == "playlist":
+            self.play_playlist(rule.get("playlist"))
 
     def play_default(self):
         if self.automation_paused:
@@ -496,39 +2053,2725 @@ class MediaPlayer:
         cams.append(camera_data)
         self.save_config()
 
-    def remove_camera(self, name):
-        cams = self.config.get("cameras", [])
-        self.config["cameras"] = [c for c in cams if c.get("name") != name]
-        self.save_config()
+    def remove_camera(self, name):
+        cams = self.config.get("cameras", [])
+        self.config["cameras"] = [c for c in cams if c.get("name") != name]
+        self.save_config()
+
+    def import_cameras(self, camera_list):
+        """Kameraları toplu ekle; aynı adlı kayıtlar güncellenir"""
+        cams = self.config.setdefault("cameras", [])
+        by_name = {c.get("name"): i for i, c in enumerate(cams)}
+        added = 0
+        for cam in camera_list:
+            if not cam.get("name") or not cam.get("url"):
+                continue
+            if cam["name"] in by_name:
+                cams[by_name[cam["name"]]] = cam
+            else:
+                by_name[cam["name"]] = len(cams)
+                cams.append(cam)
+            added += 1
+        if added:
+            self.save_config()
+        return added
+
+    def remove_cameras(self, names):
+        names = set(names)
+        cams = self.config.get("cameras", [])
+        remaining = [c for c in cams if c.get("name") not in names]
+        removed = len(cams) - len(remaining)
+        if removed:
+            self.config["cameras"] = remaining
+            self.save_config()
+        return removed
+
+    def pause_automation(self):
+        self.automation_paused = True
+
+    def resume_automation(self):
+        self.automation_paused = False
+
+
+CAMERA_WATCHDOG_DEFAULTS = {
+    "enabled": True,
+    "poll_interval": 2,
+    "stall_window": 10,
+    "backoff_initial": 2,
+    "backoff_max": 60,
+    "fallback_after": 30,
+    "history_size": 200,
+}
+
+
+def probe_rtsp(url, timeout=3.0):
+    """RTSP sunucusunun OPTIONS isteğine yanıt verip vermediğini kontrol et"""
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme.lower() not in ("rtsp", "rtsps") or not parsed.hostname:
+        return False
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port or 554), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            request_url = urllib.parse.urlunsplit(
+                (parsed.scheme, parsed.hostname + (f":{parsed.port}" if parsed.port else ""),
+                 parsed.path, parsed.query, "")
+            )
+            sock.sendall(f"OPTIONS {request_url} RTSP/1.0\r\nCSeq: 1\r\n\r\n".encode("ascii"))
+            return sock.recv(64).startswith(b"RTSP/1.0")
+    except OSError:
+        return False
+
+
+class CameraWatchdog:
+    """Canlı kamera yayınında donmayı tespit et ve otomatik kurtar.
+
+    Akışın ilerleyişi ``time-pos`` ve ``estimated-frame-number`` ile izlenir;
+    ``stall_window`` boyunca ilerleme yoksa (veya mpv kapanmışsa) yayın donmuş
+    sayılır. Yeniden bağlanma üstel geri çekilmeyle denenir; kesinti
+    ``fallback_after`` saniyeyi aşarsa varsayılan video gösterilir ve kamera
+    RTSP OPTIONS ile yanıt verdiğinde yayına geri dönülür.
+    """
+
+    def __init__(self, media_player, settings=None, probe=probe_rtsp, clock=time.monotonic):
+        self.player = media_player
+        self.settings = dict(CAMERA_WATCHDOG_DEFAULTS)
+        self.settings.update(settings or {})
+        self.probe = probe
+        self.clock = clock
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.history = deque(maxlen=int(self.settings["history_size"]))
+        self._reset()
+
+    def _reset(self):
+        self.process = None
+        self.marker = None
+        self.last_progress = None
+        self.stall = None
+        self.backoff = float(self.settings["backoff_initial"])
+        self.next_attempt = 0.0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _loop(self):
+        while not self.stop_event.wait(float(self.settings["poll_interval"])):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Kamera izleme hatası: {e}")
+
+    def sample(self):
+        ipc = self.player.ipc
+        return {
+            "time_pos": ipc.get_property("time-pos"),
+            "frame": ipc.get_property("estimated-frame-number"),
+            "paused_for_cache": ipc.get_property("paused-for-cache", False),
+            "cache_duration": ipc.get_property("demuxer-cache-duration"),
+        }
+
+    def check(self):
+        now = self.clock()
+        p = self.player
+        if p.camera_fallback and self.stall is not None:
+            self._check_fallback(now)
+            return
+        if p.current_source != "camera":
+            if self.stall is not None:
+                self._finish_stall(now, "abandoned")
+            self._reset()
+            return
+
+        if p.current_process is not self.process:
+            # Yeni süreç: kendi yeniden bağlanma denememiz olabilir, kesinti sürer
+            self.process = p.current_process
+            self.marker = None
+            self.last_progress = now
+
+        alive = p.current_process is not None and p.current_process.poll() is None
+        sample = self.sample() if alive else None
+        marker = None
+        if sample and not sample["paused_for_cache"]:
+            marker = (sample["time_pos"], sample["frame"])
+        if marker is not None and marker != (None, None):
+            progressed = self.marker is not None and marker != self.marker
+            self.marker = marker
+            if progressed:
+                self.last_progress = now
+                if self.stall is not None:
+                    self._finish_stall(now, "recovered")
+                    self.backoff = float(self.settings["backoff_initial"])
+                return
+
+        if alive and now - self.last_progress < float(self.settings["stall_window"]):
+            return
+
+        if self.stall is None:
+            self.stall = {
+                "camera": (p.current_camera or {}).get("name"),
+                "started": time.time(),
+                "started_mono": self.last_progress if alive else now,
+                "reconnects": 0,
+                "fallback": False,
+                "cache_duration": sample["cache_duration"] if sample else None,
+            }
+            p.camera_stalled = True
+            logger.warning(f"Kamera yayını dondu: {self.stall['camera']}")
+
+        if now < self.next_attempt:
+            return
+        outage = now - self.stall["started_mono"]
+        if outage >= float(self.settings["fallback_after"]):
+            self._enter_fallback(now)
+        else:
+            self._reconnect(now)
+
+    def _schedule_retry(self, now):
+        self.next_attempt = now + self.backoff
+        self.backoff = min(self.backoff * 2, float(self.settings["backoff_max"]))
+
+    def _reconnect(self, now):
+        self.stall["reconnects"] += 1
+        logger.info(
+            f"Kamera yeniden bağlanıyor (deneme {self.stall['reconnects']}, "
+            f"sonraki bekleme {self.backoff:.0f} sn)"
+        )
+        self._schedule_retry(now)
+        self.player.restart_camera()
+        self.player.camera_stalled = True
+        self.process = self.player.current_process
+        self.last_progress = self.clock()
+
+    def _enter_fallback(self, now):
+        logger.warning("Kamera kesintisi uzadı, varsayılan video gösteriliyor")
+        success, _ = self.player.play_fallback()
+        if not success:
+            self._reconnect(now)
+            return
+        self.stall["fallback"] = True
+        self.player.camera_stalled = False
+        self._schedule_retry(now)
+
+    def _check_fallback(self, now):
+        p = self.player
+        if p.current_source != "video":
+            self.player.camera_fallback = False
+            self._finish_stall(now, "abandoned")
+            self._reset()
+            return
+        if now < self.next_attempt:
+            return
+        camera = p.current_camera or {}
+        if camera.get("url") and self.probe(camera["url"]):
+            logger.info("Kamera yeniden erişilebilir, yayına dönülüyor")
+            self.stall["reconnects"] += 1
+            self.player.restart_camera()
+            self.process = self.player.current_process
+            self.marker = None
+            self.last_progress = self.clock()
+            # Görüntü gerçekten akmaya başladığında kesinti kapatılır
+            self.player.camera_stalled = True
+        self._schedule_retry(now)
+
+    def _finish_stall(self, now, outcome):
+        stall = self.stall
+        self.stall = None
+        self.player.camera_stalled = False
+        duration = round(now - stall.pop("started_mono"), 3)
+        stall.update(ended=time.time(), duration=duration, outcome=outcome)
+        self.history.append(stall)
+        logger.info(f"Kamera kesintisi sona erdi ({outcome}): {duration} sn")
+
+    def report(self):
+        current = None
+        if self.stall is not None:
+            current = {k: v for k, v in self.stall.items() if k != "started_mono"}
+            current["duration"] = round(self.clock() - self.stall["started_mono"], 3)
+        durations = [h["duration"] for h in self.history if h["outcome"] == "recovered"]
+        return {
+            "current": current,
+            "history": list(self.history),
+            "stalls": len(self.history),
+            "mean_recovery": round(sum(durations) / len(durations), 3) if durations else None,
+        }
+
+
+SNAPSHOT_DEFAULTS = {
+    "ttl": 10,
+    "max_workers": 4,
+    "timeout": 5,
+    "width": 640,
+    "onvif_retry": 60,
+}
+SNAPSHOT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def onvif_snapshot_uri(camera, timeout):
+    """Kameranın ONVIF ``GetSnapshotUri`` adresi; profil yoksa None"""
+    from onvif import ONVIFCamera
+    from zeep.transports import Transport
+
+    transport = Transport(timeout=timeout, operation_timeout=timeout)
+    cam = ONVIFCamera(
+        camera["ip"],
+        int(camera.get("port") or 80),
+        camera.get("username") or "",
+        camera.get("password") or "",
+        no_cache=True,
+        transport=transport,
+    )
+    media = cam.create_media_service()
+    profiles = media.GetProfiles()
+    if not profiles:
+        return None
+    return media.GetSnapshotUri({"ProfileToken": profiles[0].token}).Uri
+
+
+def fetch_http_snapshot(url, username=None, password=None, timeout=5):
+    """HTTP anlık görüntü adresinden JPEG indir (Digest/Basic kimlik doğrulamalı)"""
+    passwords = urllib.request.HTTPPasswordMgrWithDefaultRealm()
+    if username:
+        passwords.add_password(None, url, username, password or "")
+    opener = urllib.request.build_opener(
+        urllib.request.HTTPDigestAuthHandler(passwords),
+        urllib.request.HTTPBasicAuthHandler(passwords),
+    )
+    with opener.open(url, timeout=timeout) as resp:
+        data = resp.read(SNAPSHOT_MAX_BYTES + 1)
+    if len(data) > SNAPSHOT_MAX_BYTES:
+        raise RuntimeError("Anlık görüntü çok büyük")
+    if not data.startswith(b"\xff\xd8"):
+        raise RuntimeError("Yanıt JPEG değil")
+    return data
+
+
+def grab_rtsp_frame(url, width=640, timeout=5):
+    """Akıştan tek bir kare çözüp küçültülmüş JPEG olarak döndür"""
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin"]
+    if url.startswith("rtsp"):
+        cmd += ["-rtsp_transport", "tcp"]
+    cmd += [
+        "-i", url, "-an", "-frames:v", "1", "-vf", f"scale={int(width)}:-2",
+        "-f", "image2pipe", "-vcodec", "mjpeg", "-q:v", "5", "-",
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Kare alınamadı: zaman aşımı")
+    if result.returncode != 0 or not result.stdout:
+        message = result.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise RuntimeError(message[-1] if message else "Kare alınamadı")
+    return result.stdout
+
+
+class CameraSnapshots:
+    """Kameraların kısa ömürlü önbellekli anlık görüntüleri.
+
+    Görüntü kamerada tanımlı ``snapshot_url`` ya da ONVIF ``GetSnapshotUri``
+    adresinden alınır; ikisi de yoksa RTSP akışından ffmpeg ile tek kare
+    çözülür. Çekimler ``max_workers`` ile sınırlı bir havuzda çalışır. Sonuç
+    (hata dahil) ``ttl`` saniye saklanır ve aynı anda gelen istekler aynı
+    çekimi bekler; böylece kamera başına aralık başına en fazla bir çekim
+    yapılır. İstek çekimi en fazla ``timeout`` saniye bekler; süre dolarsa
+    eski görüntü döner, çekim arka planda önbelleği doldurur. ONVIF adresi
+    kamera başına bir kez sorulur; başarısız sorgu ``onvif_retry`` saniye
+    sonra yinelenir.
+    """
+
+    def __init__(
+        self,
+        settings=None,
+        onvif_uri=onvif_snapshot_uri,
+        http_fetch=fetch_http_snapshot,
+        rtsp_grab=grab_rtsp_frame,
+        clock=time.monotonic,
+    ):
+        self.settings = dict(SNAPSHOT_DEFAULTS)
+        self.settings.update(settings or {})
+        self.onvif_uri = onvif_uri
+        self.http_fetch = http_fetch
+        self.rtsp_grab = rtsp_grab
+        self.clock = clock
+        self.lock = Lock()
+        self.executor = ThreadPoolExecutor(max_workers=int(self.settings["max_workers"]))
+        self.cache = {}
+        self.inflight = {}
+        self.uris = {}
+        self.fetches = 0
+
+    def get(self, camera):
+        """Kameranın (jpeg, hata) çifti; önbellek tazeyse çekim yapılmaz"""
+        key = (camera.get("name"), camera.get("url"))
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached and self.clock() - cached[0] < float(self.settings["ttl"]):
+                return cached[1], cached[2]
+            future = self.inflight.get(key)
+            if future is None:
+                future = self.executor.submit(self._fetch, key, dict(camera))
+                self.inflight[key] = future
+        try:
+            return future.result(timeout=float(self.settings["timeout"]))
+        except FutureTimeoutError:
+            logger.info(f"Kamera anlık görüntüsü bekleniyor ({camera.get('name')})")
+            if cached and cached[1] is not None:
+                return cached[1], None
+            return None, "zaman aşımı"
+
+    def _fetch(self, key, camera):
+        try:
+            data, error = self._capture(camera), None
+        except Exception as e:
+            data, error = None, str(e)
+            logger.warning(f"Kamera anlık görüntüsü alınamadı ({camera.get('name')}): {e}")
+        with self.lock:
+            self.fetches += 1
+            self.cache[key] = (self.clock(), data, error)
+            self.inflight.pop(key, None)
+        return data, error
+
+    def _capture(self, camera):
+        timeout = float(self.settings["timeout"])
+        url = camera.get("snapshot_url") or self._snapshot_uri(camera)
+        if url:
+            try:
+                return self.http_fetch(url, camera.get("username"), camera.get("password"), timeout)
+            except Exception as e:
+                logger.info(f"HTTP anlık görüntü alınamadı, akıştan denenecek ({camera.get('name')}): {e}")
+        if not camera.get("url"):
+            raise RuntimeError("Kamera adresi yok")
+        return self.rtsp_grab(camera["url"], self.settings["width"], timeout)
+
+    def _snapshot_uri(self, camera):
+        if not camera.get("ip"):
+            return None
+        key = (camera["ip"], camera.get("port"), camera.get("username"))
+        with self.lock:
+            cached = self.uris.get(key)
+            if cached and (cached[1] is None or self.clock() < cached[1]):
+                return cached[0]
+        try:
+            uri = self.onvif_uri(camera, float(self.settings["timeout"]))
+        except Exception as e:
+            logger.info(f"ONVIF anlık görüntü adresi alınamadı ({camera['ip']}): {e}")
+            uri = None
+        # Bulunan adres kalıcıdır; bulunamazsa kamera açılınca yeniden sorulur
+        retry = None if uri else self.clock() + float(self.settings["onvif_retry"])
+        with self.lock:
+            self.uris[key] = (uri, retry)
+        return uri
+
+
+RECORDING_DEFAULTS = {
+    "enabled": False,
+    "cameras": [],
+    "segment_seconds": 10,
+    "max_age_minutes": 30,
+    "max_size_mb": 1024,
+    "rtsp_transport": "tcp",
+    "audio": False,
+    "restart_delay": 5,
+}
+RECORDING_NAME_FORMAT = "%Y%m%d-%H%M%S"
+RECORDING_SUFFIX = ".ts"
+
+
+def recording_command(url, directory, settings):
+    """Akışı yeniden kodlamadan sabit süreli MPEG-TS parçalarına yazan ffmpeg komutu"""
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error"]
+    if url.startswith("rtsp://"):
+        cmd += ["-rtsp_transport", settings["rtsp_transport"]]
+    cmd += ["-i", url, "-map", "0:v:0"]
+    if settings["audio"]:
+        cmd += ["-map", "0:a:0?"]
+    cmd += [
+        "-c", "copy",
+        "-f", "segment",
+        "-segment_time", str(settings["segment_seconds"]),
+        "-segment_format", "mpegts",
+        "-reset_timestamps", "1",
+        "-strftime", "1",
+        os.path.join(directory, RECORDING_NAME_FORMAT + RECORDING_SUFFIX),
+    ]
+    return cmd
+
+
+def segment_start(name):
+    """Parça dosya adındaki yerel başlangıç zamanını epoch saniyesine çevir"""
+    try:
+        stamp = datetime.strptime(name[: -len(RECORDING_SUFFIX)], RECORDING_NAME_FORMAT)
+    except ValueError:
+        return None
+    return stamp.timestamp()
+
+
+class CameraRecorder:
+    """Tek kamera için halka kayıt: ffmpeg süreci ve parça dizini.
+
+    ffmpeg akışı ``-c copy`` ile yalnızca paketleyerek yazdığından işlemci
+    yükü ihmal edilebilir düzeydedir. Parçalar başlangıç zamanıyla
+    adlandırılır; ``refresh`` dizini tarar ve ``max_age_minutes`` ile
+    ``max_size_mb`` sınırlarını aşan en eski parçaları siler. Yazılmakta olan
+    en yeni parça hiçbir zaman silinmez.
+    """
+
+    def __init__(self, name, url, settings, directory, spawn=subprocess.Popen, clock=time.time):
+        self.name = name
+        self.url = url
+        self.settings = settings
+        self.directory = directory
+        self.spawn = spawn
+        self.clock = clock
+        self.lock = Lock()
+        self.process = None
+        self.segments = []
+        self.restarts = 0
+        self.next_start = 0.0
+
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def ensure_running(self):
+        """ffmpeg çalışmıyorsa (ilk açılış veya çökme) gecikmeli olarak başlat"""
+        if self.running():
+            return
+        now = self.clock()
+        if now < self.next_start:
+            return
+        if self.process is not None:
+            self.restarts += 1
+            logger.warning(
+                f"Kamera kaydı durdu, yeniden başlatılıyor: {self.name} "
+                f"(çıkış kodu {self.process.returncode})"
+            )
+        os.makedirs(self.directory, exist_ok=True)
+        self.next_start = now + float(self.settings["restart_delay"])
+        self.process = self.spawn(
+            recording_command(self.url, self.directory, self.settings),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def stop(self):
+        process, self.process = self.process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            wait_for_exit(process, 2)
+            if process.poll() is None:
+                process.kill()
+
+    def refresh(self):
+        """Parça dizinini tara ve halkayı yaş/boyut sınırına göre kırp"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(RECORDING_SUFFIX):
+                        continue
+                    start = segment_start(entry.name)
+                    if start is None:
+                        continue
+                    try:
+                        size = entry.stat().st_size
+                    except FileNotFoundError:
+                        continue
+                    entries.append({"path": entry.path, "start": start, "size": size})
+        except FileNotFoundError:
+            pass
+        entries.sort(key=lambda s: s["start"])
+
+        now = self.clock()
+        cutoff = now - float(self.settings["max_age_minutes"]) * 60
+        limit = int(float(self.settings["max_size_mb"]) * 1024 * 1024)
+        total = sum(s["size"] for s in entries)
+        keep = []
+        for i, segment in enumerate(entries):
+            newest = i == len(entries) - 1
+            end = now if newest else entries[i + 1]["start"]
+            if not newest and (end < cutoff or total > limit):
+                try:
+                    os.remove(segment["path"])
+                except OSError as e:
+                    logger.warning(f"Kayıt parçası silinemedi: {e}")
+                    keep.append(segment)
+                    continue
+                total -= segment["size"]
+                continue
+            keep.append(segment)
+        with self.lock:
+            self.segments = keep
+        return keep
+
+    def replay_segments(self, minutes):
+        """Son ``minutes`` dakikayı kapsayan parçalar (eskiden yeniye)"""
+        now = self.clock()
+        since = now - float(minutes) * 60
+        with self.lock:
+            segments = list(self.segments)
+        return [
+            s
+            for i, s in enumerate(segments)
+            if (segments[i + 1]["start"] if i + 1 < len(segments) else now) > since
+        ]
+
+    def status(self):
+        with self.lock:
+            segments = list(self.segments)
+        return {
+            "camera": self.name,
+            "running": self.running(),
+            "restarts": self.restarts,
+            "segments": len(segments),
+            "bytes": sum(s["size"] for s in segments),
+            "oldest": segments[0]["start"] if segments else None,
+            "newest": segments[-1]["start"] if segments else None,
+            "seconds": round(self.clock() - segments[0]["start"]) if segments else 0,
+        }
+
+
+class RecordingManager:
+    """Yapılandırılmış kameralar için halka kayıtçılarını yönet"""
+
+    def __init__(
+        self, media_player, settings=None, directory=None, spawn=subprocess.Popen, clock=time.time
+    ):
+        self.player = media_player
+        self.settings = dict(RECORDING_DEFAULTS)
+        self.settings.update(settings or {})
+        self.directory = directory or RECORDING_DIR
+        self.spawn = spawn
+        self.clock = clock
+        self.recorders = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def targets(self):
+        """Kaydedilecek kameralar: ad -> RTSP adresi"""
+        wanted = set(self.settings["cameras"])
+        return {
+            c["name"]: c["url"]
+            for c in self.player.config.get("cameras", [])
+            if c.get("name") and c.get("url") and (not wanted or c["name"] in wanted)
+        }
+
+    def start(self):
+        if not shutil.which("ffmpeg"):
+            logger.error("ffmpeg bulunamadı, kamera kaydı devre dışı")
+            return False
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        self.stop_event.set()
+        for recorder in self.recorders.values():
+            recorder.stop()
+
+    def _loop(self):
+        self.check()
+        while not self.stop_event.wait(float(self.settings["segment_seconds"])):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Kamera kaydı hatası: {e}")
+
+    def check(self):
+        targets = self.targets()
+        for name in list(self.recorders):
+            recorder = self.recorders[name]
+            if targets.get(name) != recorder.url:
+                recorder.stop()
+                del self.recorders[name]
+        for name, url in targets.items():
+            recorder = self.recorders.get(name)
+            if recorder is None:
+                folder = secure_filename(name) or hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+                directory = os.path.join(self.directory, folder)
+                recorder = CameraRecorder(name, url, self.settings, directory, self.spawn, self.clock)
+                self.recorders[name] = recorder
+                logger.info(f"Kamera kaydı başlatıldı: {name}")
+            recorder.ensure_running()
+            recorder.refresh()
+
+    def status(self):
+        return [r.status() for r in self.recorders.values()]
+
+
+VIDEO_WALL_DEFAULTS = {
+    "enabled": False,
+    "role": "follower",
+    "name": "wall",
+    "group": "239.255.42.42",
+    "port": 42420,
+    "interface": "0.0.0.0",
+    "ttl": 1,
+    "interval": 0.5,
+    "tolerance": 0.04,
+    "seek_threshold": 1.0,
+    "speed_gain": 0.5,
+    "max_speed_adjust": 0.05,
+}
+
+
+class VideoWallSync:
+    """Aynı oynatma listesini çalan ekranları UDP multicast ile hizala.
+
+    Lider, oynatma listesi konumunu ve ``time-pos`` değerini düzenli olarak
+    yayınlar. İzleyiciler farkı ölçer: tolerans içindeyse hız 1.0'a döner,
+    küçük farklar ``speed`` ile yavaşça kapatılır, ``seek_threshold`` üzerindeki
+    farklar ve farklı dosyalar doğrudan atlama ile düzeltilir.
+    """
+
+    def __init__(self, ipc, settings=None, active=None):
+        self.ipc = ipc
+        self.settings = dict(VIDEO_WALL_DEFAULTS)
+        self.settings.update(settings or {})
+        self.active = active or (lambda: True)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.sock = None
+        self.seq = 0
+        self.current_speed = 1.0
+        self.stats = {
+            "role": self.settings["role"],
+            "messages": 0,
+            "last_error": None,
+            "speed_adjustments": 0,
+            "seeks": 0,
+            "switches": 0,
+        }
+
+    def start(self):
+        if self.settings["role"] == "leader":
+            self.sock = self._sender_socket()
+            target = self._leader_loop
+        else:
+            self.sock = self._receiver_socket()
+            target = self._follower_loop
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+        logger.info(
+            f"Video duvarı senkronizasyonu başlatıldı: {self.settings['role']} "
+            f"({self.settings['group']}:{self.settings['port']})"
+        )
+
+    def stop(self):
+        self.stop_event.set()
+        if self.sock is not None:
+            self.sock.close()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def _sender_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, int(self.settings["ttl"]))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        if self.settings["interface"] != "0.0.0.0":
+            sock.setsockopt(
+                socket.IPPROTO_IP,
+                socket.IP_MULTICAST_IF,
+                socket.inet_aton(self.settings["interface"]),
+            )
+        return sock
+
+    def _receiver_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("", int(self.settings["port"])))
+        membership = struct.pack(
+            "4s4s",
+            socket.inet_aton(self.settings["group"]),
+            socket.inet_aton(self.settings["interface"]),
+        )
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        sock.settimeout(max(1.0, float(self.settings["interval"]) * 4))
+        return sock
+
+    def sample(self):
+        """Yerel mpv'nin oynatma konumunu oku"""
+        try:
+            return {
+                "pos": self.ipc.command("get_property", "playlist-pos"),
+                "time": self.ipc.command("get_property", "time-pos"),
+                "file": os.path.basename(self.ipc.command("get_property", "path") or ""),
+                "sampled": time.monotonic(),
+            }
+        except MpvIPCError:
+            return None
+
+    def _leader_loop(self):
+        interval = float(self.settings["interval"])
+        while not self.stop_event.wait(interval):
+            if not self.active():
+                continue
+            state = self.sample()
+            if state is None or state["time"] is None:
+                continue
+            self.seq += 1
+            message = {
+                "group": self.settings["name"],
+                "seq": self.seq,
+                "pos": state["pos"],
+                "time": state["time"],
+                "file": state["file"],
+            }
+            try:
+                self.sock.sendto(
+                    json.dumps(message).encode("utf-8"),
+                    (self.settings["group"], int(self.settings["port"])),
+                )
+                self.stats["messages"] += 1
+            except OSError as e:
+                logger.warning(f"Video duvarı yayını gönderilemedi: {e}")
+
+    def _follower_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                data, _ = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            received = time.monotonic()
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if message.get("group") != self.settings["name"] or not self.active():
+                continue
+            self.stats["messages"] += 1
+            self.apply(message, received)
+
+    def decide(self, leader, local):
+        """Lider ve yerel durumdan düzeltme eylemini hesapla.
+
+        ``(eylem, değer)`` döndürür; eylem ``ok``, ``speed``, ``seek`` veya
+        ``switch`` olabilir.
+        """
+        if leader["file"] != local["file"]:
+            return "switch", leader["file"]
+        error = leader["time"] - local["time"]
+        if abs(error) >= float(self.settings["seek_threshold"]):
+            return "seek", leader["time"]
+        if abs(error) <= float(self.settings["tolerance"]):
+            return "ok", 1.0
+        limit = float(self.settings["max_speed_adjust"])
+        adjust = max(-limit, min(limit, error * float(self.settings["speed_gain"])))
+        return "speed", round(1.0 + adjust, 4)
+
+    def apply(self, message, received=None):
+        local = self.sample()
+        if local is None or local["time"] is None:
+            return None
+        leader = dict(message)
+        # Mesaj alındıktan sonra yerel örnekleme yapılana kadar geçen süreyi ekle
+        if received is not None:
+            leader["time"] += max(0.0, local["sampled"] - received)
+        action, value = self.decide(leader, local)
+        self.stats["last_error"] = round(leader["time"] - local["time"], 4)
+        try:
+            if action == "switch":
+                index = self._playlist_index(value)
+                if index is not None:
+                    self.ipc.set_property("playlist-pos", index)
+                    self.stats["switches"] += 1
+                self._set_speed(1.0)
+            elif action == "seek":
+                self.ipc.command("seek", value, "absolute+exact")
+                self.stats["seeks"] += 1
+                self._set_speed(1.0)
+            else:
+                self._set_speed(value)
+        except MpvIPCError as e:
+            logger.debug(f"Video duvarı düzeltmesi uygulanamadı: {e}")
+        return action, value
+
+    def _set_speed(self, speed):
+        if abs(speed - self.current_speed) < 0.001:
+            return
+        self.ipc.set_property("speed", speed)
+        self.current_speed = speed
+        if speed != 1.0:
+            self.stats["speed_adjustments"] += 1
+
+    def _playlist_index(self, filename):
+        playlist = self.ipc.command("get_property", "playlist") or []
+        for index, item in enumerate(playlist):
+            if os.path.basename(item.get("filename", "")) == filename:
+                return index
+        return None
+
+    def status(self):
+        return dict(self.stats, speed=self.current_speed, group=self.settings["name"])
+
+
+ANNOUNCEMENT_DEFAULTS = {
+    "font": "",
+    "font_size": 42,
+    "text_color": "#FFFFFF",
+    "background": "#000000B4",
+    "padding": 20,
+    "position": "bottom",
+    "default_duration": 10,
+    "max_queue": 50,
+    "ticker_speed": 120,
+    "ticker_fps": 25,
+    "screen_width": 1920,
+    "screen_height": 1080,
+    "buffer_path": "",
+    "buffer_mb": 16,
+}
+ANNOUNCEMENT_KINDS = ("banner", "ticker")
+BANNER_OVERLAY_ID = 1
+TICKER_OVERLAY_ID = 2
+TICKER_SEPARATOR = "   •   "
+
+
+def parse_color(value):
+    """'#RRGGBB' veya '#RRGGBBAA' rengini RGBA demetine çevir"""
+    value = value.lstrip("#")
+    if len(value) == 6:
+        value += "FF"
+    return tuple(int(value[i : i + 2], 16) for i in range(0, 8, 2))
+
+
+def load_font(path, size):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(path or "DejaVuSans.ttf", size)
+    except OSError:
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            return ImageFont.load_default()
+
+
+def wrap_text(draw, text, font, max_width):
+    """Metni kelime sınırlarından bölerek satırlara ayır"""
+    lines = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}".strip()
+            if line and draw.textlength(candidate, font=font) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+def render_text(text, settings, ticker=False):
+    """Metni mpv ``overlay-add`` için ön çarpımlı BGRA kareye çiz.
+
+    Şerit (banner) ekran genişliğinde ve satırlara bölünmüş olarak çizilir.
+    Kayan yazı tek satırdır; iki yanına ekran genişliğinde boşluk eklenir ki
+    görünen pencere kaydırıldıkça metin sağdan girip soldan çıksın.
+    ``(veri, genişlik, yükseklik)`` döner; Pillow yoksa ``None``.
+    """
+    try:
+        # Açılışı yavaşlatmaması için yalnızca duyuru çizilirken yüklenir
+        from PIL import Image, ImageChops, ImageDraw
+    except ImportError:  # Pillow opsiyonel; yoksa duyurular OSD metni olarak gösterilir
+        return None
+    font = load_font(settings["font"], int(settings["font_size"]))
+    pad = int(settings["padding"])
+    screen_w = int(settings["screen_width"])
+    probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    ascent, descent = font.getmetrics()
+    line_h = ascent + descent
+    if ticker:
+        text_w = int(probe.textlength(text, font=font))
+        width, height = text_w + 2 * screen_w, line_h + pad
+        lines, top = [text], pad // 2
+    else:
+        lines = wrap_text(probe, text, font, screen_w - 2 * pad)
+        width, height = screen_w, len(lines) * line_h + 2 * pad
+        top = pad
+
+    image = Image.new("RGBA", (width, height), parse_color(settings["background"]))
+    draw = ImageDraw.Draw(image)
+    color = parse_color(settings["text_color"])
+    for i, line in enumerate(lines):
+        x = screen_w if ticker else (width - draw.textlength(line, font=font)) / 2
+        draw.text((x, top + i * line_h), line, font=font, fill=color)
+
+    r, g, b, a = image.split()
+    channels = [ImageChops.multiply(c, a) for c in (b, g, r)]
+    return Image.merge("RGBA", (*channels, a)).tobytes(), width, height
+
+
+class OverlayBuffer:
+    """Overlay karelerini mpv'nin doğrudan eşlediği paylaşımlı bellek dosyasında tut.
+
+    Tampon iki yarıya bölünür ve kareler etkin yarıya yazılır. Sıkıştırma
+    canlı kareleri diğer yarıya taşır; mpv'nin o an okuduğu kareler overlay
+    yeni konumla yeniden eklenene kadar bozulmaz.
+    """
+
+    def __init__(self, path, capacity):
+        self.path = path
+        self.capacity = capacity
+        self.half = (capacity // 2) & ~63
+        self.map = None
+        self.base = 0
+        self.used = 0
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            os.ftruncate(fd, self.capacity)
+            self.map = mmap.mmap(fd, self.capacity)
+        finally:
+            os.close(fd)
+
+    def store(self, data):
+        """Kareyi tampona yaz ve başlangıç konumunu döndür; yer yoksa ``None``"""
+        if self.map is None:
+            self._open()
+        if self.used + len(data) > self.half:
+            return None
+        offset = self.base + self.used
+        self.map[offset : offset + len(data)] = data
+        # Sonraki kare 64 bayt hizalı başlasın
+        self.used = (self.used + len(data) + 63) & ~63
+        return offset
+
+    def swap(self):
+        """Boş olan diğer yarıya geç; etkin yarıdaki kareler yerinde kalır"""
+        self.base = self.half if self.base == 0 else 0
+        self.used = 0
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def default_overlay_path(output=None):
+    suffix = f"-{output}" if output else ""
+    if os.path.isdir("/dev/shm"):
+        return f"/dev/shm/pi-ekran-overlay{suffix}.bgra"
+    return os.path.join(BASE_DIR, "cache", f"overlay{suffix}.bgra")
+
+
+class AnnouncementEngine:
+    """Öncelikli, süreli ve zamanlanabilir duyuruları mpv overlay'leriyle göster.
+
+    Her duyuru eklenirken bir kez BGRA kareye çizilip paylaşımlı bellek
+    tamponuna yazılır; ekrandaki duyuruyu değiştirmek ya da kayan yazıyı
+    ilerletmek yalnızca ``overlay-add`` ile tampondaki konumu değiştirmektir.
+    Aynı anda en yüksek öncelikli bir şerit ve tüm etkin kayan yazılar
+    gösterilir. Şeridin süresi yalnızca ekrandayken işler; daha öncelikli bir
+    duyuru geldiğinde kalan süresiyle sıraya geri döner. mpv yeniden
+    başlatıldığında (kaynak değişimi) overlay'ler tekrar eklenir. Pillow
+    yoksa duyurular ``show-text`` OSD mesajı olarak gösterilir.
+    """
+
+    def __init__(self, media_player, settings=None, renderer=render_text, clock=time.time):
+        self.player = media_player
+        self.settings = dict(ANNOUNCEMENT_DEFAULTS)
+        self.settings.update(settings or {})
+        self.renderer = renderer
+        self.clock = clock
+        self.lock = Lock()
+        self.render_lock = Lock()
+        self.items = []
+        self.next_id = 0
+        self.frames = {}
+        self.buffer = OverlayBuffer(
+            self.settings["buffer_path"] or default_overlay_path(),
+            int(float(self.settings["buffer_mb"]) * 1024 * 1024),
+        )
+        self.shown = {"banner": None, "ticker": None}
+        self.banner_state = None
+        self.ticker_started = None
+        self.osd_text = None
+        self.last_tick = None
+        self.dirty = True
+        self.stop_event = threading.Event()
+        self.thread = None
+        media_player.ipc.add_listener(self._on_ipc_event)
+
+    def _on_ipc_event(self, msg):
+        # mpv yeniden başlatıldı: overlay'ler bir sonraki adımda tekrar eklenir
+        if msg.get("event") == "ipc-disconnected":
+            self.dirty = True
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.buffer.close()
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Duyuru motoru hatası: {e}")
+            if self.shown["ticker"] is not None:
+                interval = 1.0 / float(self.settings["ticker_fps"])
+            else:
+                interval = 0.25
+            self.stop_event.wait(interval)
+
+    def add(self, text, priority=0, duration=None, kind="banner", start_at=None, expires_at=None):
+        """Duyuruyu sıraya ekle ve kaydını döndür"""
+        text = (text or "").strip()
+        if not text:
+            raise ValueError("Duyuru metni boş")
+        if kind not in ANNOUNCEMENT_KINDS:
+            raise ValueError(f"Geçersiz duyuru türü: {kind}")
+        if duration in (None, ""):
+            duration = self.settings["default_duration"]
+        duration = float(duration)
+        if duration <= 0:
+            raise ValueError("Duyuru süresi pozitif olmalı")
+        now = self.clock()
+        item = {
+            "id": None,
+            "text": text,
+            "kind": kind,
+            "priority": int(priority or 0),
+            "duration": duration,
+            "remaining": duration,
+            "start_at": float(start_at) if start_at else now,
+            "expires_at": float(expires_at) if expires_at else None,
+        }
+        # Kayan yazının süresi ekranda kalacağı toplam süredir
+        if kind == "ticker" and item["expires_at"] is None:
+            item["expires_at"] = item["start_at"] + duration
+        if item["expires_at"] is not None and item["expires_at"] <= max(now, item["start_at"]):
+            raise ValueError("Duyurunun geçerlilik süresi dolmuş")
+
+        with self.lock:
+            if len(self.items) >= int(self.settings["max_queue"]):
+                raise ValueError("Duyuru kuyruğu dolu")
+            self.next_id += 1
+            item["id"] = self.next_id
+            self.items.append(item)
+        if kind == "banner":
+            # Kare şimdi hazırlanır; gösterim anında yeniden çizim yapılmaz
+            self._frame(item["id"], text)
+        logger.info(f"Duyuru sıraya alındı: #{item['id']} ({kind}, öncelik {item['priority']})")
+        return dict(item)
+
+    def remove(self, announcement_id=None):
+        """Tek bir duyuruyu veya (``None`` ise) tüm sırayı kaldır"""
+        with self.lock:
+            before = len(self.items)
+            self.items = [
+                i for i in self.items if announcement_id is not None and i["id"] != announcement_id
+            ]
+            return before - len(self.items)
+
+    def status(self):
+        now = self.clock()
+        with self.lock:
+            ticker_ids = self.shown["ticker"][1:] if self.shown["ticker"] else ()
+            items = []
+            for item in sorted(self.items, key=lambda i: (-i["priority"], i["id"])):
+                if item["id"] == self.shown["banner"] or item["id"] in ticker_ids:
+                    state = "active"
+                elif item["start_at"] > now:
+                    state = "scheduled"
+                else:
+                    state = "queued"
+                items.append(dict(item, state=state))
+        # Pillow yüklenmeden yalnızca kurulu olup olmadığına bakılır
+        return {"announcements": items, "overlay": importlib.util.find_spec("PIL") is not None}
+
+    @staticmethod
+    def _finished(item, now):
+        if item["expires_at"] is not None and item["expires_at"] <= now:
+            return True
+        return item["kind"] == "banner" and item["remaining"] <= 0
+
+    def tick(self, now=None):
+        """Sırayı güncelle ve ekranda olması gerekenleri mpv'ye uygula"""
+        now = self.clock() if now is None else now
+        with self.lock:
+            elapsed = 0.0 if self.last_tick is None else max(0.0, now - self.last_tick)
+            self.last_tick = now
+            for item in self.items:
+                if item["id"] == self.shown["banner"]:
+                    item["remaining"] -= elapsed
+            self.items = [i for i in self.items if not self._finished(i, now)]
+            ready = sorted(
+                (i for i in self.items if i["start_at"] <= now),
+                key=lambda i: (-i["priority"], i["id"]),
+            )
+            banners = [i for i in ready if i["kind"] == "banner"]
+            tickers = [i for i in ready if i["kind"] == "ticker"]
+            force, self.dirty = self.dirty, False
+
+        try:
+            self._show_banner(banners[0] if banners else None, bool(tickers), force)
+            self._show_ticker(tickers, now, force)
+        except MpvIPCError as e:
+            self.dirty = True
+            logger.debug(f"Duyuru overlay'i uygulanamadı: {e}")
+        return banners[0]["id"] if banners else None
+
+    def _frame(self, key, text, ticker=False):
+        """Önbellekteki kareyi döndür; yoksa bir kez çizip tampona yaz"""
+        with self.render_lock:
+            frame = self.frames.get(key)
+            if frame is not None:
+                return frame
+            rendered = self.renderer(text, self.settings, ticker=ticker)
+            if rendered is None:
+                return None
+            data, width, height = rendered
+            offset = self.buffer.store(data)
+            if offset is None:
+                self._compact()
+                offset = self.buffer.store(data)
+                if offset is None:
+                    logger.warning("Duyuru karesi overlay tamponuna sığmadı")
+                    return None
+            frame = {"data": data, "offset": offset, "width": width, "height": height}
+            self.frames[key] = frame
+            return frame
+
+    def _compact(self):
+        """Artık kullanılmayan kareleri at ve kalanları tamponun diğer yarısına taşı.
+
+        Ekrandaki şerit yeni konumla hemen yeniden eklenir; kayan yazı zaten
+        her adımda eklendiğinden sonraki adımda yeni konuma geçer.
+        """
+        with self.lock:
+            live = {i["id"] for i in self.items}
+            live.add(self.shown["ticker"])
+        frames = {k: dict(f) for k, f in self.frames.items() if k in live}
+        self.buffer.swap()
+        for frame in frames.values():
+            frame["offset"] = self.buffer.store(frame["data"])
+        self.frames = {k: f for k, f in frames.items() if f["offset"] is not None}
+        self.dirty = True
+        state = self.banner_state
+        frame = self.frames.get(state[0]) if state else None
+        if frame is not None:
+            try:
+                self._overlay_add(BANNER_OVERLAY_ID, state[2], state[3], frame)
+                self.banner_state = (state[0], frame["offset"], state[2], state[3])
+            except MpvIPCError as e:
+                logger.debug(f"Duyuru overlay'i yeniden eklenemedi: {e}")
+
+    def _overlay_add(self, overlay_id, x, y, frame, offset=0, width=None, send=None):
+        width = width or frame["width"]
+        (send or self.player.ipc.command)(
+            "overlay-add",
+            overlay_id,
+            int(x),
+            int(y),
+            self.buffer.path,
+            frame["offset"] + offset,
+            "bgra",
+            width,
+            frame["height"],
+            frame["width"] * 4,
+        )
+
+    def _overlay_remove(self, overlay_id):
+        try:
+            self.player.ipc.command("overlay-remove", overlay_id)
+        except MpvIPCError:
+            pass
+
+    def _osd(self, text, seconds, force):
+        if force or text != self.osd_text:
+            self.player.ipc.command("show-text", text, int(max(0, seconds) * 1000))
+            self.osd_text = text
+
+    def _banner_y(self, frame, ticker_active):
+        screen_h = int(self.settings["screen_height"])
+        position = self.settings["position"]
+        if position == "top":
+            return 0
+        if position == "center":
+            return (screen_h - frame["height"]) // 2
+        reserved = 0
+        ticker = self.frames.get(self.shown["ticker"]) if ticker_active else None
+        if ticker is not None:
+            reserved = ticker["height"]
+        return screen_h - frame["height"] - reserved
+
+    def _show_banner(self, item, ticker_active, force):
+        if item is None:
+            if self.banner_state is not None:
+                self._overlay_remove(BANNER_OVERLAY_ID)
+                self.banner_state = None
+            if self.osd_text is not None and self.shown["banner"] is not None:
+                self._osd("", 0, True)
+                self.osd_text = None
+            self.shown["banner"] = None
+            return
+        frame = self._frame(item["id"], item["text"])
+        if frame is None:
+            self._osd(item["text"], item["remaining"], force)
+            self.shown["banner"] = item["id"]
+            return
+        x = (int(self.settings["screen_width"]) - frame["width"]) // 2
+        y = self._banner_y(frame, ticker_active)
+        state = (item["id"], frame["offset"], x, y)
+        if force or state != self.banner_state:
+            self._overlay_add(BANNER_OVERLAY_ID, x, y, frame)
+            self.banner_state = state
+        self.shown["banner"] = item["id"]
+
+    def _show_ticker(self, tickers, now, force):
+        if not tickers:
+            if self.shown["ticker"] is not None:
+                self._overlay_remove(TICKER_OVERLAY_ID)
+                self.shown["ticker"] = None
+            return
+        key = ("ticker",) + tuple(i["id"] for i in tickers)
+        if key != self.shown["ticker"]:
+            self.shown["ticker"] = key
+            self.ticker_started = now
+        text = TICKER_SEPARATOR.join(i["text"] for i in tickers)
+        frame = self._frame(key, text, ticker=True)
+        if frame is None:
+            if self.shown["banner"] is None:
+                self._osd(text, max(i["expires_at"] for i in tickers) - now, force)
+            return
+
+        # Kaydırma yalnızca görünen pencerenin tampondaki başlangıcını değiştirir
+        screen_w = int(self.settings["screen_width"])
+        width = min(screen_w, frame["width"])
+        travel = max(1, frame["width"] - width)
+        shift = int((now - self.ticker_started) * float(self.settings["ticker_speed"])) % travel
+        y = int(self.settings["screen_height"]) - frame["height"]
+        send = self.player.ipc.command if force else self.player.ipc.send_nowait
+        self._overlay_add(TICKER_OVERLAY_ID, 0, y, frame, offset=shift * 4, width=width, send=send)
+
+
+def parse_timestamp(value):
+    """Epoch saniyesini veya ISO 8601 zamanını epoch saniyesine çevir"""
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
+STORAGE_DEFAULTS = {
+    "reserve_mb": 512,
+    "high_water_percent": 90,
+    "low_water_percent": 85,
+    "evict_media": False,
+    "protect_recent_hours": 24,
+    "log_keep_mb": 5,
+    "stale_partial_hours": 6,
+}
+PARTIAL_SUFFIXES = (".part", ".link")
+
+
+def directory_usage(path, seen=None):
+    """Dizindeki dosyaların diskte kapladığı alan; sabit bağlar bir kez sayılır"""
+    seen = set() if seen is None else seen
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+            total += getattr(st, "st_blocks", 0) * 512 or st.st_size
+    return total
+
+
+def trim_file(path, keep_bytes):
+    """Dosyanın yalnızca son ``keep_bytes`` baytını bırak; kazanılan baytı döndür"""
+    size = os.path.getsize(path)
+    if size <= keep_bytes:
+        return 0
+    with open(path, "r+b") as f:
+        f.seek(size - keep_bytes)
+        tail = f.read()
+        # Yarım kalan ilk satırı at
+        newline = tail.find(b"\n")
+        if newline != -1:
+            tail = tail[newline + 1 :]
+        f.seek(0)
+        f.write(tail)
+        f.truncate()
+    return size - len(tail)
+
+
+class StorageManager:
+    """Medya diski için alan bütçesi: yükleme öncesi kontrol ve tahliye.
+
+    Doluluk ``high_water_percent`` değerini aştığında ya da boş alan
+    ``reserve_mb`` altına düştüğünde, doluluk ``low_water_percent`` seviyesine
+    inene kadar önce yeniden üretilebilen veriler (yarım kalmış aktarımlar,
+    derlenmiş oynatma listeleri, büyük log dosyaları), ``evict_media`` açıksa
+    ardından en uzun süredir oynatılmayan medya silinir. Varsayılan video,
+    zamanlama kurallarında ve oynatma listelerinde geçen, o an oynatılan ve
+    ``protect_recent_hours`` içinde yüklenen/oynatılan dosyalar korunur.
+    """
+
+    def __init__(
+        self, media_player, media_library, settings=None, statvfs=os.statvfs, clock=time.time, others=()
+    ):
+        self.player = media_player
+        # Ek çıkışların oynatıcıları: oynattıkları dosyalar da korunur
+        self.others = list(others)
+        self.library = media_library
+        self.settings = dict(STORAGE_DEFAULTS)
+        self.settings.update(settings or {})
+        self.statvfs = statvfs
+        self.clock = clock
+        self.lock = Lock()
+        self.last_eviction = None
+
+    @property
+    def reserve(self):
+        return int(float(self.settings["reserve_mb"]) * 1024 * 1024)
+
+    def filesystem(self):
+        st = self.statvfs(VIDEO_DIR)
+        total = st.f_blocks * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        used = total - st.f_bfree * st.f_frsize
+        return {
+            "total": total,
+            "free": free,
+            "used": used,
+            "percent": round(used / total * 100, 1) if total else 0.0,
+        }
+
+    def usage(self):
+        """Dosya sistemi ve kategori bazında alan kullanımı raporu"""
+        seen = set()
+        categories = {
+            name: directory_usage(path, seen) if os.path.isdir(path) else 0
+            for name, path in (
+                ("videos", VIDEO_DIR),
+                ("images", IMAGE_DIR),
+                ("logs", LOG_DIR),
+                ("recordings", RECORDING_DIR),
+                ("cache", os.path.join(BASE_DIR, "cache")),
+            )
+        }
+        return {
+            "filesystem": self.filesystem(),
+            "categories": categories,
+            "reserve": self.reserve,
+            "settings": dict(self.settings),
+            "evictable": [
+                {"files": c["files"], "bytes": c["bytes"], "last_used": c["last_used"]}
+                for c in self.media_candidates()
+            ],
+            "last_eviction": self.last_eviction,
+        }
+
+    def preflight(self, size):
+        """``size`` bayt yazmadan önce yedek alanı koruyacak yer var mı kontrol et.
+
+        Yer yoksa tahliye denenir; ``(başarılı, mesaj)`` döner.
+        """
+        size = max(0, int(size or 0))
+        needed = size + self.reserve
+        if self.filesystem()["free"] >= needed:
+            return True, ""
+        report = self.evict(target_free=needed)
+        if report["free_after"] >= needed:
+            return True, ""
+        shortfall = needed - report["free_after"]
+        logger.warning(f"Yetersiz disk alanı: {shortfall} bayt eksik")
+        return False, f"Yetersiz disk alanı ({shortfall // (1024 * 1024) + 1} MB daha gerekli)"
+
+    def enforce(self, dry_run=False):
+        """Eşik aşıldıysa doluluğu alt eşiğe indirecek kadar alan aç"""
+        fs = self.filesystem()
+        if fs["percent"] < float(self.settings["high_water_percent"]) and fs["free"] >= self.reserve:
+            return None
+        low = float(self.settings["low_water_percent"]) / 100.0
+        target_free = max(self.reserve, fs["free"] + int(fs["used"] - low * fs["total"]))
+        return self.evict(target_free=target_free, dry_run=dry_run)
+
+    def protected(self):
+        """Silinmemesi gereken (tür, ad) çiftleri"""
+        config = self.player.config
+        keep = set(self.player.current_media)
+        for other in self.others:
+            keep.update(other.current_media)
+        # Yapılandırmadaki yollar "videos/x.mp4" biçiminde de yazılabilir;
+        # kütüphane yalnızca dosya adlarını tutar
+        outputs = [config] + list(config.get("outputs", []))
+        for output in outputs:
+            if output.get("default_video"):
+                keep.add(("video", os.path.basename(str(output["default_video"]))))
+        for rule in [r for output in outputs for r in output.get("schedule", [])]:
+            if rule.get("source") == "video" and rule.get("video"):
+                keep.add(("video", os.path.basename(str(rule["video"]))))
+        for playlist in config.get("playlists", {}).values():
+            keep.update(
+                (i["type"], os.path.basename(str(i["file"])))
+                for i in playlist.get("items", [])
+                if i.get("file")
+            )
+        return keep
+
+    def media_candidates(self):
+        """Silinebilecek medya grupları, en uzun süredir kullanılmayan önce.
+
+        Aynı inode'a bağlı adlar tek grup oluşturur; grubun tüm adları
+        silinebilir değilse dosya diskte kalacağından grup aday olmaz.
+        """
+        keep = self.protected()
+        recent = self.clock() - float(self.settings["protect_recent_hours"]) * 3600
+        groups = {}
+        for kind in ("video", "image"):
+            for entry in self.library.refresh(kind).values():
+                group = groups.setdefault(
+                    entry["inode"], {"files": [], "bytes": entry["size"], "last_used": 0, "blocked": False}
+                )
+                group["files"].append({"kind": kind, "name": entry["name"]})
+                last_used = self.library.last_used(kind, entry)
+                group["last_used"] = max(group["last_used"], last_used)
+                if (kind, entry["name"]) in keep or last_used >= recent:
+                    group["blocked"] = True
+
+        candidates = []
+        for group in groups.values():
+            if group["blocked"]:
+                continue
+            first = group["files"][0]
+            try:
+                st = os.stat(os.path.join(media_dir(first["kind"]), first["name"]))
+            except FileNotFoundError:
+                continue
+            # Medya dizinleri dışında da bağı olan dosya silinse de yer açılmaz
+            if st.st_nlink > len(group["files"]):
+                continue
+            group["files"].sort(key=lambda f: (f["kind"], f["name"]))
+            candidates.append(group)
+        candidates.sort(key=lambda g: g["last_used"])
+        return candidates
+
+    def _cache_actions(self):
+        """Yeniden üretilebilen verileri silme/kırpma adımları (sırayla)"""
+        stale = self.clock() - float(self.settings["stale_partial_hours"]) * 3600
+        for directory in (VIDEO_DIR, IMAGE_DIR):
+            for path in glob.glob(os.path.join(directory, "*")):
+                if path.endswith(PARTIAL_SUFFIXES) and os.path.getmtime(path) < stale:
+                    yield "partial", path, os.path.getsize(path), lambda p=path: os.remove(p)
+
+        current = set()
+        for target in [self.player, *self.others]:
+            current |= target.playlist_files()
+        for path in glob.glob(os.path.join(PLAYLIST_DIR, "*.m3u")):
+            if os.path.basename(path) not in current:
+                yield "playlists", path, os.path.getsize(path), lambda p=path: os.remove(p)
+
+        keep = int(float(self.settings["log_keep_mb"]) * 1024 * 1024)
+        for path in glob.glob(os.path.join(LOG_DIR, "*.log")):
+            size = os.path.getsize(path)
+            if size > keep:
+                yield "logs", path, size - keep, lambda p=path: trim_file(p, keep)
+
+        # Kamera kayıtları: en eski parçalar önce, yazılmakta olan parça hariç
+        segments = []
+        for directory in glob.glob(os.path.join(RECORDING_DIR, "*")):
+            segments += sorted(glob.glob(os.path.join(directory, "*" + RECORDING_SUFFIX)))[:-1]
+        for path in sorted(segments, key=os.path.basename):
+            yield "recordings", path, os.path.getsize(path), lambda p=path: os.remove(p)
+
+    def evict(self, target_free, dry_run=False):
+        """Boş alan ``target_free`` bayta ulaşana kadar katman katman yer aç"""
+        with self.lock:
+            free_before = self.filesystem()["free"]
+            free = free_before
+            actions = []
+            device = os.stat(VIDEO_DIR).st_dev
+
+            for tier, path, size, action in self._cache_actions():
+                if free >= target_free:
+                    break
+                try:
+                    if os.stat(path).st_dev != device:
+                        continue
+                    freed = size if dry_run else action()
+                except OSError as e:
+                    logger.warning(f"Disk alanı açılamadı ({path}): {e}")
+                    continue
+                freed = size if freed is None else freed
+                free += freed
+                actions.append({"tier": tier, "path": os.path.relpath(path, BASE_DIR), "bytes": freed})
+
+            if free < target_free and self.settings["evict_media"]:
+                for group in self.media_candidates():
+                    if free >= target_free:
+                        break
+                    if not dry_run:
+                        for f in group["files"]:
+                            self.library.delete(f["kind"], [f["name"]])
+                        logger.warning(
+                            "Disk alanı için silindi: "
+                            + ", ".join(f["name"] for f in group["files"])
+                        )
+                    free += group["bytes"]
+                    actions.append(
+                        {"tier": "media", "files": group["files"], "bytes": group["bytes"]}
+                    )
+
+            report = {
+                "time": self.clock(),
+                "dry_run": dry_run,
+                "target_free": target_free,
+                "free_before": free_before,
+                "free_after": free if dry_run else self.filesystem()["free"],
+                "freed_bytes": sum(a["bytes"] for a in actions),
+                "actions": actions,
+            }
+            if not dry_run:
+                self.last_eviction = report
+                if actions:
+                    logger.info(
+                        f"Disk alanı açıldı: {report['freed_bytes']} bayt, {len(actions)} işlem"
+                    )
+            return report
+
+
+TELEMETRY_FILE = os.path.join(BASE_DIR, "cache", "telemetry.json")
+TELEMETRY_DEFAULTS = {
+    "enabled": True,
+    "poll_interval": 2.0,
+    "save_interval": 60,
+    "min_play_seconds": 5,
+    "min_frames": 300,
+    "drop_threshold_percent": 2.0,
+    "fps_threshold_percent": 90,
+}
+TELEMETRY_OBSERVE_ID = 2
+TELEMETRY_COUNTERS = {
+    "estimated-frame-number": "frames",
+    "frame-drop-count": "dropped",
+    "decoder-frame-drop-count": "decoder_dropped",
+}
+
+
+def device_model():
+    """Cihaz modeli (Raspberry Pi device-tree), yoksa işlemci mimarisi"""
+    try:
+        with open("/proc/device-tree/model", "rb") as f:
+            return f.read().rstrip(b"\x00").decode("utf-8", "replace").strip()
+    except OSError:
+        return os.uname().machine
+
+
+def media_kind_for_path(path):
+    """mpv'nin oynattığı yoldan (tür, dosya adı) çıkar; medya değilse None"""
+    if not path:
+        return None
+    directory, name = os.path.split(os.path.abspath(path))
+    for kind in ("video", "image"):
+        if directory == os.path.abspath(media_dir(kind)):
+            return kind, name
+    return None
+
+
+class PlaybackTelemetry:
+    """Oynatılan her dosya için kare kaybı, kod çözücü ve oynatma sayısı istatistiği.
+
+    Öğe sınırları mpv'nin ``path`` özelliği ve ``end-file`` olaylarıyla
+    belirlenir; sayaçlar (``frame-drop-count``, ``decoder-frame-drop-count``,
+    ``estimated-frame-number``) ve ``estimated-vf-fps``, ``hwdec-current``,
+    ``video-params`` değerleri ``poll_interval`` aralıklarla okunur. Sonuçlar
+    dosya başına toplanıp ``cache/telemetry.json`` içinde saklanır; dosya
+    değiştirilirse (boyut/mtime) istatistikleri sıfırlanır.
+    """
+
+    def __init__(self, media_player, settings=None, store_file=None, clock=time.monotonic):
+        self.player = media_player
+        self.settings = dict(TELEMETRY_DEFAULTS)
+        self.settings.update(settings or {})
+        self.store_file = store_file
+        self.clock = clock
+        self.lock = Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.device = device_model()
+        self.media = {"video": {}, "image": {}}
+        self.session = None
+        self._previous = (None, {})
+        self.version = 0
+        self.problems_version = 0
+        self.dirty = False
+        self._last_save = clock()
+        self._process = None
+        self._load()
+        self.player.ipc.add_listener(self._on_ipc_event)
+        self.player.ipc.observe("path", TELEMETRY_OBSERVE_ID)
+
+    def _load(self):
+        if not self.store_file:
+            return
+        try:
+            with open(self.store_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for kind in self.media:
+                self.media[kind].update(data.get("media", {}).get(kind, {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Oynatma istatistikleri okunamadı: {e}")
+
+    def save(self):
+        """Değişen istatistikleri diske yaz; silinmiş dosyaların kaydını at"""
+        if not self.store_file:
+            return
+        with self.lock:
+            for kind, stats in self.media.items():
+                for name in [n for n in stats if not os.path.exists(os.path.join(media_dir(kind), n))]:
+                    del stats[name]
+            data = {"device": self.device, "media": {k: dict(v) for k, v in self.media.items()}}
+            self.dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
+            _write_atomic(self.store_file, json.dumps(data).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Oynatma istatistikleri kaydedilemedi: {e}")
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _loop(self):
+        while not self.stop_event.wait(float(self.settings["poll_interval"])):
+            try:
+                self.poll()
+                if self.dirty and self.clock() - self._last_save >= float(self.settings["save_interval"]):
+                    self._last_save = self.clock()
+                    self.save()
+            except Exception as e:
+                logger.error(f"Oynatma istatistiği hatası: {e}")
+
+    def _on_ipc_event(self, msg):
+        # Okuma iş parçacığında çalışır: yalnızca bellek içi durum güncellenir
+        event = msg.get("event")
+        now = self.clock()
+        if event == "property-change" and msg.get("id") == TELEMETRY_OBSERVE_ID:
+            with self.lock:
+                path = msg.get("data")
+                if self.session is None or self.session["path"] != path:
+                    self._finish(now)
+                    self._begin(path, now)
+        elif event == "end-file":
+            with self.lock:
+                if self.session is not None:
+                    self.session["completed"] = msg.get("reason") == "eof"
+                self._finish(now)
+        elif event == "ipc-disconnected":
+            with self.lock:
+                self._finish(now)
+
+    def _begin(self, path, now):
+        media = media_kind_for_path(path)
+        if media is None:
+            return
+        kind, name = media
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self.session = {
+            "kind": kind,
+            "name": name,
+            "path": path,
+            "signature": [st.st_size, st.st_mtime],
+            "started": now,
+            "completed": False,
+            "counters": dict(self._previous[1]) if self._previous[0] == path else {},
+            "frames": 0,
+            "dropped": 0,
+            "decoder_dropped": 0,
+            "fps_sum": 0.0,
+            "fps_samples": 0,
+            "cpu_sum": 0.0,
+            "cpu_samples": 0,
+            "container_fps": None,
+            "video_params": None,
+            "hwdec": {},
+        }
+
+    def _finish(self, now):
+        """Açık oturumu dosyanın toplamına ekle"""
+        session, self.session = self.session, None
+        if session is None:
+            return
+        # Aynı dosya için yeni oturum açılırsa sayaçlar buradan devam eder
+        self._previous = (session["path"], dict(session["counters"]))
+        seconds = now - session["started"]
+        played = session["completed"] or seconds >= float(self.settings["min_play_seconds"])
+        if not played and not session["frames"]:
+            return
+        stats = self.media[session["kind"]].get(session["name"])
+        if stats is None or stats.get("signature") != session["signature"]:
+            stats = {
+                "signature": session["signature"],
+                "plays": 0,
+                "seconds": 0.0,
+                "frames": 0,
+                "dropped": 0,
+                "decoder_dropped": 0,
+                "fps_sum": 0.0,
+                "fps_samples": 0,
+                "cpu_sum": 0.0,
+                "cpu_samples": 0,
+                "container_fps": None,
+                "video_params": None,
+                "hwdec": {},
+            }
+            self.media[session["kind"]][session["name"]] = stats
+        before = bool(self.assess(stats))
+        stats["plays"] += 1 if played else 0
+        stats["seconds"] = round(stats["seconds"] + seconds, 3)
+        for key in ("frames", "dropped", "decoder_dropped", "fps_samples", "cpu_samples"):
+            stats[key] += session[key]
+        for key in ("fps_sum", "cpu_sum"):
+            stats[key] = round(stats[key] + session[key], 3)
+        for key in ("container_fps", "video_params"):
+            if session[key] is not None:
+                stats[key] = session[key]
+        for name, count in session["hwdec"].items():
+            stats["hwdec"][name] = stats["hwdec"].get(name, 0) + count
+        stats["last_played"] = time.time()
+        self.version += 1
+        if bool(self.assess(stats)) != before:
+            self.problems_version += 1
+        self.dirty = True
+
+    def _mpv_cpu(self):
+        """mpv sürecinin son örnekten bu yana işlemci kullanımı (%)"""
+        process = self.player.current_process
+        if process is None:
+            return None
+        try:
+            import psutil
+
+            if self._process is None or self._process.pid != process.pid:
+                self._process = psutil.Process(process.pid)
+                self._process.cpu_percent(None)
+                return None
+            return self._process.cpu_percent(None)
+        except Exception:
+            self._process = None
+            return None
+
+    def sample(self):
+        ipc = self.player.ipc
+        data = {"path": ipc.get_property("path")}
+        for name in TELEMETRY_COUNTERS:
+            data[name] = ipc.get_property(name)
+        for name in ("estimated-vf-fps", "container-fps", "hwdec-current", "video-params"):
+            data[name] = ipc.get_property(name)
+        # Örnek okunurken öğe değiştiyse sayaçlar yeni dosyaya ait olabilir
+        data["path_after"] = ipc.get_property("path")
+        data["cpu"] = self._mpv_cpu()
+        return data
+
+    def poll(self):
+        p = self.player
+        if p.current_process is None or p.current_process.poll() is not None:
+            return
+        if p.current_source not in ("video", "slayt", "playlist"):
+            return
+        sample = self.sample()
+        path = sample["path"]
+        if not path or path != sample["path_after"]:
+            return
+        now = self.clock()
+        with self.lock:
+            if self.session is None or self.session["path"] != path:
+                self._finish(now)
+                self._begin(path, now)
+            session = self.session
+            if session is None:
+                return
+            counters = session["counters"]
+            for prop, key in TELEMETRY_COUNTERS.items():
+                value = sample[prop]
+                if not isinstance(value, (int, float)):
+                    continue
+                previous = counters.get(prop)
+                # Sayaç geriye gittiyse dosya baştan başlamıştır (tek dosyalık döngü)
+                session[key] += int(value - previous if previous is not None and value >= previous else value)
+                counters[prop] = value
+            if sample["estimated-vf-fps"]:
+                session["fps_sum"] += float(sample["estimated-vf-fps"])
+                session["fps_samples"] += 1
+            if sample["container-fps"]:
+                session["container_fps"] = round(float(sample["container-fps"]), 3)
+            if sample["cpu"] is not None:
+                session["cpu_sum"] += sample["cpu"]
+                session["cpu_samples"] += 1
+            if sample["hwdec-current"]:
+                hwdec = sample["hwdec-current"]
+                session["hwdec"][hwdec] = session["hwdec"].get(hwdec, 0) + 1
+            params = sample["video-params"]
+            if isinstance(params, dict) and params.get("w"):
+                session["video_params"] = f"{params['w']}x{params['h']} {params.get('pixelformat', '')}".strip()
+
+    def assess(self, stats):
+        """Yeniden kodlama gerektirebilecek sorunları açıklayan metinler"""
+        reasons = []
+        frames = stats["frames"]
+        if frames >= int(self.settings["min_frames"]):
+            threshold = float(self.settings["drop_threshold_percent"])
+            dropped = 100 * stats["dropped"] / frames
+            if dropped >= threshold:
+                reasons.append(f"Kare kaybı %{dropped:.1f}")
+            decoder = 100 * stats["decoder_dropped"] / frames
+            if decoder >= threshold:
+                reasons.append(f"Kod çözücü kare kaybı %{decoder:.1f}")
+        if stats["fps_samples"] and stats["container_fps"]:
+            fps = stats["fps_sum"] / stats["fps_samples"]
+            if fps < stats["container_fps"] * float(self.settings["fps_threshold_percent"]) / 100:
+                reasons.append(f"Düşük kare hızı ({fps:.1f}/{stats['container_fps']:g} fps)")
+        return reasons
+
+    def summary(self, kind, name):
+        with self.lock:
+            stats = self.media[kind].get(name)
+            if stats is None:
+                return None
+            frames = stats["frames"]
+            hwdec = max(stats["hwdec"], key=stats["hwdec"].get) if stats["hwdec"] else None
+            return {
+                "plays": stats["plays"],
+                "seconds": round(stats["seconds"]),
+                "frames": frames,
+                "drop_percent": round(100 * stats["dropped"] / frames, 2) if frames else None,
+                "decoder_drop_percent": (
+                    round(100 * stats["decoder_dropped"] / frames, 2) if frames else None
+                ),
+                "mean_fps": (
+                    round(stats["fps_sum"] / stats["fps_samples"], 2) if stats["fps_samples"] else None
+                ),
+                "container_fps": stats["container_fps"],
+                "cpu_percent": (
+                    round(stats["cpu_sum"] / stats["cpu_samples"], 1) if stats["cpu_samples"] else None
+                ),
+                "hwdec": hwdec,
+                "video_params": stats["video_params"],
+                "last_played": stats.get("last_played"),
+                "problems": self.assess(stats),
+            }
+
+    def problems(self, kind, names=None):
+        """Sorunlu dosyalar: ad -> sorun açıklamaları"""
+        with self.lock:
+            result = {}
+            for name, stats in self.media[kind].items():
+                if names is not None and name not in names:
+                    continue
+                reasons = self.assess(stats)
+                if reasons:
+                    result[name] = reasons
+            return result
+
+    def report(self):
+        media = {}
+        for kind in self.media:
+            media[kind] = {name: self.summary(kind, name) for name in list(self.media[kind])}
+        with self.lock:
+            current = None
+            if self.session is not None:
+                current = {
+                    "kind": self.session["kind"],
+                    "name": self.session["name"],
+                    "seconds": round(self.clock() - self.session["started"], 1),
+                    "dropped": self.session["dropped"],
+                    "decoder_dropped": self.session["decoder_dropped"],
+                }
+        return {"device": self.device, "current": current, "media": media}
+
+
+PROOF_OF_PLAY_DB = os.path.join(LOG_DIR, "proof_of_play.db")
+PROOF_OF_PLAY_DEFAULTS = {
+    "enabled": True,
+    "flush_interval": 60,
+    "batch_size": 500,
+    "raw_retention_days": 180,
+}
+PROOF_OF_PLAY_BUCKETS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "month": "%Y-%m"}
+PROOF_OF_PLAY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT,
+    playlist TEXT,
+    started REAL NOT NULL,
+    ended REAL NOT NULL,
+    duration REAL NOT NULL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS plays_started ON plays (started);
+CREATE INDEX IF NOT EXISTS plays_name_started ON plays (name, started);
+CREATE TABLE IF NOT EXISTS play_hours (
+    hour INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    airtime REAL NOT NULL,
+    first_started REAL NOT NULL,
+    last_started REAL NOT NULL,
+    PRIMARY KEY (hour, kind, name)
+);
+CREATE TABLE IF NOT EXISTS play_days (
+    day INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    airtime REAL NOT NULL,
+    first_started REAL NOT NULL,
+    last_started REAL NOT NULL,
+    PRIMARY KEY (day, kind, name)
+);
+"""
+# Özet tabloları: anahtar sütunu ve anahtarın rapor gruplamasında kullanılacak zamanı
+PROOF_OF_PLAY_ROLLUPS = {
+    "play_hours": ("hour", "hour * 3600, 'unixepoch', 'localtime'"),
+    # Gün anahtarı yerel tarihin sıra numarası (date.toordinal)
+    "play_days": ("day", "day + 1721424.5"),
+}
+
+
+def local_day(timestamp):
+    return datetime.fromtimestamp(timestamp).toordinal()
+
+
+def local_midnight(day):
+    return datetime.fromordinal(day).timestamp()
+
+
+class ProofOfPlayLog:
+    """Yayın kanıtı: her medya öğesinin ekranda başlama ve bitiş zamanı.
+
+    Kayıtlar API çağrılarından değil mpv olaylarından (``path`` değişimi,
+    ``file-loaded``, ``end-file``) üretilir. SD kartı korumak için bellekte
+    biriktirilir ve ``flush_interval`` saniyede bir (ya da ``batch_size``
+    dolunca) tek bir SQLite işlemiyle eklenir. Her kayıt saatlik özet
+    ve günlük özet tablolarına da işlenir; raporlar tam günleri ve saatleri
+    özetlerden, aralık kenarlarını ham kayıtlardan okur. Ham kayıtlar
+    ``raw_retention_days`` sonra silinir, özetler saklanmaya devam eder.
+    """
+
+    def __init__(self, media_player, settings=None, db_path=None, clock=time.time):
+        self.player = media_player
+        self.settings = dict(PROOF_OF_PLAY_DEFAULTS)
+        self.settings.update(settings or {})
+        self.db_path = db_path
+        self.clock = clock
+        self.lock = Lock()
+        self.db_lock = Lock()
+        self.db = None
+        self.pending = []
+        self.current = None
+        self.path = None
+        self.flush_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self._last_prune = 0.0
+        self.player.ipc.add_listener(self._on_ipc_event)
+        self.player.ipc.observe("path", TELEMETRY_OBSERVE_ID)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.flush_event.set()
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            self.flush_event.wait(float(self.settings["flush_interval"]))
+            self.flush_event.clear()
+            try:
+                self.flush()
+                if self.clock() - self._last_prune >= 86400:
+                    self._last_prune = self.clock()
+                    self.prune()
+            except Exception as e:
+                logger.error(f"Yayın kaydı yazılamadı: {e}")
+
+    def _on_ipc_event(self, msg):
+        # Okuma iş parçacığında çalışır: yalnızca bellek içi durum güncellenir
+        if not self.settings["enabled"]:
+            return
+        event = msg.get("event")
+        now = self.clock()
+        with self.lock:
+            if event == "property-change" and msg.get("name") == "path":
+                path = msg.get("data")
+                if not path:
+                    return
+                self.path = path
+                if self.current is not None and not self.current["confirmed"]:
+                    # file-loaded yol bildiriminden önce geldi: kaydı düzelt
+                    self.current.update(path=path, confirmed=True)
+                elif self.current is None or self.current["path"] != path:
+                    self._close(now, "stop")
+                    self._open(path, now, confirmed=True)
+            elif event == "file-loaded":
+                # Tek dosyalık döngüde yol değişmez; yeni tur burada başlar
+                if self.current is None and self.path:
+                    self._open(self.path, now, confirmed=False)
+            elif event == "end-file":
+                self._close(now, msg.get("reason", "unknown"))
+            elif event == "ipc-disconnected":
+                self._close(now, "disconnected")
+                self.path = None
+
+    def _open(self, path, now, confirmed):
+        self.current = {
+            "path": path,
+            "started": now,
+            "confirmed": confirmed,
+            "source": self.player.current_source,
+            "playlist": self.player.current_playlist,
+        }
+
+    def _close(self, now, reason):
+        play, self.current = self.current, None
+        if play is None:
+            return
+        media = media_kind_for_path(play["path"])
+        if media is None:
+            return
+        kind, name = media
+        duration = round(max(0.0, now - play["started"]), 3)
+        self.pending.append(
+            (kind, name, play["source"], play["playlist"], play["started"], now, duration, reason)
+        )
+        if len(self.pending) >= int(self.settings["batch_size"]):
+            self.flush_event.set()
+
+    def _connection(self):
+        """Çağıran ``db_lock`` kilidini tutmalıdır"""
+        if self.db is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            # WAL + NORMAL: her toplu yazım tek fsync ile sonuçlanır
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(PROOF_OF_PLAY_SCHEMA)
+            self.db = db
+        return self.db
+
+    def flush(self):
+        """Bekleyen kayıtları tek işlemde diske yaz; yazılan kayıt sayısını döndür"""
+        with self.lock:
+            rows, self.pending = self.pending, []
+        if not rows:
+            return 0
+        rollups = {
+            "play_hours": [
+                (int(started // 3600), kind, name, 1 if reason == "eof" else 0, duration, started, started)
+                for kind, name, _, _, started, _, duration, reason in rows
+            ],
+            "play_days": [
+                (local_day(started), kind, name, 1 if reason == "eof" else 0, duration, started, started)
+                for kind, name, _, _, started, _, duration, reason in rows
+            ],
+        }
+        try:
+            with self.db_lock:
+                db = self._connection()
+                with db:
+                    db.executemany(
+                        "INSERT INTO plays (kind, name, source, playlist, started, ended, duration, reason) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    for table, values in rollups.items():
+                        key = PROOF_OF_PLAY_ROLLUPS[table][0]
+                        db.executemany(
+                            f"INSERT INTO {table} VALUES (?, ?, ?, 1, ?, ?, ?, ?) "
+                            f"ON CONFLICT ({key}, kind, name) DO UPDATE SET "
+                            "plays = plays + 1, completed = completed + excluded.completed, "
+                            "airtime = airtime + excluded.airtime, "
+                            "first_started = MIN(first_started, excluded.first_started), "
+                            "last_started = MAX(last_started, excluded.last_started)",
+                            values,
+                        )
+        except sqlite3.Error:
+            with self.lock:
+                self.pending[:0] = rows
+            raise
+        return len(rows)
+
+    def prune(self):
+        """Saklama süresini aşan ham kayıtları sil (saatlik özet kalır)"""
+        cutoff = self.clock() - float(self.settings["raw_retention_days"]) * 86400
+        with self.db_lock:
+            db = self._connection()
+            with db:
+                deleted = db.execute("DELETE FROM plays WHERE started < ?", (cutoff,)).rowcount
+        if deleted:
+            logger.info(f"Eski yayın kayıtları silindi: {deleted}")
+        return deleted
+
+    @staticmethod
+    def _filters(kind, name):
+        sql, params = "", []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if name:
+            sql += " AND name = ?"
+            params.append(name)
+        return sql, params
+
+    @staticmethod
+    def _ranges(start, end, days=True):
+        """[start, end) aralığını (tablo, alt, üst) parçalarına böl.
+
+        Tam günler ``play_days``, kalan tam saatler ``play_hours``, saat
+        sınırına denk gelmeyen kenarlar ``plays`` tablosundan okunur.
+        """
+        first_hour = max(-int(-start // 3600), 0)
+        last_hour = int(end // 3600)
+        if first_hour >= last_hour:
+            return [("plays", start, end)]
+        parts = [("plays", start, first_hour * 3600), ("plays", last_hour * 3600, end)]
+        first_day = local_day(first_hour * 3600)
+        if local_midnight(first_day) < first_hour * 3600:
+            first_day += 1
+        last_day = local_day(last_hour * 3600)
+        if days and first_day < last_day:
+            parts.append(("play_days", first_day, last_day))
+            parts.append(("play_hours", first_hour, int(local_midnight(first_day) // 3600)))
+            parts.append(("play_hours", int(local_midnight(last_day) // 3600), last_hour))
+        else:
+            parts.append(("play_hours", first_hour, last_hour))
+        return [p for p in parts if p[1] < p[2]]
+
+    def summary(self, start=None, end=None, kind=None, name=None, bucket=None):
+        """Öğe başına oynatma sayısı ve yayın süresi (başlangıç zamanına göre).
+
+        ``bucket`` verilirse (``hour``, ``day``, ``month``) sonuçlar yerel
+        saatle bu aralıklara da bölünür.
+        """
+        self.flush()
+        start = 0.0 if start is None else float(start)
+        end = self.clock() if end is None else float(end)
+        filters, params = self._filters(kind, name)
+        fmt = PROOF_OF_PLAY_BUCKETS[bucket] if bucket else None
+        selects, values = [], []
+        for table, low, high in self._ranges(start, end, days=bucket != "hour"):
+            if table == "plays":
+                bucket_sql = f"strftime('{fmt}', started, 'unixepoch', 'localtime')" if fmt else "NULL"
+                selects.append(
+                    f"SELECT {bucket_sql} AS bucket, kind, name, COUNT(*) AS plays, "
+                    "SUM(reason = 'eof') AS completed, SUM(duration) AS airtime, "
+                    f"MIN(started) AS first, MAX(started) AS last FROM plays WHERE started >= ? AND started < ?{filters} "
+                    "GROUP BY 1, 2, 3"
+                )
+            else:
+                key, when = PROOF_OF_PLAY_ROLLUPS[table]
+                bucket_sql = f"strftime('{fmt}', {when})" if fmt else "NULL"
+                selects.append(
+                    f"SELECT {bucket_sql} AS bucket, kind, name, SUM(plays) AS plays, "
+                    "SUM(completed) AS completed, SUM(airtime) AS airtime, "
+                    f"MIN(first_started) AS first, MAX(last_started) AS last FROM {table} "
+                    f"WHERE {key} >= ? AND {key} < ?{filters} GROUP BY 1, 2, 3"
+                )
+            values += [low, high] + params
+        # Her parça kendi içinde toplanır; dış sorgu yalnızca birkaç satırı birleştirir
+        query = (
+            "SELECT bucket, kind, name, SUM(plays), SUM(completed), SUM(airtime), MIN(first), MAX(last) "
+            "FROM (" + " UNION ALL ".join(selects) + ") "
+            "GROUP BY bucket, kind, name ORDER BY bucket, SUM(airtime) DESC"
+        )
+        with self.db_lock:
+            rows = self._connection().execute(query, values).fetchall()
+        items = []
+        for bucket_key, row_kind, row_name, plays, completed, airtime, first, last in rows:
+            item = {
+                "kind": row_kind,
+                "name": row_name,
+                "plays": plays,
+                "completed": completed,
+                "airtime": round(airtime, 3),
+                "first_started": first,
+                "last_started": last,
+            }
+            if bucket:
+                item["bucket"] = bucket_key
+            items.append(item)
+        return items
+
+    def plays(self, start=None, end=None, kind=None, name=None, limit=1000):
+        """Tek tek oynatma kayıtları, en yeniden eskiye"""
+        self.flush()
+        filters, params = self._filters(kind, name)
+        start = 0.0 if start is None else float(start)
+        end = self.clock() if end is None else float(end)
+        with self.db_lock:
+            rows = self._connection().execute(
+                "SELECT kind, name, source, playlist, started, ended, duration, reason FROM plays "
+                f"WHERE started >= ? AND started < ?{filters} ORDER BY started DESC LIMIT ?",
+                [start, end] + params + [int(limit)],
+            ).fetchall()
+        keys = ("kind", "name", "source", "playlist", "started", "ended", "duration", "reason")
+        return [dict(zip(keys, row)) for row in rows]
+
+
+PLAYBACK_STATE_FILE = os.path.join(BASE_DIR, "cache", "playback_state.json")
+PLAYBACK_STATE_DEFAULTS = {
+    "enabled": True,
+    "interval": 1.0,
+    "heartbeat": 5.0,
+    "drift": 2.0,
+}
+
+
+class PlaybackState:
+    """Oynatma durumunun kalıcı anlık görüntüsü ve açılışta kaldığı yerden devam.
+
+    Kaynak, oynatma listesi, listedeki konum ve ``time-pos`` ``interval``
+    saniyede bir IPC üzerinden okunur. Video konumu, dosyanın başladığı
+    duvar saati (``anchor``) olarak saklanır; oynatma sürdükçe bu değer
+    sabit kalır. Dosya ``cache/playback_state.json`` içine atomik olarak
+    yalnızca kaynak veya öğe değiştiğinde, çapa ``drift`` saniyeden fazla
+    kaydığında (duraklatma, atlama) ve video oynarken ``heartbeat`` saniyede
+    bir yazılır. Açılışta konum ``saved - anchor`` olarak hesaplanır; kayıtlı
+    kaynak hâlâ geçerliyse aynı öğe ve konumdan başlatılır, değilse
+    varsayılan videoya dönülür.
+    """
+
+    def __init__(self, media_player, settings=None, state_file=None, clock=time.time):
+        self.player = media_player
+        self.settings = dict(PLAYBACK_STATE_DEFAULTS)
+        self.settings.update(settings or {})
+        self.state_file = state_file
+        self.clock = clock
+        self.lock = Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self._written = None
+        self._written_at = None
+        self._items = (None, None)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _loop(self):
+        while not self.stop_event.wait(float(self.settings["interval"])):
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"Oynatma durumu kaydedilemedi: {e}")
+
+    def _playlist_items(self, process):
+        """mpv oynatma listesindeki dosya adları; her süreç için bir kez okunur"""
+        if self._items[0] is not process:
+            entries = self.player.ipc.get_property("playlist")
+            if not entries:
+                return None
+            self._items = (process, [os.path.basename(e.get("filename", "")) for e in entries])
+        return self._items[1]
+
+    def snapshot(self):
+        """Oynatıcının şu anki durumu; geçiş anındaysa None"""
+        player = self.player
+        ipc = player.ipc
+        process = player.current_process
+        source = player.current_source
+        if process is None or source is None:
+            return {"source": None}
+        if process.poll() is not None or source in ("splash", "tekrar"):
+            return None
+        state = {"source": source, "automation_paused": player.automation_paused}
+        if player.camera_fallback or source == "camera":
+            state.update(source="camera", camera=(player.current_camera or {}).get("name"))
+            return state
+        if source == "playlist":
+            state["playlist"] = player.current_playlist
+        else:
+            items = self._playlist_items(process)
+            if not items:
+                return None
+            state["items"] = items
+            if source == "slayt":
+                interval = ipc.get_property("image-display-duration")
+                if isinstance(interval, (int, float)):
+                    state["interval"] = interval
+        path = ipc.get_property("path")
+        if path is None:
+            return None
+        state["path"] = path
+        found = media_kind_for_path(path)
+        if found and found[0] == "video":
+            position = ipc.get_property("time-pos")
+            if isinstance(position, (int, float)):
+                state["anchor"] = round(self.clock() - position, 1)
+        return state
+
+    def _unchanged(self, state, now):
+        written = self._written
+        if written is None:
+            return False
+        if {k: v for k, v in state.items() if k != "anchor"} != {
+            k: v for k, v in written.items() if k != "anchor"
+        }:
+            return False
+        if "anchor" not in state:
+            return True
+        if abs(state["anchor"] - written["anchor"]) > float(self.settings["drift"]):
+            return False
+        return now - self._written_at < float(self.settings["heartbeat"])
+
+    def save(self, force=False):
+        """Durum değiştiyse dosyaya yaz; yazıldıysa True.
+
+        ``force`` kapanışta kullanılır: aynı öğe için de güncel konum yazılır.
+        """
+        if not self.state_file:
+            return False
+        with self.lock:
+            state = self.snapshot()
+            now = self.clock()
+            if state is None or (not force and self._unchanged(state, now)):
+                return False
+            data = dict(state, saved=now)
+            try:
+                os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+                _write_atomic(self.state_file, json.dumps(data).encode("utf-8"))
+            except OSError as e:
+                logger.warning(f"Oynatma durumu yazılamadı: {e}")
+                return False
+            self._written = state
+            self._written_at = now
+            return True
+
+    @staticmethod
+    def position(state):
+        """Kayıttaki videonun konumu: son yazımdaki saat ile çapa farkı"""
+        if state.get("anchor") is None or state.get("saved") is None:
+            return None
+        return max(0.0, round(float(state["saved"]) - float(state["anchor"]), 1))
+
+    def load(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Oynatma durumu okunamadı: {e}")
+            return None
+
+    def resume(self):
+        """Kayıtlı durumu geri yükle; kaynak artık geçerli değilse False"""
+        state = self.load() if self.state_file else None
+        if not state or not state.get("source"):
+            return False
+        player = self.player
+        source = state["source"]
+        player.resume_point = {"path": state.get("path"), "time": self.position(state)}
+        try:
+            if source == "camera":
+                names = [c.get("name") for c in player.config.get("cameras", [])]
+                if state.get("camera") in names:
+                    success, message = player.play_camera(state["camera"])
+                else:
+                    success, message = False, "Kamera yapılandırmada yok"
+            elif source == "playlist":
+                if state.get("playlist") in player.config.get("playlists", {}):
+                    success, message = player.play_playlist(state["playlist"])
+                else:
+                    success, message = False, "Oynatma listesi bulunamadı"
+            elif source in ("video", "slayt"):
+                kind = "video" if source == "video" else "image"
+                items = [
+                    n for n in state.get("items", [])
+                    if n.lower().endswith(media_extensions(kind))
+                    and os.path.exists(os.path.join(media_dir(kind), n))
+                ]
+                if not items:
+                    success, message = False, "Kayıtlı dosyalar bulunamadı"
+                elif kind == "video":
+                    success, message = player.play_video(items)
+                else:
+                    success, message = player.play_slideshow(items, state.get("interval") or 5)
+            else:
+                success, message = False, "Bilinmeyen kaynak"
+        finally:
+            player.resume_point = None
+        if not success:
+            logger.warning(f"Kayıtlı oynatma durumu geri yüklenemedi ({source}): {message}")
+            return False
+        player.automation_paused = bool(state.get("automation_paused", player.automation_paused))
+        logger.info(f"Oynatma kaldığı yerden sürdürüldü: {source} {state.get('path') or ''}".rstrip())
+        return True
+
+
+LOUDNESS_DEFAULTS = {
+    "enabled": True,
+    "target_lufs": -23.0,
+    "max_true_peak": -1.0,
+    "max_gain_db": 12.0,
+    "timeout": 600,
+}
+LOUDNESS_SILENCE_LUFS = -70.0
+
+
+def analyze_loudness(path, timeout=600):
+    """ffmpeg ebur128 filtresiyle tümleşik ses yüksekliği (LUFS) ve gerçek tepe (dBTP).
+
+    Ses akışı yoksa ``{"audio": False}`` döner. ffmpeg düşük öncelikle çalışır.
+    """
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats", "-nostdin", "-i", path,
+        "-map", "0:a:0", "-af", "ebur128=peak=true", "-f", "null", "-",
+    ]
+    if shutil.which("ionice"):
+        cmd = ["ionice", "-c", "3"] + cmd
+    if shutil.which("nice"):
+        cmd = ["nice", "-n", "19"] + cmd
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    output = result.stderr
+    if result.returncode != 0:
+        if "matches no streams" in output:
+            return {"audio": False}
+        raise RuntimeError(output.strip().splitlines()[-1] if output.strip() else "ffmpeg başarısız")
+    summary = output[output.rfind("Summary:"):]
+    integrated = re.search(r"I:\s+(-?[\d.]+|-inf) LUFS", summary)
+    peak = re.search(r"Peak:\s+(-?[\d.]+|-inf) dBFS", summary)
+    if not integrated:
+        raise RuntimeError("ebur128 özeti okunamadı")
+    lra = re.search(r"LRA:\s+(-?[\d.]+) LU", summary)
+    return {
+        "audio": True,
+        "integrated": max(float(integrated.group(1)), LOUDNESS_SILENCE_LUFS),
+        "true_peak": float(peak.group(1)) if peak else None,
+        "lra": float(lra.group(1)) if lra else None,
+    }
+
+
+class LoudnessAnalyzer:
+    """Videoların ses yüksekliğini girişte bir kez ölç, oynatmada sabit kazanç uygula.
+
+    Yeni ve değişen videolar tek bir arka plan iş parçacığında sırayla
+    ``ffmpeg`` ebur128 (EBU R128) ile analiz edilir; sonuç kütüphane
+    dizininde dosyanın boyut/mtime kaydıyla birlikte saklanır. Aynı içeriğe
+    sahip dosyalar yeniden ölçülmez. Oynatmada mpv'de gerçek zamanlı
+    normalizasyon filtresi yerine dosya başına ``--volume`` kullanılır.
+    """
+
+    def __init__(self, media_library, settings=None, analyze=analyze_loudness):
+        self.library = media_library
+        self.settings = dict(LOUDNESS_DEFAULTS)
+        self.settings.update(settings or {})
+        self.analyze = analyze
+        self.queue = queue.Queue()
+        self.pending = set()
+        self.lock = Lock()
+        self.thread = None
+        self.errors = {}
+
+    def scan(self):
+        """Ölçümü olmayan videoları kuyruğa ekle; eklenen sayıyı döndür"""
+        if not self.settings["enabled"] or not shutil.which("ffmpeg"):
+            return 0
+        added = 0
+        with self.lock:
+            for name, entry in self.library.refresh("video").items():
+                failed = self.errors.get(name)
+                if failed and (failed["size"], failed["mtime"]) == (entry["size"], entry["mtime"]):
+                    # Aynı dosya tekrar denenmez; değişirse yeniden ölçülür
+                    continue
+                if entry.get("loudness") is None and name not in self.pending:
+                    self.pending.add(name)
+                    self.queue.put(name)
+                    added += 1
+            if added and (self.thread is None or not self.thread.is_alive()):
+                self.thread = threading.Thread(target=self._worker, daemon=True)
+                self.thread.start()
+        return added
+
+    def _worker(self):
+        while True:
+            try:
+                name = self.queue.get(timeout=5)
+            except queue.Empty:
+                with self.lock:
+                    if self.queue.empty():
+                        self.thread = None
+                        return
+                continue
+            try:
+                self.process(name)
+            except Exception as e:
+                logger.warning(f"Ses yüksekliği ölçülemedi ({name}): {e}")
+                entry = self.library.refresh("video").get(name) or {}
+                with self.lock:
+                    self.errors[name] = {"message": str(e), "size": entry.get("size"), "mtime": entry.get("mtime")}
+            finally:
+                with self.lock:
+                    self.pending.discard(name)
+
+    def process(self, name):
+        """Tek bir videoyu ölç ve dizine yaz"""
+        entry = self.library.refresh("video").get(name)
+        if entry is None or entry.get("loudness") is not None:
+            return False
+        result = None
+        if entry.get("hash"):
+            for other in self.library.refresh("video").values():
+                if other["name"] != name and other.get("hash") == entry["hash"] and other.get("loudness"):
+                    result = other["loudness"]
+                    break
+        if result is None:
+            started = time.monotonic()
+            result = self.analyze(os.path.join(VIDEO_DIR, name), timeout=self.settings["timeout"])
+            logger.info(
+                f"Ses yüksekliği ölçüldü: {name} {result.get('integrated')} LUFS "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+        return self.library.record_loudness("video", name, result, entry)
+
+    def gain(self, name, entry=None):
+        """Dosya için dB cinsinden sabit kazanç; ölçüm yoksa None.
+
+        ``entry`` verilirse kütüphane yeniden taranmaz.
+        """
+        if not self.settings["enabled"]:
+            return None
+        if entry is None:
+            entry = self.library.refresh("video").get(name)
+        measured = (entry or {}).get("loudness")
+        if not measured or not measured.get("audio"):
+            return None
+        if measured["integrated"] <= LOUDNESS_SILENCE_LUFS:
+            return 0.0
+        gain = float(self.settings["target_lufs"]) - measured["integrated"]
+        if measured.get("true_peak") is not None:
+            # Kazanç gerçek tepeyi sınırın üstüne çıkarmamalı
+            gain = min(gain, float(self.settings["max_true_peak"]) - measured["true_peak"])
+        limit = float(self.settings["max_gain_db"])
+        return round(max(-limit * 2, min(gain, limit)), 2)
+
+    def volume(self, name, base=100.0):
+        """Kazancın mpv ``volume`` karşılığı; mpv yazılım sesi kübik ölçeklidir"""
+        gain = self.gain(name)
+        if gain is None:
+            return None
+        return base * 10 ** (gain / 60)
+
+    def status(self, gains=False):
+        """Ölçüm durumu; ``gains`` ile tüm dosyaların kazançları aynı taramadan hesaplanır"""
+        entries = self.library.refresh("video")
+        measured = sum(1 for e in entries.values() if e.get("loudness") is not None)
+        with self.lock:
+            report = {
+                "enabled": self.settings["enabled"],
+                "measured": measured,
+                "pending": len(self.pending),
+                "errors": {name: e["message"] for name, e in self.errors.items()},
+            }
+        if gains:
+            report["gains"] = {name: self.gain(name, entry) for name, entry in entries.items()}
+        return report
+
+
+def create_output(entry, config):
+    """Ek ekran çıkışı için oynatıcı ve ona bağlı servisleri oluştur.
+
+    Her çıkışın kendi mpv süreci, IPC soketi, kilidi, zamanlayıcısı, duyuru
+    tamponu ve durum dosyası vardır; bir çıkıştaki kaynak değişimi diğerini
+    beklemez.
+    """
+    target = MediaPlayer(entry, config)
+    name = target.name
+    own = entry.get("announcements") or {}
+    announcement_settings = dict(config.get("announcements") or {}, **own)
+    announcement_settings["buffer_path"] = own.get("buffer_path") or default_overlay_path(name)
+    return {
+        "player": target,
+        "announcements": AnnouncementEngine(target, announcement_settings),
+        "watchdog": CameraWatchdog(target, config.get("camera_watchdog")),
+        "state": PlaybackState(
+            target,
+            config.get("playback_state"),
+            os.path.join(BASE_DIR, "cache", f"playback_state-{name}.json"),
+        ),
+    }
+
 
-    def pause_automation(self):
-        self.automation_paused = True
+def create_outputs(primary):
+    """Yapılandırmadaki ``outputs`` listesinden ek çıkışları oluştur"""
+    outputs = {}
+    for entry in primary.config.get("outputs", []):
+        name = entry.get("name")
+        if not name or name == primary.name or name in outputs:
+            logger.error(f"Geçersiz veya yinelenen çıkış adı: {name!r}")
+            continue
+        outputs[name] = create_output(entry, primary.config)
+    return outputs
 
-    def resume_automation(self):
-        self.automation_paused = False
 
-    def show_announcement(self, text, duration=10):
-        socket_path = "/tmp/mpvsocket"
-        if not os.path.exists(socket_path):
-            logger.error("MPV soketi bulunamadı")
-            return False, "Oynatıcı hazır değil"
-        try:
-            import socket as s
-
-            client = s.socket(s.AF_UNIX, s.SOCK_STREAM)
-            client.connect(socket_path)
-            cmd = {"command": ["show-text", text, duration * 1000]}
-            client.send((json.dumps(cmd) + "\n").encode("utf-8"))
-            client.close()
-            logger.info("Duyuru gösterildi")
-            return True, "Duyuru gösterildi"
-        except Exception as e:
-            logger.error(f"Duyuru hatası: {e}")
-            return False, str(e)
+def output_players():
+    return [player] + [o["player"] for o in extra_outputs.values()]
 
 
 # Global media player instance
 player = MediaPlayer()
+library = MediaLibrary(LIBRARY_INDEX_FILE)
+loudness = LoudnessAnalyzer(library, player.config.get("loudness"))
+video_wall = None
+extra_outputs = create_outputs(player)
+camera_watchdog = CameraWatchdog(player, player.config.get("camera_watchdog"))
+announcements = AnnouncementEngine(player, player.config.get("announcements"))
+storage = StorageManager(
+    player, library, player.config.get("storage"), others=[o["player"] for o in extra_outputs.values()]
+)
+camera_recorder = RecordingManager(player, player.config.get("recording"))
+snapshots = CameraSnapshots(player.config.get("camera_snapshots"))
+telemetry = PlaybackTelemetry(player, player.config.get("telemetry"), TELEMETRY_FILE)
+proof_of_play = ProofOfPlayLog(player, player.config.get("proof_of_play"), PROOF_OF_PLAY_DB)
+playback_state = PlaybackState(player, player.config.get("playback_state"), PLAYBACK_STATE_FILE)
+startup_timer.mark("media_player")
 
 # Konfigürasyondan gizli anahtar ve kullanıcı bilgilerini al
 app.config["SECRET_KEY"] = player.config.get("SECRET_KEY", "change-me")
@@ -543,10 +4786,11 @@ def login():
         password = request.form.get("password")
         remember = bool(request.form.get("remember"))
 
-        if (
-            username == app.config.get("USERNAME")
-            and check_password_hash(app.config.get("PASSWORD_HASH", ""), password)
-        ):
+        with request_timing.phase("auth"):
+            valid = username == app.config.get("USERNAME") and check_password_hash(
+                app.config.get("PASSWORD_HASH", ""), password
+            )
+        if valid:
             login_user(User(username), remember=remember)
             flash("Başarıyla giriş yapıldı", "success")
             return redirect(url_for("dashboard"))
@@ -573,7 +4817,9 @@ def change_password():
         new_pass = request.form.get("new_password")
         confirm = request.form.get("confirm_password")
 
-        if not check_password_hash(app.config.get("PASSWORD_HASH", ""), current):
+        with request_timing.phase("auth"):
+            valid = check_password_hash(app.config.get("PASSWORD_HASH", ""), current)
+        if not valid:
             flash("Mevcut şifre hatalı", "error")
         elif new_pass != confirm:
             flash("Yeni şifreler eşleşmiyor", "error")
@@ -602,23 +4848,117 @@ def dashboard():
     return render_template("dashboard.html")
 
 
+def selected_output(data=None):
+    """İstekteki ``output`` seçicisine göre çıkış servisleri; bilinmeyen çıkışta None.
+
+    Seçici verilmezse ana çıkış kullanılır.
+    """
+    name = request.args.get("output") or (data or {}).get("output")
+    if not name or name == player.name:
+        return {
+            "player": player,
+            "announcements": announcements,
+            "watchdog": camera_watchdog,
+            "state": playback_state,
+        }
+    return extra_outputs.get(name)
+
+
+def unknown_output():
+    return jsonify({"success": False, "message": "Çıkış bulunamadı"})
+
+
 @app.route("/status")
 @login_required
 def status():
     """Sistem durumu"""
-    return jsonify(player.get_status())
+    output = selected_output()
+    if output is None:
+        return unknown_output()
+    return jsonify(output["player"].get_status())
+
+
+@app.route("/outputs")
+@login_required
+def outputs_status():
+    """Tüm ekran çıkışlarının durumu"""
+    return jsonify(
+        {
+            "success": True,
+            "outputs": [
+                dict(target.get_status(), ipc_socket=target.ipc_socket) for target in output_players()
+            ],
+        }
+    )
+
+
+def conditional_json(etag, build):
+    """ETag eşleşirse gövdesiz 304, aksi halde ``build()`` sonucunu döndür.
+
+    ``no-cache`` ile tarayıcı her seferinde yeniden doğrulama yapar, böylece
+    değişmeyen listeler yalnızca başlık maliyetine gelir.
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+# Sürüm sayaçları yeniden başlatmada sıfırlanır; ETag'lere süreç kimliği
+# eklenerek önceki çalışmadan kalan ETag'lerin yanlış 304 alması önlenir
+BOOT_ID = os.urandom(4).hex()
+
+
+def collection_etag(name, version):
+    """Koleksiyon sürümü ve sorgu parametrelerinden ETag üret"""
+    digest = hashlib.sha1(request.query_string).hexdigest()[:12]
+    return f"{name}-{BOOT_ID}-{version}-{digest}"
+
+
+def media_listing(kind, key):
+    """Sayfalama/sıralama/filtre parametrelerini uygulayarak listeyi döndür"""
+    args = request.args
+    limit = args.get("limit", type=int)
+    if limit is not None:
+        limit = max(1, min(limit, 1000))
+
+    def build():
+        items, total, next_cursor = library.query(
+            kind,
+            sort=args.get("sort", "name"),
+            order=args.get("order", "asc"),
+            q=args.get("q"),
+            cursor=args.get("cursor"),
+            limit=limit,
+        )
+        names = [i["name"] for i in items]
+        data = {key: names, "total": total, "next_cursor": next_cursor}
+        data["problems"] = telemetry.problems(kind, set(names))
+        if args.get("details"):
+            data["items"] = [dict(i, playback=telemetry.summary(kind, i["name"])) for i in items]
+        return data
+
+    # Ayrıntılı liste her oynatmada, sorun listesi yalnızca sorunlar değişince yenilenir
+    stats_version = telemetry.version if args.get("details") else telemetry.problems_version
+    try:
+        return conditional_json(collection_etag(key, f"{library.version(kind)}.{stats_version}"), build)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
 
 @app.route("/videos")
 @login_required
 def videos():
-    return jsonify({"videos": player.get_video_files()})
+    return media_listing("video", "videos")
 
 
 @app.route("/images")
 @login_required
 def images():
-    return jsonify({"images": player.get_image_files()})
+    return media_listing("image", "images")
 
 
 @app.route("/play_video", methods=["POST"])
@@ -627,11 +4967,15 @@ def play_video():
     """Video oynatma endpoint'i"""
     logger.info("Video oynatma isteği alındı")
     data = request.get_json(silent=True) or {}
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    target = output["player"]
     videos = data.get("videos")
-    success, message = player.play_video(videos)
+    success, message = target.play_video(videos)
 
     return jsonify(
-        {"success": success, "message": message, "status": player.get_status()}
+        {"success": success, "message": message, "status": target.get_status()}
     )
 
 
@@ -641,11 +4985,56 @@ def play_camera():
     """Kamera yayını endpoint'i"""
     logger.info("Kamera yayını isteği alındı")
     data = request.get_json(silent=True) or {}
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    target = output["player"]
     name = data.get("name")
-    success, message = player.play_camera(name)
+    success, message = target.play_camera(name)
 
     return jsonify(
-        {"success": success, "message": message, "status": player.get_status()}
+        {"success": success, "message": message, "status": target.get_status()}
+    )
+
+
+@app.route("/playlists", methods=["GET", "POST", "DELETE"])
+@login_required
+def playlists():
+    """Oynatma listelerini listele, kaydet veya sil"""
+    if request.method == "GET":
+        return conditional_json(
+            collection_etag("playlists", player.config_version),
+            lambda: {"playlists": player.config.get("playlists", {})},
+        )
+    data = request.get_json(silent=True) or {}
+    name = (data.get("name") or "").strip()
+    if not name:
+        return jsonify({"success": False, "message": "Oynatma listesi adı belirtilmedi"})
+    if request.method == "DELETE":
+        if not player.delete_playlist(name):
+            return jsonify({"success": False, "message": "Oynatma listesi bulunamadı"})
+        return jsonify({"success": True})
+    playlist, error = validate_playlist(data)
+    if error:
+        return jsonify({"success": False, "message": error})
+    player.save_playlist(name, playlist)
+    logger.info(f"Oynatma listesi kaydedildi: {name}")
+    return jsonify({"success": True, "playlist": playlist})
+
+
+@app.route("/play_playlist", methods=["POST"])
+@login_required
+def play_playlist():
+    """Oynatma listesi endpoint'i"""
+    logger.info("Oynatma listesi isteği alındı")
+    data = request.get_json(silent=True) or {}
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    target = output["player"]
+    success, message = target.play_playlist(data.get("name"))
+    return jsonify(
+        {"success": success, "message": message, "status": target.get_status()}
     )
 
 
@@ -655,11 +5044,15 @@ def play_slideshow():
     """Slayt gösterisi endpoint'i"""
     logger.info("Slayt gösterisi isteği alındı")
     data = request.get_json(silent=True) or {}
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    target = output["player"]
     images = data.get("images")
     interval = data.get("interval", 5)
-    success, message = player.play_slideshow(images, interval)
+    success, message = target.play_slideshow(images, interval)
     return jsonify(
-        {"success": success, "message": message, "status": player.get_status()}
+        {"success": success, "message": message, "status": target.get_status()}
     )
 
 
@@ -668,13 +5061,17 @@ def play_slideshow():
 def stop():
     """Oynatmayı durdur"""
     logger.info("Durdurma isteği alındı")
-    success = player.stop_current()
+    output = selected_output(request.get_json(silent=True))
+    if output is None:
+        return unknown_output()
+    target = output["player"]
+    success = target.stop_current()
 
     return jsonify(
         {
             "success": success,
             "message": "Oynatma durduruldu" if success else "Hata oluştu",
-            "status": player.get_status(),
+            "status": target.get_status(),
         }
     )
 
@@ -682,16 +5079,61 @@ def stop():
 @app.route("/announce", methods=["POST"])
 @login_required
 def announce():
-    data = request.get_json(force=True)
-    message = data.get("message", "") if data else ""
+    data = request.get_json(force=True) or {}
     logger.info("Duyuru istegi alindi")
-    success, msg = player.show_announcement(message)
-    return jsonify({"success": success, "message": msg})
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    try:
+        expires_at = parse_timestamp(data.get("expires_at"))
+        if expires_at is None and data.get("expires_in"):
+            expires_at = time.time() + float(data["expires_in"])
+        item = output["announcements"].add(
+            data.get("message", ""),
+            priority=data.get("priority", 0),
+            duration=data.get("duration"),
+            kind=data.get("kind", "banner"),
+            start_at=parse_timestamp(data.get("start_at")),
+            expires_at=expires_at,
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "message": str(e)})
+    return jsonify({"success": True, "message": "Duyuru sıraya alındı", "announcement": item})
+
+
+@app.route("/announcements", methods=["GET", "DELETE"])
+@login_required
+def announcement_queue():
+    """Duyuru sırasını listele veya duyuru kaldır"""
+    data = request.get_json(silent=True) or {}
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    engine = output["announcements"]
+    if request.method == "GET":
+        return jsonify(dict(engine.status(), success=True))
+    if data.get("all"):
+        removed = engine.remove()
+    elif data.get("id") is not None:
+        try:
+            announcement_id = int(data["id"])
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "message": "Geçersiz duyuru kimliği"})
+        removed = engine.remove(announcement_id)
+    else:
+        return jsonify({"success": False, "message": "Duyuru belirtilmedi"})
+    if not removed:
+        return jsonify({"success": False, "message": "Duyuru bulunamadı"})
+    return jsonify({"success": True, "removed": removed})
 
 
 @app.route("/upload", methods=["POST"])
 @login_required
 def upload():
+    # Gövde okunmadan önce yer kontrolü yapılır
+    ok, message = storage.preflight(request.content_length)
+    if not ok:
+        return jsonify({"success": False, "message": message})
     if "files[]" not in request.files:
         return jsonify({"success": False, "message": "Dosya bulunamadı"})
 
@@ -699,8 +5141,9 @@ def upload():
 
     for file in files:
         if file:
-            filename = secure_filename(file.filename)
-            file.save(os.path.join(app.config["UPLOAD_FOLDER"], filename))
+            save_upload(file, "video", app.config["UPLOAD_FOLDER"])
+    storage.enforce()
+    loudness.scan()
 
     return jsonify({"success": True, "message": "Dosyalar yüklendi"})
 
@@ -708,6 +5151,9 @@ def upload():
 @app.route("/upload_image", methods=["POST"])
 @login_required
 def upload_image():
+    ok, message = storage.preflight(request.content_length)
+    if not ok:
+        return jsonify({"success": False, "message": message})
     if "files[]" not in request.files:
         return jsonify({"success": False, "message": "Dosya bulunamadı"})
 
@@ -715,12 +5161,187 @@ def upload_image():
 
     for file in files:
         if file:
-            filename = secure_filename(file.filename)
-            file.save(os.path.join(app.config["IMAGE_UPLOAD_FOLDER"], filename))
+            save_upload(file, "image", app.config["IMAGE_UPLOAD_FOLDER"])
+    storage.enforce()
 
     return jsonify({"success": True, "message": "Görseller yüklendi"})
 
 
+@app.route("/upload_check", methods=["POST"])
+@login_required
+def upload_check():
+    """Yüklemeden önce içeriğin cihazda olup olmadığını kontrol et.
+
+    İstemci dosyanın BLAKE2b (32 bayt) özetini ve boyutunu gönderir. İçerik
+    zaten varsa ``link`` ile yeni ad altında sabit bağ oluşturulabilir ve
+    aktarım tamamen atlanır.
+    """
+    data = request.get_json(silent=True) or {}
+    kind = "image" if data.get("type") == "image" else "video"
+    digest = (data.get("hash") or "").lower()
+    size = data.get("size")
+    if not digest:
+        return jsonify({"success": False, "message": "Özet belirtilmedi"})
+
+    existing = library.find_by_hash(kind, digest, size)
+    if not existing:
+        return jsonify({"success": True, "present": False})
+
+    result = {"success": True, "present": True, "name": existing["name"]}
+    filename = secure_filename(data.get("filename") or "")
+    if data.get("link") and filename and filename != existing["name"]:
+        if not filename.lower().endswith(media_extensions(kind)):
+            return jsonify({"success": False, "message": "Geçersiz dosya uzantısı"})
+        try:
+            link_media(kind, existing["name"], filename)
+            library.record_hash(kind, filename, digest)
+            result["linked"] = filename
+            logger.info(f"Yükleme atlandı, dosya bağlandı: {filename} -> {existing['name']}")
+        except Exception as e:
+            logger.error(f"Dosya bağlanamadı: {e}")
+            return jsonify({"success": False, "message": str(e)})
+    return jsonify(result)
+
+
+@app.route("/library/duplicates")
+@login_required
+def library_duplicates():
+    """Aynı içeriğe sahip dosyaları ve boşa harcanan disk alanını raporla"""
+    report = {}
+    for kind, key in (("video", "videos"), ("image", "images")):
+        groups = library.duplicates(kind)
+        report[key] = groups
+        report[f"{key}_wasted_bytes"] = sum(g["wasted_bytes"] for g in groups)
+    return jsonify(report)
+
+
+@app.route("/telemetry")
+@login_required
+def playback_telemetry():
+    """Dosya başına oynatma istatistikleri ve sorunlu medya"""
+    report = telemetry.report()
+    report["problems"] = {kind: telemetry.problems(kind) for kind in ("video", "image")}
+    report["success"] = True
+    return jsonify(report)
+
+
+@app.route("/loudness")
+@login_required
+def loudness_status():
+    """Girişte ölçülen ses yüksekliği ve oynatmada uygulanan kazançlar"""
+    report = loudness.status(gains=True)
+    report["success"] = True
+    return jsonify(report)
+
+
+def proof_of_play_query():
+    """Rapor endpoint'lerinin ortak filtreleri"""
+    args = request.args
+    return {
+        "start": parse_timestamp(args.get("start")),
+        "end": parse_timestamp(args.get("end")),
+        "kind": args.get("kind") or None,
+        "name": args.get("name") or None,
+    }
+
+
+@app.route("/proof_of_play")
+@login_required
+def proof_of_play_summary():
+    """Öğe başına oynatma sayısı ve yayın süresi"""
+    bucket = request.args.get("bucket") or None
+    if bucket is not None and bucket not in PROOF_OF_PLAY_BUCKETS:
+        return jsonify({"success": False, "message": "Geçersiz gruplama (hour, day, month)"})
+    try:
+        query = proof_of_play_query()
+        items = proof_of_play.summary(bucket=bucket, **query)
+    except ValueError:
+        return jsonify({"success": False, "message": "Geçersiz tarih"})
+    except sqlite3.Error as e:
+        logger.error(f"Yayın raporu alınamadı: {e}")
+        return jsonify({"success": False, "message": "Yayın kayıtları okunamadı"})
+    return jsonify({"success": True, "items": items, "start": query["start"], "end": query["end"]})
+
+
+@app.route("/proof_of_play/plays")
+@login_required
+def proof_of_play_plays():
+    """Tek tek oynatma kayıtları"""
+    limit = max(1, min(request.args.get("limit", 1000, type=int), 10000))
+    try:
+        plays = proof_of_play.plays(limit=limit, **proof_of_play_query())
+    except ValueError:
+        return jsonify({"success": False, "message": "Geçersiz tarih"})
+    except sqlite3.Error as e:
+        logger.error(f"Yayın kayıtları alınamadı: {e}")
+        return jsonify({"success": False, "message": "Yayın kayıtları okunamadı"})
+    return jsonify({"success": True, "plays": plays})
+
+
+@app.route("/recordings")
+@login_required
+def recordings():
+    """Kamera kayıt halkalarının durumu"""
+    return jsonify(
+        {
+            "success": True,
+            "enabled": camera_recorder.settings["enabled"],
+            "cameras": camera_recorder.status(),
+        }
+    )
+
+
+@app.route("/replay", methods=["POST"])
+@login_required
+def replay():
+    """Kamera kaydının son N dakikasını oynat"""
+    data = request.get_json(silent=True) or {}
+    output = selected_output(data)
+    if output is None:
+        return unknown_output()
+    target = output["player"]
+    name = data.get("camera") or (target.current_camera or {}).get("name")
+    if not name and camera_recorder.recorders:
+        name = next(iter(camera_recorder.recorders))
+    camera = camera_recorder.recorders.get(name)
+    if camera is None:
+        return jsonify({"success": False, "message": "Bu kamera için kayıt yok"})
+    try:
+        minutes = float(data.get("minutes", 2))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "Geçersiz süre"})
+    if minutes <= 0:
+        return jsonify({"success": False, "message": "Geçersiz süre"})
+    success, message = target.play_replay(name, camera.replay_segments(minutes))
+    return jsonify({"success": success, "message": message, "status": target.get_status()})
+
+
+@app.route("/storage")
+@login_required
+def storage_status():
+    """Disk kullanımı, silinebilecek medya ve son tahliye raporu"""
+    return jsonify(dict(storage.usage(), success=True))
+
+
+@app.route("/storage/evict", methods=["POST"])
+@login_required
+def storage_evict():
+    """Disk bütçesi politikasını hemen uygula (``dry_run`` ile yalnızca raporla)"""
+    data = request.get_json(silent=True) or {}
+    dry_run = bool(data.get("dry_run"))
+    try:
+        if data.get("target_free_mb") is not None:
+            target = int(float(data["target_free_mb"]) * 1024 * 1024)
+            report = storage.evict(target_free=target, dry_run=dry_run)
+        else:
+            report = storage.enforce(dry_run=dry_run)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "Geçersiz hedef değeri"})
+    if report is None:
+        return jsonify({"success": True, "message": "Disk kullanımı eşiğin altında"})
+    return jsonify({"success": True, "report": report})
+
+
 @app.route("/delete_video", methods=["POST"])
 @login_required
 def delete_video():
@@ -734,6 +5355,7 @@ def delete_video():
         filepath = os.path.join(VIDEO_DIR, secure_filename(filename))
         if os.path.exists(filepath):
             os.remove(filepath)
+            library.invalidate("video")
             logger.info(f"Video silindi: {filename}")
             return jsonify({"success": True, "message": "Video başarıyla silindi"})
         else:
@@ -756,6 +5378,7 @@ def delete_image():
         filepath = os.path.join(IMAGE_DIR, secure_filename(filename))
         if os.path.exists(filepath):
             os.remove(filepath)
+            library.invalidate("image")
             logger.info(f"Görsel silindi: {filename}")
             return jsonify({"success": True, "message": "Görsel başarıyla silindi"})
         else:
@@ -769,7 +5392,13 @@ def delete_image():
 @login_required
 def cameras():
     if request.method == "GET":
-        return jsonify({"cameras": player.config.get("cameras", [])})
+        return conditional_json(
+            collection_etag("cameras", player.config_version),
+            lambda: {
+                "cameras": player.config.get("cameras", []),
+                "snapshot_ttl": snapshots.settings["ttl"],
+            },
+        )
     data = request.get_json(force=True)
     name = data.get("name")
     if request.method == "POST":
@@ -800,31 +5429,84 @@ def cameras():
     return jsonify({"success": True})
 
 
+@app.route("/cameras/snapshot")
+@login_required
+def camera_snapshot():
+    """Kameranın kısa süre önbelleklenmiş anlık görüntüsü (JPEG)"""
+    name = request.args.get("name")
+    camera = next((c for c in player.config.get("cameras", []) if c.get("name") == name), None)
+    if camera is None:
+        return jsonify({"success": False, "message": "Kamera bulunamadı"})
+    data, error = snapshots.get(camera)
+    if data is None:
+        return jsonify({"success": False, "message": f"Anlık görüntü alınamadı: {error}"})
+    response = Response(data, mimetype="image/jpeg")
+    response.headers["Cache-Control"] = f"private, max-age={int(snapshots.settings['ttl'])}"
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@app.route("/bulk_delete", methods=["POST"])
+@login_required
+def bulk_delete():
+    """Video, görsel ve kameraları tek istekte sil"""
+    data = request.get_json(silent=True) or {}
+    result = {"success": True}
+    for kind, key in (("video", "videos"), ("image", "images")):
+        names = data.get(key) or []
+        if names:
+            result[key] = library.delete(kind, names)
+            logger.info(f"Toplu silme ({key}): {len(names)} dosya")
+    camera_names = data.get("cameras") or []
+    if camera_names:
+        result["cameras"] = player.remove_cameras(camera_names)
+    return jsonify(result)
+
+
+@app.route("/bulk_import", methods=["POST"])
+@login_required
+def bulk_import():
+    """Kamera listesini tek yapılandırma yazımıyla içe aktar"""
+    data = request.get_json(silent=True) or {}
+    camera_list = data.get("cameras")
+    if not isinstance(camera_list, list):
+        return jsonify({"success": False, "message": "Kamera listesi belirtilmedi"})
+    imported = player.import_cameras(camera_list)
+    logger.info(f"Toplu kamera içe aktarımı: {imported} kayıt")
+    return jsonify({"success": True, "imported": imported})
+
+
 @app.route("/resume", methods=["POST"])
 @login_required
 def resume():
-    player.resume_automation()
+    output = selected_output(request.get_json(silent=True))
+    if output is None:
+        return unknown_output()
+    output["player"].resume_automation()
     return jsonify({"success": True})
 
 
 @app.route("/system_info")
 @login_required
 def system_info():
+    import psutil
+
     temp = "N/A"
     disk = "N/A"
-    try:
-        out = subprocess.check_output(["vcgencmd", "measure_temp"]).decode()
-        temp = out.strip().split("=")[1]
-    except Exception:
-        logger.warning("İşlemci sıcaklığı okunamadı (vcgencmd komutu bulunamadı?).")
+    with request_timing.phase("subprocess"):
+        try:
+            out = subprocess.check_output(["vcgencmd", "measure_temp"]).decode()
+            temp = out.strip().split("=")[1]
+        except Exception:
+            logger.warning("İşlemci sıcaklığı okunamadı (vcgencmd komutu bulunamadı?).")
 
-    try:
-        out = (
-            subprocess.check_output(["df", "-h", "/"]).decode().splitlines()[1].split()
-        )
-        disk = f"{out[2]} / {out[1]} ({out[4]})"
-    except Exception:
-        logger.warning("Disk bilgisi okunamadı.")
+        try:
+            out = (
+                subprocess.check_output(["df", "-h", "/"]).decode().splitlines()[1].split()
+            )
+            disk = f"{out[2]} / {out[1]} ({out[4]})"
+        except Exception:
+            logger.warning("Disk bilgisi okunamadı.")
 
     try:
         mem = psutil.virtual_memory()
@@ -836,7 +5518,9 @@ def system_info():
         mem_percent, mem_total, mem_used = "N/A", "N/A", "N/A"
 
     try:
-        cpu = psutil.cpu_percent(interval=1)
+        # Ölçüm 1 sn bekler; Server-Timing'de ayrı görünür, yavaş istek sayılmaz
+        with request_timing.phase("cpu"):
+            cpu = psutil.cpu_percent(interval=1)
     except Exception as e:
         logger.warning(f"İşlemci kullanımı okunamadı: {e}")
         cpu = "N/A"
@@ -864,18 +5548,19 @@ def system_info():
 def logs():
     """Logları getir"""
     try:
-        log_files = sorted(
-            [os.path.join(LOG_DIR, f) for f in os.listdir(LOG_DIR)],
-            key=os.path.getmtime,
-            reverse=True,
-        )
-        if not log_files:
-            return jsonify({"success": False, "logs": "Log dosyası bulunamadı"})
+        with request_timing.phase("io"):
+            log_files = sorted(
+                [os.path.join(LOG_DIR, f) for f in os.listdir(LOG_DIR)],
+                key=os.path.getmtime,
+                reverse=True,
+            )
+            if not log_files:
+                return jsonify({"success": False, "logs": "Log dosyası bulunamadı"})
 
-        with open(log_files[0], "r", encoding="utf-8") as f:
-            # Son 100 satırı oku
-            lines = f.readlines()
-            last_100_lines = lines[-100:]
+            with open(log_files[0], "r", encoding="utf-8") as f:
+                # Son 100 satırı oku
+                lines = f.readlines()
+                last_100_lines = lines[-100:]
 
         return jsonify({"success": True, "logs": "".join(last_100_lines)})
     except Exception as e:
@@ -883,17 +5568,54 @@ def logs():
         return jsonify({"success": False, "logs": str(e)})
 
 
-def discover_onvif_cameras(progress_callback=None):
-    """Ağdaki tüm arayüzleri tarayarak ONVIF kameralarını keşfet (geliştirilmiş sürüm)"""
+ONVIF_PORTS = [80, 8080, 8000, 2020]
+ONVIF_TIMEOUT = 5
+
+
+def local_subnets():
+    """Yerel IPv4 arayüzlerinin /24 ağ öneklerini döndür (örn. 192.168.1)"""
+    import netifaces
+
+    subnets = set()
+    for iface in netifaces.interfaces():
+        ifaddrs = netifaces.ifaddresses(iface)
+        if netifaces.AF_INET in ifaddrs:
+            for addr_info in ifaddrs[netifaces.AF_INET]:
+                ip = addr_info.get("addr")
+                netmask = addr_info.get("netmask")
+                if ip and netmask and not ip.startswith("127."):
+                    try:
+                        # Subnet'i hesapla (örn: 192.168.1.0)
+                        ip_parts = list(map(int, ip.split(".")))
+                        mask_parts = list(map(int, netmask.split(".")))
+                        net_start = [ip_parts[i] & mask_parts[i] for i in range(4)]
+                        subnet = ".".join(map(str, net_start[:3]))
+                        subnets.add(subnet)
+                    except ValueError:
+                        logger.warning(
+                            f"Geçersiz IP/Netmask formatı: {ip}/{netmask}"
+                        )
+    return subnets
+
+
+def discover_onvif_cameras(
+    progress_callback=None, hosts=None, ports=None, timeout=ONVIF_TIMEOUT, max_workers=100
+):
+    """Ağdaki tüm arayüzleri tarayarak ONVIF kameralarını keşfet (geliştirilmiş sürüm)
+
+    ``hosts`` verilirse yerel ağlar yerine yalnızca bu adresler taranır.
+    ``timeout`` her SOAP isteği için üst sınırdır; yanıt vermeyen bir cihaz
+    taramayı bu süreden fazla bekletmez.
+    """
     discovered_cameras = []
 
     # Yaygın ONVIF portları. Bazı kameralar yönetim için farklı portlar kullanabilir.
-    COMMON_ONVIF_PORTS = [80, 8080, 8000, 2020]
+    ports = list(ports or ONVIF_PORTS)
 
     try:
         from onvif import ONVIFCamera
-        import netifaces
         import zeep
+        from zeep.transports import Transport
 
         logger.info("Geliştirilmiş ONVIF kamera keşfi başlatıldı.")
 
@@ -904,11 +5626,12 @@ def discover_onvif_cameras(progress_callback=None):
             try:
                 # Öncelikle portun açık olup olmadığını hızlıca kontrol et
                 with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(0.5)
+                    sock.settimeout(min(0.5, timeout))
                     if sock.connect_ex((ip, port)) != 0:
                         return None
 
-                cam = ONVIFCamera(ip, port, "", "", no_cache=True)
+                transport = Transport(timeout=timeout, operation_timeout=timeout)
+                cam = ONVIFCamera(ip, port, "", "", no_cache=True, transport=transport)
 
                 # Hostname bilgisi
                 try:
@@ -920,13 +5643,15 @@ def discover_onvif_cameras(progress_callback=None):
                 # RTSP URI bilgisi
                 rtsp_url = ""
                 try:
-                    media_profiles = cam.media.GetProfiles()
+                    # onvif-zeep medya servisini kendiliğinden oluşturmaz
+                    media = cam.create_media_service()
+                    media_profiles = media.GetProfiles()
                     if media_profiles:
                         token = media_profiles[0].token
-                        req = cam.media.create_type("GetStreamUri")
+                        req = media.create_type("GetStreamUri")
                         req.ProfileToken = token
                         req.StreamSetup = {"Stream": "RTP-Unicast", "Transport": {"Protocol": "RTSP"}}
-                        rtsp_url = cam.media.GetStreamUri(req).Uri
+                        rtsp_url = media.GetStreamUri(req).Uri
                 except zeep.exceptions.Fault as e:
                     logger.warning(
                         f"IP {ip}:{port} için stream URI alınamadı (Yetkilendirme gerekebilir): {e}"
@@ -946,39 +5671,22 @@ def discover_onvif_cameras(progress_callback=None):
             except Exception:
                 return None
 
-        subnets = set()
-        for iface in netifaces.interfaces():
-            ifaddrs = netifaces.ifaddresses(iface)
-            if netifaces.AF_INET in ifaddrs:
-                for addr_info in ifaddrs[netifaces.AF_INET]:
-                    ip = addr_info.get("addr")
-                    netmask = addr_info.get("netmask")
-                    if ip and netmask and not ip.startswith("127."):
-                        try:
-                            # Subnet'i hesapla (örn: 192.168.1.0)
-                            ip_parts = list(map(int, ip.split(".")))
-                            mask_parts = list(map(int, netmask.split(".")))
-                            net_start = [ip_parts[i] & mask_parts[i] for i in range(4)]
-                            subnet = ".".join(map(str, net_start[:3]))
-                            subnets.add(subnet)
-                        except ValueError:
-                            logger.warning(
-                                f"Geçersiz IP/Netmask formatı: {ip}/{netmask}"
-                            )
-
-        if not subnets:
-            logger.warning("Taranacak ağ arayüzü bulunamadı.")
-            return []
-
-        logger.info(f"Taranacak ağlar: {list(subnets)} üzerinde Portlar: {COMMON_ONVIF_PORTS}")
+        if hosts is None:
+            subnets = local_subnets()
+            if not subnets:
+                logger.warning("Taranacak ağ arayüzü bulunamadı.")
+                return []
+            logger.info(f"Taranacak ağlar: {list(subnets)} üzerinde Portlar: {ports}")
+            hosts = [f"{subnet_base}.{i}" for subnet_base in subnets for i in range(1, 255)]
+        else:
+            hosts = list(hosts)
+            logger.info(f"Taranacak adres sayısı: {len(hosts)}, Portlar: {ports}")
 
-        with ThreadPoolExecutor(max_workers=100) as executor:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = []
-            for subnet_base in subnets:
-                for i in range(1, 255):
-                    ip_to_check = f"{subnet_base}.{i}"
-                    for port in COMMON_ONVIF_PORTS:
-                        futures.append(executor.submit(check_onvif_camera, ip_to_check, port))
+            for ip_to_check in hosts:
+                for port in ports:
+                    futures.append(executor.submit(check_onvif_camera, ip_to_check, port))
 
             for future in as_completed(futures):
                 result = future.result()
@@ -1047,27 +5755,967 @@ def discover_cameras_stream():
     return Response(stream_with_context(event_stream()), mimetype="text/event-stream")
 
 
+# ---------------------------------------------------------------------------
+# Filo senkronizasyonu
+# ---------------------------------------------------------------------------
+
+SYNC_DEFAULTS = {
+    "token": "",
+    "peer": "",
+    "interval": 300,
+    "max_concurrency": 2,
+    "bandwidth_limit_kbps": 0,
+    "block_size": 1024 * 1024,
+    "config_keys": ["schedule", "default_video"],
+    "delete_extraneous": False,
+}
+SYNC_PART_SUFFIX = ".sync.part"
+
+sync_state = {"running": False, "last_run": None, "last_result": None}
+sync_lock = Lock()
+_block_hash_cache = {}
+
+
+def sync_settings():
+    settings = dict(SYNC_DEFAULTS)
+    settings.update(player.config.get("sync") or {})
+    return settings
+
+
+def sync_token_required(f):
+    """Eşler arası istekleri ``Authorization: Bearer <token>`` ile doğrula"""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        token = sync_settings().get("token")
+        header = request.headers.get("Authorization", "")
+        if not token or not hmac.compare_digest(header, f"Bearer {token}"):
+            return jsonify({"success": False, "message": "Geçersiz senkronizasyon anahtarı"}), 403
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+def block_hashes(path, block_size):
+    """Dosyanın sabit boyutlu bloklarının BLAKE2b özet listesi"""
+    hashes = []
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block_size), b""):
+            hashes.append(hashlib.blake2b(chunk, digest_size=16).hexdigest())
+    return hashes
+
+
+def cached_block_hashes(path, block_size):
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns, block_size)
+    hashes = _block_hash_cache.get(key)
+    if hashes is None:
+        hashes = block_hashes(path, block_size)
+        _block_hash_cache.clear()
+        _block_hash_cache[key] = hashes
+    return hashes
+
+
+def sync_media_path(kind, name):
+    if kind not in ("video", "image") or secure_filename(name) != name:
+        abort(404)
+    path = os.path.join(media_dir(kind), name)
+    if not os.path.isfile(path):
+        abort(404)
+    return path
+
+
+@app.route("/sync/manifest")
+@sync_token_required
+def sync_manifest():
+    """Bu cihazın medya ve yapılandırma özetini yayınla"""
+    settings = sync_settings()
+    manifest = {"block_size": settings["block_size"], "config": {}}
+    for kind, key in (("video", "videos"), ("image", "images")):
+        library.ensure_hashes(kind)
+        manifest[key] = [
+            {"name": e["name"], "size": e["size"], "hash": e["hash"]}
+            for e in sorted(library.refresh(kind).values(), key=lambda e: e["name"])
+            if e.get("hash")
+        ]
+    for key in settings["config_keys"]:
+        if key in player.config:
+            manifest["config"][key] = player.config[key]
+    return jsonify(manifest)
+
+
+@app.route("/sync/blocks/<kind>/<name>")
+@sync_token_required
+def sync_blocks(kind, name):
+    path = sync_media_path(kind, name)
+    block_size = request.args.get("block_size", type=int) or sync_settings()["block_size"]
+    block_size = max(64 * 1024, min(block_size, 64 * 1024 * 1024))
+    return jsonify(
+        {
+            "name": name,
+            "size": os.path.getsize(path),
+            "block_size": block_size,
+            "blocks": cached_block_hashes(path, block_size),
+        }
+    )
+
+
+@app.route("/sync/file/<kind>/<name>")
+@sync_token_required
+def sync_file(kind, name):
+    """Dosyayı ``Range`` desteğiyle sun"""
+    return send_file(sync_media_path(kind, name), conditional=True, max_age=0)
+
+
+class RateLimiter:
+    """İş parçacıkları arasında paylaşılan token-bucket bant genişliği sınırı"""
+
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self.lock = Lock()
+        self.allowance = bytes_per_second
+        self.last = time.monotonic()
+
+    def consume(self, amount):
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(self.rate, self.allowance + (now - self.last) * self.rate)
+            self.last = now
+            self.allowance -= amount
+            wait = -self.allowance / self.rate if self.allowance < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class SyncClient:
+    """Bir eşten eksik veya değişmiş medyayı blok düzeyinde çek.
+
+    Eşin her blok özeti yerel dosyanın eski sürümünde (herhangi bir blok
+    hizasında) veya yarım kalmış ``.sync.part`` dosyasında aynı konumda
+    bulunursa ağdan indirilmez; yalnızca eksik bloklar ``Range`` ile alınır.
+    Yarım kalan aktarımlar bir sonraki çalıştırmada kaldığı yerden sürer.
+    """
+
+    RANGE_BLOCKS = 16
+
+    def __init__(
+        self,
+        peer,
+        token,
+        target_dirs=None,
+        media_library=None,
+        max_concurrency=2,
+        bandwidth_limit_kbps=0,
+        delete_extraneous=False,
+        timeout=30,
+        preflight=None,
+        protected=None,
+    ):
+        self.peer = peer.rstrip("/")
+        self.token = token
+        self.target_dirs = target_dirs or {"video": media_dir("video"), "image": media_dir("image")}
+        self.library = media_library
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limiter = RateLimiter(int(bandwidth_limit_kbps) * 1024)
+        self.delete_extraneous = delete_extraneous
+        self.timeout = timeout
+        self.preflight = preflight
+        # Oynatılan, varsayılan veya zamanlanmış medya eşte olmasa da silinmez
+        self.protected = protected
+
+    def _open(self, path, headers=None):
+        req = urllib.request.Request(self.peer + path, headers=dict(headers or {}))
+        req.add_header("Authorization", f"Bearer {self.token}")
+        return urllib.request.urlopen(req, timeout=self.timeout)
+
+    def _get_json(self, path):
+        with self._open(path) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def fetch_manifest(self):
+        return self._get_json("/sync/manifest")
+
+    def _local_hash(self, kind, name, size):
+        path = os.path.join(self.target_dirs[kind], name)
+        try:
+            if os.path.getsize(path) != size:
+                return None
+        except OSError:
+            return None
+        if self.library is not None:
+            self.library.ensure_hashes(kind)
+            entry = self.library.refresh(kind).get(name)
+            if entry and entry.get("hash"):
+                return entry["hash"]
+        return hash_file(path)
+
+    def plan(self, manifest):
+        """Aktarılması gereken (tür, kayıt) çiftlerini döndür"""
+        todo = []
+        for kind, key in (("video", "videos"), ("image", "images")):
+            for remote in manifest.get(key, []):
+                name = remote.get("name", "")
+                if secure_filename(name) != name or not name.lower().endswith(
+                    media_extensions(kind)
+                ):
+                    continue
+                if self._local_hash(kind, name, remote["size"]) != remote["hash"]:
+                    todo.append((kind, remote))
+        return todo
+
+    def sync_file(self, kind, remote, block_size):
+        name = remote["name"]
+        quoted = urllib.parse.quote(name)
+        info = self._get_json(f"/sync/blocks/{kind}/{quoted}?block_size={block_size}")
+        block_size, blocks, size = info["block_size"], info["blocks"], info["size"]
+
+        final_path = os.path.join(self.target_dirs[kind], name)
+        part_path = final_path + SYNC_PART_SUFFIX
+
+        part_hashes = block_hashes(part_path, block_size) if os.path.exists(part_path) else []
+        basis = {}
+        if os.path.exists(final_path):
+            for i, h in enumerate(block_hashes(final_path, block_size)):
+                basis.setdefault(h, i * block_size)
+
+        stats = {"name": name, "fetched_bytes": 0, "reused_bytes": 0, "resumed_bytes": 0}
+        missing = []
+        mode = "r+b" if os.path.exists(part_path) else "w+b"
+        with open(part_path, mode) as part:
+            part.truncate(size)
+            basis_file = open(final_path, "rb") if basis else None
+            try:
+                for i, h in enumerate(blocks):
+                    length = min(block_size, size - i * block_size)
+                    if i < len(part_hashes) and part_hashes[i] == h:
+                        stats["resumed_bytes"] += length
+                    elif h in basis:
+                        basis_file.seek(basis[h])
+                        part.seek(i * block_size)
+                        part.write(basis_file.read(length))
+                        stats["reused_bytes"] += length
+                    else:
+                        missing.append(i)
+            finally:
+                if basis_file:
+                    basis_file.close()
+
+            for first, last in self._coalesce(missing):
+                start = first * block_size
+                end = min(size, (last + 1) * block_size) - 1
+                headers = {"Range": f"bytes={start}-{end}"}
+                with self._open(f"/sync/file/{kind}/{quoted}", headers) as resp:
+                    if resp.status != 206 and start != 0:
+                        raise IOError("Eş Range isteğini desteklemiyor")
+                    part.seek(start)
+                    remaining = end - start + 1
+                    while remaining > 0:
+                        chunk = resp.read(min(HASH_CHUNK_SIZE, remaining))
+                        if not chunk:
+                            raise IOError("Aktarım yarıda kesildi")
+                        self.limiter.consume(len(chunk))
+                        part.write(chunk)
+                        remaining -= len(chunk)
+                        stats["fetched_bytes"] += len(chunk)
+                # Kesinti durumunda yazılan bloklar sonraki denemede korunur
+                part.flush()
+
+        if hash_file(part_path) != remote["hash"]:
+            os.remove(part_path)
+            raise IOError(f"Özet doğrulanamadı: {name}")
+        os.replace(part_path, final_path)
+        if self.library is not None:
+            self.library.invalidate(kind)
+            self.library.record_hash(kind, name, remote["hash"])
+        return stats
+
+    def _coalesce(self, indices):
+        """Ardışık blok numaralarını sınırlı uzunlukta aralıklara birleştir"""
+        ranges = []
+        for i in indices:
+            if ranges and ranges[-1][1] == i - 1 and i - ranges[-1][0] < self.RANGE_BLOCKS:
+                ranges[-1][1] = i
+            else:
+                ranges.append([i, i])
+        return ranges
+
+    def _remove_extraneous(self, manifest):
+        removed = []
+        keep = self.protected() if self.protected is not None else set()
+        for kind, key in (("video", "videos"), ("image", "images")):
+            wanted = {e["name"] for e in manifest.get(key, [])}
+            directory = self.target_dirs[kind]
+            for name in os.listdir(directory):
+                if name.lower().endswith(media_extensions(kind)) and name not in wanted:
+                    if (kind, name) in keep:
+                        logger.info(f"Eşte olmayan dosya kullanımda, silinmedi: {name}")
+                        continue
+                    os.remove(os.path.join(directory, name))
+                    removed.append(name)
+            if self.library is not None:
+                self.library.invalidate(kind)
+        return removed
+
+    def run(self):
+        manifest = self.fetch_manifest()
+        block_size = manifest.get("block_size", SYNC_DEFAULTS["block_size"])
+        todo = self.plan(manifest)
+        result = {
+            "files": [],
+            "errors": {},
+            "fetched_bytes": 0,
+            "reused_bytes": 0,
+            "resumed_bytes": 0,
+            "config": manifest.get("config", {}),
+        }
+        if self.preflight is not None:
+            ok, message = self.preflight(sum(remote["size"] for _, remote in todo))
+            if not ok:
+                result["errors"]["disk"] = message
+                return result
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {
+                executor.submit(self.sync_file, kind, remote, block_size): remote["name"]
+                for kind, remote in todo
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    logger.error(f"Senkronizasyon hatası ({name}): {e}")
+                    result["errors"][name] = str(e)
+                    continue
+                result["files"].append(name)
+                for key in ("fetched_bytes", "reused_bytes", "resumed_bytes"):
+                    result[key] += stats[key]
+        if self.delete_extraneous and not result["errors"]:
+            result["removed"] = self._remove_extraneous(manifest)
+        return result
+
+
+def apply_synced_config(remote_config, keys):
+    """Eşten gelen yapılandırma alt kümesini uygula"""
+    changed = [k for k in keys if k in remote_config and player.config.get(k) != remote_config[k]]
+    if not changed:
+        return []
+    for key in changed:
+        player.config[key] = remote_config[key]
+    player.save_config()
+    if "schedule" in changed:
+        # Ek çıkışlar yapılandırmayı paylaşır; hepsinin kuralları yenilenir
+        for target in output_players():
+            target.reload_schedule()
+    return changed
+
+
+def run_fleet_sync():
+    """Yapılandırılmış eşten içerik ve ayarları çek"""
+    settings = sync_settings()
+    if not settings["peer"]:
+        return {"success": False, "message": "Senkronizasyon eşi yapılandırılmamış"}
+    if not sync_lock.acquire(blocking=False):
+        return {"success": False, "message": "Senkronizasyon zaten çalışıyor"}
+    sync_state["running"] = True
+    started = time.time()
+    try:
+        client = SyncClient(
+            settings["peer"],
+            settings["token"],
+            media_library=library,
+            max_concurrency=settings["max_concurrency"],
+            bandwidth_limit_kbps=settings["bandwidth_limit_kbps"],
+            delete_extraneous=settings["delete_extraneous"],
+            preflight=storage.preflight,
+            protected=storage.protected,
+        )
+        result = client.run()
+        if result["files"]:
+            loudness.scan()
+        result["config_updated"] = apply_synced_config(
+            result.pop("config"), settings["config_keys"]
+        )
+        result["success"] = not result["errors"]
+        logger.info(
+            f"Senkronizasyon tamamlandı: {len(result['files'])} dosya, "
+            f"{result['fetched_bytes']} bayt indirildi, {result['reused_bytes']} bayt yerelden"
+        )
+    except Exception as e:
+        logger.error(f"Senkronizasyon başarısız: {e}")
+        result = {"success": False, "message": str(e)}
+    finally:
+        result["duration"] = round(time.time() - started, 3)
+        sync_state.update(running=False, last_run=datetime.now().isoformat(), last_result=result)
+        sync_lock.release()
+    return result
+
+
+def start_sync_job():
+    settings = sync_settings()
+    if settings["peer"] and settings["interval"]:
+        player.scheduler.add_job(
+            run_fleet_sync,
+            "interval",
+            id="fleet-sync",
+            seconds=int(settings["interval"]),
+            replace_existing=True,
+            max_instances=1,
+        )
+        logger.info(f"Filo senkronizasyonu etkin: {settings['peer']}")
+
+
+@app.route("/sync/run", methods=["POST"])
+@login_required
+def sync_run():
+    return jsonify(run_fleet_sync())
+
+
+@app.route("/sync/status")
+@login_required
+def sync_status():
+    return jsonify(sync_state)
+
+
+REMOTE_DEFAULTS = {
+    "enabled": False,
+    "interval": 900,
+    "lead_minutes": 30,
+    "max_concurrency": 1,
+    "bandwidth_limit_kbps": 0,
+    "timeout": 30,
+    "sources": [],
+}
+REMOTE_PART_SUFFIX = ".remote.part"
+REMOTE_CHUNK_SIZE = 64 * 1024
+REMOTE_STATE_FILE = os.path.join(BASE_DIR, "cache", "remote_state.json")
+
+remote_state = {"running": False, "last_run": None, "last_result": None}
+remote_lock = Lock()
+
+
+def remote_settings():
+    settings = dict(REMOTE_DEFAULTS)
+    settings.update(player.config.get("remote_sources") or {})
+    return settings
+
+
+def shift_schedule(days, hour, minute, lead_minutes):
+    """Haftalık saatten ``lead_minutes`` önceki (günler, saat, dakika)"""
+    week = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+    total = hour * 60 + minute - int(lead_minutes)
+    shift = 0
+    while total < 0:
+        total += 24 * 60
+        shift += 1
+    days = [week[(week.index(d) - shift) % 7] if d in week else d for d in days]
+    return days, total // 60, total % 60
+
+
+def rule_media(rule, config):
+    """Zamanlama kuralının oynatacağı yerel medya dosyaları"""
+    if rule.get("source") == "video":
+        video = rule.get("video") or os.path.basename(str(config.get("default_video", "")))
+        return [("video", video)] if video else []
+    if rule.get("source") == "playlist":
+        playlist = config.get("playlists", {}).get(rule.get("playlist")) or {}
+        return [
+            (item.get("type"), item.get("file"))
+            for item in playlist.get("items", [])
+            if item.get("type") in ("video", "image") and item.get("file")
+        ]
+    return []
+
+
+class RemoteFetcher:
+    """Merkezi bir HTTP kaynağından medyayı ``VIDEO_DIR``/``IMAGE_DIR`` içine çek.
+
+    Kaynaklar tek dosya adresleri (``{"url": ...}``) veya dosya listesi
+    döndüren manifestlerdir (``{"manifest": ...}``). Daha önce indirilen
+    dosyalar ``ETag``/``Last-Modified`` ile koşullu istenir; değişmemişse
+    304 yanıtı gövdesiz döner. Yarım kalan indirmeler ``.remote.part``
+    dosyasında tutulur ve ``Range`` + ``If-Range`` ile kaldığı yerden sürer.
+    Dosya yalnızca tamamlandığında (ve manifestte özet varsa doğrulandıktan
+    sonra) yerine taşınır.
+    """
+
+    def __init__(
+        self,
+        sources,
+        state_file=None,
+        target_dirs=None,
+        media_library=None,
+        max_concurrency=1,
+        bandwidth_limit_kbps=0,
+        timeout=30,
+        preflight=None,
+    ):
+        self.sources = sources
+        self.state_file = state_file
+        self.target_dirs = target_dirs or {"video": media_dir("video"), "image": media_dir("image")}
+        self.library = media_library
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limiter = RateLimiter(int(bandwidth_limit_kbps) * 1024)
+        self.timeout = timeout
+        self.preflight = preflight
+        self.lock = Lock()
+        self.state = self._load_state()
+
+    def _load_state(self):
+        state = {"files": {}, "manifests": {}}
+        if not self.state_file:
+            return state
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key in state:
+                state[key].update(data.get(key, {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Uzak kaynak durumu okunamadı: {e}")
+        return state
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        with self.lock:
+            data = json.dumps(self.state).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            _write_atomic(self.state_file, data)
+        except Exception as e:
+            logger.warning(f"Uzak kaynak durumu kaydedilemedi: {e}")
+
+    def _update_state(self, url, **fields):
+        with self.lock:
+            self.state["files"].setdefault(url, {}).update(fields)
+        self._save_state()
+
+    def _open(self, url, headers=None):
+        """İsteği gönder; 304 yanıtında None döndür"""
+        req = urllib.request.Request(url, headers=dict(headers or {}))
+        try:
+            return urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+
+    @staticmethod
+    def _validators(resp):
+        return {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+
+    @staticmethod
+    def _conditional_headers(cached):
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _fetch_manifest(self, url):
+        with self.lock:
+            cached = dict(self.state["manifests"].get(url) or {})
+        resp = self._open(url, self._conditional_headers(cached) if "entries" in cached else None)
+        if resp is None:
+            return cached["entries"]
+        with resp:
+            data = json.loads(resp.read().decode("utf-8"))
+            validators = self._validators(resp)
+        files = data.get("files", []) if isinstance(data, dict) else data
+        entries = []
+        for item in files:
+            if isinstance(item, str):
+                item = {"url": item}
+            entries.append(dict(item, url=urllib.parse.urljoin(url, item["url"])))
+        with self.lock:
+            self.state["manifests"][url] = dict(validators, entries=entries)
+        return entries
+
+    def resolve(self):
+        """Kaynak listesini (tür, ad, adres, özet) kayıtlarına çevir"""
+        entries, errors = [], {}
+        for source in self.sources:
+            if isinstance(source, str):
+                source = {"url": source}
+            try:
+                if source.get("manifest"):
+                    entries.extend(self._fetch_manifest(source["manifest"]))
+                elif source.get("url"):
+                    entries.append(source)
+            except Exception as e:
+                key = source.get("manifest") or source.get("url")
+                logger.error(f"Uzak kaynak okunamadı ({key}): {e}")
+                errors[key] = str(e)
+
+        resolved = {}
+        for entry in entries:
+            url = entry["url"]
+            name = entry.get("name") or urllib.parse.unquote(
+                os.path.basename(urllib.parse.urlparse(url).path)
+            )
+            kind = next((k for k in ("video", "image") if name.lower().endswith(media_extensions(k))), None)
+            if kind is None or secure_filename(name) != name:
+                errors[url] = "Geçersiz dosya adı"
+                continue
+            resolved[(kind, name)] = {"kind": kind, "name": name, "url": url, "hash": entry.get("hash")}
+        return list(resolved.values()), errors
+
+    def fetch(self, entry):
+        url, name = entry["url"], entry["name"]
+        final_path = os.path.join(self.target_dirs[entry["kind"]], name)
+        part_path = final_path + REMOTE_PART_SUFFIX
+        with self.lock:
+            cached = dict(self.state["files"].get(url) or {})
+
+        headers, offset = {}, 0
+        partial = cached.get("partial") or {}
+        validator = partial.get("etag") or partial.get("last_modified")
+        if os.path.exists(part_path) and validator:
+            offset = os.path.getsize(part_path)
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+        elif os.path.exists(final_path) and cached.get("name") == name:
+            headers = self._conditional_headers(cached)
+
+        stats = {"name": name, "status": "unchanged", "fetched_bytes": 0, "resumed_bytes": 0}
+        resp = self._open(url, headers)
+        if resp is None:
+            return stats
+        with resp:
+            validators = self._validators(resp)
+            if resp.status == 206:
+                content_range = resp.headers.get("Content-Range", "")
+                match = re.match(r"bytes (\d+)-\d+/(\d+)", content_range)
+                if not match or int(match.group(1)) != offset:
+                    raise IOError(f"Beklenmeyen Content-Range: {content_range}")
+                total = int(match.group(2))
+                stats["resumed_bytes"] = offset
+            else:
+                # Kaynak değişmiş veya Range desteklenmiyor: baştan indir
+                offset = 0
+                length = resp.headers.get("Content-Length")
+                total = int(length) if length else None
+            if self.preflight is not None and total is not None:
+                ok, message = self.preflight(total - offset)
+                if not ok:
+                    raise IOError(message)
+            # Kesinti olursa sonraki deneme bu doğrulayıcılarla devam eder
+            self._update_state(url, partial=validators)
+            with open(part_path, "ab" if offset else "wb") as part:
+                while True:
+                    chunk = resp.read(REMOTE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.limiter.consume(len(chunk))
+                    part.write(chunk)
+                    stats["fetched_bytes"] += len(chunk)
+
+        size = os.path.getsize(part_path)
+        if total is not None and size != total:
+            raise IOError("Aktarım yarıda kesildi")
+        digest = None
+        if entry.get("hash"):
+            digest = hash_file(part_path)
+            if digest != entry["hash"]:
+                os.remove(part_path)
+                self._update_state(url, partial=None)
+                raise IOError(f"Özet doğrulanamadı: {name}")
+        os.replace(part_path, final_path)
+        if self.library is not None:
+            self.library.invalidate(entry["kind"])
+            if digest:
+                self.library.record_hash(entry["kind"], name, digest)
+        self._update_state(url, name=name, size=size, fetched=time.time(), partial=None, **validators)
+        stats["status"] = "resumed" if stats["resumed_bytes"] else "updated"
+        return stats
+
+    def run(self, only=None, priority=()):
+        """Kaynakları indir; ``only`` verilirse yalnızca bu (tür, ad) çiftlerini.
+
+        ``priority`` içindeki dosyalar (yakında oynatılacaklar) önce indirilir.
+        """
+        entries, errors = self.resolve()
+        if only is not None:
+            wanted = set(only)
+            entries = [e for e in entries if (e["kind"], e["name"]) in wanted]
+        first = set(priority)
+        entries.sort(key=lambda e: (e["kind"], e["name"]) not in first)
+        result = {"files": [], "unchanged": [], "errors": errors, "fetched_bytes": 0, "resumed_bytes": 0}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {executor.submit(self.fetch, entry): entry["name"] for entry in entries}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    logger.error(f"Uzak dosya indirilemedi ({name}): {e}")
+                    result["errors"][name] = str(e)
+                    continue
+                if stats["status"] == "unchanged":
+                    result["unchanged"].append(name)
+                else:
+                    result["files"].append(name)
+                result["fetched_bytes"] += stats["fetched_bytes"]
+                result["resumed_bytes"] += stats["resumed_bytes"]
+        self._save_state()
+        return result
+
+
+def run_remote_fetch(only=None):
+    """Uzak kaynaklardan içerik çek (``only``: yalnızca bu (tür, ad) çiftleri)"""
+    settings = remote_settings()
+    if not settings["sources"]:
+        return {"success": False, "message": "Uzak kaynak yapılandırılmamış"}
+    # Zamanlanmış ön yükleme, süren bir taramanın bitmesini bekler
+    if not remote_lock.acquire(blocking=only is not None):
+        return {"success": False, "message": "Uzak içerik indirme zaten çalışıyor"}
+    remote_state["running"] = True
+    started = time.time()
+    try:
+        priority = [
+            media
+            for target in output_players()
+            for rule in target.schedule_rules()
+            for media in rule_media(rule, player.config)
+        ]
+        fetcher = RemoteFetcher(
+            settings["sources"],
+            REMOTE_STATE_FILE,
+            media_library=library,
+            max_concurrency=settings["max_concurrency"],
+            bandwidth_limit_kbps=settings["bandwidth_limit_kbps"],
+            timeout=settings["timeout"],
+            preflight=storage.preflight,
+        )
+        result = fetcher.run(only=only, priority=priority)
+        if result["files"]:
+            loudness.scan()
+        result["success"] = not result["errors"]
+        logger.info(
+            f"Uzak içerik indirildi: {len(result['files'])} dosya güncellendi, "
+            f"{len(result['unchanged'])} değişmemiş, {result['fetched_bytes']} bayt"
+        )
+    except Exception as e:
+        logger.error(f"Uzak içerik indirme başarısız: {e}")
+        result = {"success": False, "message": str(e)}
+    finally:
+        result["duration"] = round(time.time() - started, 3)
+        remote_state.update(running=False, last_run=datetime.now().isoformat(), last_result=result)
+        remote_lock.release()
+    return result
+
+
+def prefetch_rule(rule):
+    """Zamanlama kuralının medyasını yuvası başlamadan önce indir"""
+    media = rule_media(rule, player.config)
+    if media:
+        logger.info(f"Zamanlanmış içerik önceden indiriliyor: {', '.join(n for _, n in media)}")
+        run_remote_fetch(only=media)
+
+
+def start_remote_job():
+    settings = remote_settings()
+    if settings["enabled"] and settings["sources"] and settings["interval"]:
+        player.scheduler.add_job(
+            run_remote_fetch,
+            "interval",
+            id="remote-fetch",
+            seconds=int(settings["interval"]),
+            next_run_time=datetime.now(),
+            replace_existing=True,
+            max_instances=1,
+        )
+        logger.info(f"Uzak içerik kaynağı etkin: {len(settings['sources'])} kaynak")
+
+
+@app.route("/remote/run", methods=["POST"])
+@login_required
+def remote_run():
+    return jsonify(run_remote_fetch())
+
+
+@app.route("/remote/status")
+@login_required
+def remote_status():
+    return jsonify(remote_state)
+
+
+def start_video_wall():
+    """Yapılandırmada etkinse video duvarı senkronizasyonunu başlat"""
+    global video_wall
+    settings = player.config.get("video_wall") or {}
+    if not settings.get("enabled"):
+        return None
+    video_wall = VideoWallSync(
+        player.ipc, settings, active=lambda: player.current_source == "video"
+    )
+    try:
+        video_wall.start()
+    except OSError as e:
+        logger.error(f"Video duvarı senkronizasyonu başlatılamadı: {e}")
+        video_wall = None
+    return video_wall
+
+
+@app.route("/camera_health")
+@login_required
+def camera_health():
+    """Kamera donma/kurtarma geçmişi"""
+    output = selected_output()
+    if output is None:
+        return unknown_output()
+    return jsonify(output["watchdog"].report())
+
+
+@app.route("/video_wall/status")
+@login_required
+def video_wall_status():
+    if video_wall is None:
+        return jsonify({"enabled": False})
+    return jsonify(dict(video_wall.status(), enabled=True))
+
+
+def start_output(output):
+    """Ek çıkışı kayıtlı durumundan ya da kendi varsayılan videosuyla başlat"""
+    target, state = output["player"], output["state"]
+    try:
+        if not (state.settings["enabled"] and state.resume()):
+            default = target.output.get("default_video")
+            success, message = target.play_video([os.path.basename(default)] if default else None)
+            if not success:
+                logger.error(f"{target.name} çıkışında başlangıç videosu oynatılamadı: {message}")
+    except Exception as e:
+        logger.error(f"{target.name} çıkışı başlatılamadı: {e}")
+    if state.settings["enabled"]:
+        state.start()
+    try:
+        target.start_scheduler()
+    except Exception as e:
+        logger.error(f"{target.name} çıkışının zamanlayıcısı başlatılamadı: {e}")
+
+
 def startup_sequence():
-    """Başlangıç dizisi - fallback mantığı"""
-    delay = player.config.get("startup_delay", 5)
-    logger.info(f"{delay} saniye bekleniyor...")
-    time.sleep(delay)
+    """Başlangıç dizisi - hazırlık kontrolleriyle hızlı açılış.
+
+    Sabit bekleme yerine görüntü sunucusu ve medya dizini hazır olana kadar
+    beklenir; ``startup_delay`` yalnızca üst sınırdır. Medya gecikirse bu
+    sürede açılış görseli gösterilir. Zamanlayıcı ve arka plan işleri ilk
+    içerik başlatıldıktan sonra devreye girer.
+    """
+    timeout = float(player.config.get("startup_delay", 5))
+
+    if not wait_until(display_ready, timeout):
+        logger.warning("Görüntü sunucusu hazır değil, yine de devam ediliyor")
+    startup_timer.mark("display_ready")
+
+    if not media_ready(player.config):
+        player.show_splash()
+        startup_timer.mark("splash")
+        if not wait_until(lambda: media_ready(player.config), timeout):
+            logger.warning("Medya dizini hazır değil, yine de devam ediliyor")
+    startup_timer.mark("media_ready")
 
     try:
-        # Varsayılan videoyu oynat
-        success, message = player.play_video()
+        # Kayıtlı durum geçerliyse kaldığı yerden, değilse varsayılan videoyla başla
+        if playback_state.settings["enabled"] and playback_state.resume():
+            success, message = True, "Oynatma sürdürüldü"
+        else:
+            success, message = player.play_video()
         if not success:
             logger.error(f"Başlangıç videosu oynatılamadı: {message}")
+        elif wait_until(
+            lambda: player.ipc.get_property("estimated-frame-number") is not None, 5, 0.05
+        ):
+            startup_timer.mark("first_frame")
     except Exception as e:
         logger.error(f"Başlangıç dizisi hatası: {e}")
+    startup_timer.mark("content_started")
+    if playback_state.settings["enabled"]:
+        playback_state.start()
+    # Ek çıkışlar birbirini beklemeden paralel başlatılır
+    for output in extra_outputs.values():
+        threading.Thread(target=start_output, args=(output,), daemon=True).start()
+
+    try:
+        player.start_scheduler()
+    except Exception as e:
+        logger.error(f"Zamanlayıcı başlatılamadı: {e}")
+    startup_timer.mark("scheduler")
+
+    report = startup_timer.report()
+    logger.info(
+        "Açılış süreleri: "
+        + ", ".join(f"{p['phase']}={p['seconds']:.2f}s" for p in report["phases"])
+    )
+
+    # Yükleme kontrollerinin hızlı yanıt vermesi için eksik özetleri önceden hesapla
+    for kind in ("video", "image"):
+        try:
+            library.ensure_hashes(kind)
+        except Exception as e:
+            logger.warning(f"Medya özetleri hesaplanamadı ({kind}): {e}")
+    # Özetler hazır olduğundan aynı içerikli kopyalar yeniden ölçülmez
+    loudness.scan()
+
+
+@app.route("/startup_report")
+@login_required
+def startup_report():
+    """Açılış aşamalarının zaman dökümü"""
+    return jsonify(startup_timer.report())
+
+
+@app.route("/request_timings")
+@login_required
+def request_timings():
+    """Yavaş istek kaydı"""
+    return jsonify(
+        {
+            "success": True,
+            "settings": request_timing.settings,
+            "slow_requests": list(request_timing.slow),
+        }
+    )
+
+
+@app.route("/profile", methods=["POST"])
+@login_required
+def profile():
+    """Çalışan süreci ``seconds`` saniye örnekle ve toplanmış yığınları döndür"""
+    data = request.get_json(silent=True) or {}
+    try:
+        top = int(data.get("top", 50))
+        stacks, ticks = profiler.sample(data.get("seconds", 5), data.get("interval", 0.01))
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "message": f"Geçersiz profil ayarı: {e}"})
+    except RuntimeError as e:
+        return jsonify({"success": False, "message": str(e)})
+    if data.get("format") == "collapsed":
+        return Response(profiler.collapsed(stacks), mimetype="text/plain")
+    report = profiler.report(stacks, ticks, top)
+    return jsonify({"success": True, **report})
 
 
 def signal_handler(sig, frame):
     """Graceful shutdown"""
     logger.info("Kapatma sinyali alındı")
     try:
-        player.stop_current()
-        player.scheduler.shutdown()
+        if playback_state.settings["enabled"]:
+            playback_state.save(force=True)
+        for output in extra_outputs.values():
+            if output["state"].settings["enabled"]:
+                output["state"].save(force=True)
+        for target in output_players():
+            target.stop_current()
+        camera_recorder.stop()
+        telemetry.save()
+        proof_of_play.flush()
+        for target in output_players():
+            if target._scheduler is not None and target._scheduler.running:
+                target._scheduler.shutdown()
     except Exception as e:
         logger.error(f"Kapatma sırasında hata: {e}")
     os._exit(0)
@@ -1077,10 +6725,28 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
+    start_sync_job()
+    start_remote_job()
+    start_video_wall()
+    if camera_watchdog.settings["enabled"]:
+        camera_watchdog.start()
+    announcements.start()
+    for output in extra_outputs.values():
+        if output["watchdog"].settings["enabled"]:
+            output["watchdog"].start()
+        output["announcements"].start()
+    if camera_recorder.settings["enabled"]:
+        camera_recorder.start()
+    if telemetry.settings["enabled"]:
+        telemetry.start()
+    if proof_of_play.settings["enabled"]:
+        proof_of_play.start()
+
     # Başlangıç dizisini ayrı bir thread'de çalıştır
     startup_thread = threading.Thread(target=startup_sequence)
     startup_thread.daemon = True
     startup_thread.start()
 
+    startup_timer.mark("web_server_starting")
     logger.info("Web sunucusu başlatılıyor...")
     app.run(host="0.0.0.0", port=player.config.get("web_port", 5000), debug=False)
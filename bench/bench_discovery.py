@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Pi-Ekran: ONVIF keşif ölçümü
+bench/onvif_sim.py simülatörünü ayrı bir süreçte başlatır ve
+discover_onvif_cameras fonksiyonunu ona karşı çalıştırır.
+
+Ölçülenler: saniyede taranan adres:port sayısı, ilk sonuca kadar geçen süre,
+toplam süre, CPU süresi, en yüksek iş parçacığı sayısı ve bulunan RTSP
+adreslerinin OPTIONS ile doğrulanma hızı.
+
+Kullanım:
+    python bench/bench_discovery.py --devices 200 --empty 300 --auth 0.2 --slow 0.1 --hang 0.05
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from onvif_sim import FAULT_KINDS, device_ip  # noqa: E402
+from run_bench import git_revision, summarize  # noqa: E402
+
+
+def start_simulator(args):
+    cmd = [
+        sys.executable,
+        os.path.join(BENCH_DIR, "onvif_sim.py"),
+        "--devices", str(args.devices),
+        "--port", "0",
+        "--rtsp-port", "0",
+        "--latency-ms", str(args.latency_ms),
+        "--slow-ms", str(args.slow_ms),
+        "--hang-s", str(args.timeout * 4),
+        "--seed", str(args.seed),
+    ]
+    for kind in FAULT_KINDS:
+        cmd += [f"--{kind}", str(getattr(args, kind))]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError("Simülatör başlatılamadı")
+    return process, json.loads(line)
+
+
+class ThreadSampler:
+    """Ölçüm boyunca iş parçacığı sayısının tepe değerini izle"""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ONVIF keşif ölçümü")
+    parser.add_argument("--devices", type=int, default=100, help="simüle edilen kamera sayısı")
+    parser.add_argument("--empty", type=int, default=100, help="yanıt vermeyen ek adres sayısı")
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--slow-ms", type=float, default=1500)
+    parser.add_argument("--timeout", type=float, default=2.0, help="SOAP isteği zaman aşımı")
+    parser.add_argument("--workers", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON sonuç dosyası (varsayılan: stdout)")
+    for kind in FAULT_KINDS:
+        parser.add_argument(f"--{kind}", type=float, default=0.0, help=f"'{kind}' cihaz oranı")
+    args = parser.parse_args(argv)
+
+    import logging
+
+    import app
+
+    app.logger.setLevel(logging.ERROR)
+    process, info = start_simulator(args)
+    try:
+        port = info["port"]
+        hosts = [device_ip(i) for i in range(args.devices + args.empty)]
+        events = {"scan": 0, "found": 0, "first_found": None}
+        started = time.perf_counter()
+
+        def progress(item):
+            events[item["event"]] = events.get(item["event"], 0) + 1
+            if item["event"] == "found" and events["first_found"] is None:
+                events["first_found"] = time.perf_counter() - started
+
+        cpu_before = time.process_time()
+        with ThreadSampler() as sampler:
+            cameras = app.discover_onvif_cameras(
+                progress_callback=progress,
+                hosts=hosts,
+                ports=[port],
+                timeout=args.timeout,
+                max_workers=args.workers,
+            )
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_before
+
+        urls = [c["rtsp_url"] for c in cameras if c["rtsp_url"]]
+        probe_times = []
+
+        def probe(url):
+            t = time.perf_counter()
+            ok = app.probe_rtsp(url, timeout=args.timeout)
+            probe_times.append(time.perf_counter() - t)
+            return ok
+
+        probe_started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(32, max(1, len(urls)))) as executor:
+            probe_ok = sum(executor.map(probe, urls))
+        probe_elapsed = time.perf_counter() - probe_started
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
+
+    targets = len(hosts)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {k: v for k, v in vars(args).items() if k != "output"},
+        "simulator": info,
+        "results": {
+            "targets": targets,
+            "scanned": events["scan"],
+            "found": len(cameras),
+            "with_rtsp_url": len(urls),
+            "elapsed_s": round(elapsed, 3),
+            "hosts_per_second": round(targets / elapsed, 1) if elapsed else None,
+            "time_to_first_result_s": (
+                round(events["first_found"], 3) if events["first_found"] is not None else None
+            ),
+            "cpu_s": round(cpu, 3),
+            "cpu_per_camera_ms": round(cpu / len(cameras) * 1000, 1) if cameras else None,
+            "peak_threads": sampler.peak,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "rtsp_probe": {
+                "ok": probe_ok,
+                "failed": len(urls) - probe_ok,
+                "per_second": round(len(urls) / probe_elapsed, 1) if probe_elapsed else None,
+                "latency": summarize(probe_times),
+            },
+        },
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Pi-Ekran: Sahte mpv
+Gerçek mpv yerine kullanılan, JSON IPC soketini uygulayan betik.
+
+Gerçek ekran veya kod çözücü gerektirmez; oynatma süresi duvar saatine göre
+ilerler. Zamanlamalar ortam değişkenleriyle ayarlanır:
+
+    FAKE_MPV_STARTUP_MS      IPC soketi açılmadan önceki gecikme (varsayılan 50)
+    FAKE_MPV_FIRST_FRAME_MS  soketten ilk kareye kadar geçen süre (varsayılan 30)
+    FAKE_MPV_EXIT_MS         SIGTERM sonrası kapanma gecikmesi (varsayılan 20)
+    FAKE_MPV_EXIT_CODE       ayarlanırsa süreç hemen bu kodla çıkar
+    FAKE_MPV_DURATION        her video öğesinin süresi, saniye (varsayılan 30)
+    FAKE_MPV_FPS             kare hızı (varsayılan 25)
+    FAKE_MPV_STALL_AFTER     bu kadar saniye sonra akış donar (kamera testi)
+    FAKE_MPV_DROP_RATE       saniyede düşen kare sayısı (varsayılan 0)
+"""
+
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class FakeMpv:
+    def __init__(self, argv):
+        self.options = {}
+        self.playlist = []
+        for arg in argv:
+            if arg.startswith("--"):
+                key, _, value = arg[2:].partition("=")
+                self.options[key] = value
+            else:
+                self.playlist.append(arg)
+        if self.options.get("playlist"):
+            with open(self.options["playlist"], encoding="utf-8") as f:
+                self.playlist += [
+                    line.strip() for line in f if line.strip() and not line.startswith("#")
+                ]
+
+        self.lock = threading.RLock()
+        self.clients = []
+        self.observers = {}
+        self.last_sent = {}
+        self.started = time.monotonic()
+        self.first_frame_at = None
+        self.fps = env_float("FAKE_MPV_FPS", 25)
+        self.item_duration = env_float("FAKE_MPV_DURATION", 30)
+        self.stall_after = env_float("FAKE_MPV_STALL_AFTER", 0)
+        self.drop_rate = env_float("FAKE_MPV_DROP_RATE", 0)
+        self.loop = self.options.get("loop-playlist") in ("inf", "yes", "force")
+        self.props = {
+            "speed": 1.0,
+            "pause": False,
+            "volume": 100.0,
+            "af": [],
+            "image-display-duration": self.options.get("image-display-duration", "1"),
+        }
+        self.pos = 0
+        self.base_time = 0.0
+        self.base_clock = time.monotonic()
+        self.running = True
+
+    # -- zaman modeli -----------------------------------------------------
+    def time_pos(self):
+        if self.first_frame_at is None:
+            return None
+        now = time.monotonic()
+        if self.stalled():
+            now = self.first_frame_at + self.stall_after
+        elapsed = 0.0 if self.props["pause"] else max(0.0, now - self.base_clock)
+        return self.base_time + elapsed * self.props["speed"]
+
+    def stalled(self):
+        return bool(
+            self.stall_after
+            and self.first_frame_at is not None
+            and time.monotonic() - self.first_frame_at > self.stall_after
+        )
+
+    def set_time(self, value):
+        self.base_time = max(0.0, value)
+        self.base_clock = time.monotonic()
+
+    def current_path(self):
+        if not self.playlist:
+            return None
+        return self.playlist[self.pos]
+
+    def item_length(self):
+        path = self.current_path() or ""
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            duration = self.props["image-display-duration"]
+            return None if duration == "inf" else float(duration or 1)
+        if "://" in path:
+            return None
+        return self.item_duration
+
+    def get_property(self, name):
+        t = self.time_pos()
+        path = self.current_path()
+        values = {
+            "pid": os.getpid(),
+            "path": path,
+            "filename": os.path.basename(path) if path else None,
+            "playlist": [
+                {"filename": p, "current": i == self.pos, "id": i + 1}
+                for i, p in enumerate(self.playlist)
+            ],
+            "playlist-pos": self.pos if self.playlist else -1,
+            "playlist-count": len(self.playlist),
+            "time-pos": t,
+            "duration": self.item_length(),
+            "estimated-frame-number": int(t * self.fps) if t is not None else None,
+            "paused-for-cache": self.stalled(),
+            "demuxer-cache-duration": (0.0 if self.stalled() else 5.0) if t is not None else None,
+            "frame-drop-count": int((t or 0) * self.drop_rate),
+            "decoder-frame-drop-count": 0,
+            "estimated-vf-fps": self.fps if t is not None else None,
+            "hwdec-current": "no",
+            "video-params": {"w": 1920, "h": 1080, "pixelformat": "yuv420p"},
+            "idle-active": not self.playlist,
+        }
+        if name in values:
+            return True, values[name]
+        if name in self.props:
+            return True, self.props[name]
+        return False, None
+
+    # -- olaylar ----------------------------------------------------------
+    def broadcast(self, message):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        for conn in list(self.clients):
+            try:
+                conn.sendall(data)
+            except OSError:
+                pass
+
+    def start_item(self):
+        self.set_time(0.0)
+        self.broadcast({"event": "start-file", "playlist_entry_id": self.pos + 1})
+        self.broadcast({"event": "file-loaded"})
+        self.broadcast({"event": "playback-restart"})
+
+    def next_item(self, reason="eof"):
+        with self.lock:
+            self.broadcast({"event": "end-file", "reason": reason, "playlist_entry_id": self.pos + 1})
+            if self.pos + 1 < len(self.playlist):
+                self.pos += 1
+            elif self.loop:
+                self.pos = 0
+            else:
+                self.running = False
+                return
+            self.start_item()
+
+    def tick(self):
+        """Süre dolan öğeleri ilerlet ve gözlenen özellik değişikliklerini yayınla"""
+        while self.running:
+            time.sleep(0.02)
+            with self.lock:
+                length = self.item_length()
+                t = self.time_pos()
+                if length is not None and t is not None and t >= length:
+                    self.next_item()
+                for observe_id, name in list(self.observers.items()):
+                    ok, value = self.get_property(name)
+                    if name in ("time-pos", "estimated-frame-number"):
+                        continue
+                    if ok and self.last_sent.get(observe_id, object()) != value:
+                        self.last_sent[observe_id] = value
+                        self.broadcast(
+                            {"event": "property-change", "id": observe_id, "name": name, "data": value}
+                        )
+
+    # -- komutlar ---------------------------------------------------------
+    def handle(self, command):
+        name, args = command[0], command[1:]
+        if name == "get_property":
+            ok, value = self.get_property(args[0])
+            return ("success", value) if ok else ("property unavailable", None)
+        if name == "set_property":
+            prop, value = args[0], args[1]
+            if prop == "playlist-pos":
+                self.pos = int(value)
+                self.start_item()
+            elif prop == "time-pos":
+                self.set_time(float(value))
+            else:
+                if prop in ("speed", "pause"):
+                    self.set_time(self.time_pos() or 0.0)
+                self.props[prop] = value
+            return "success", None
+        if name == "observe_property":
+            self.observers[args[0]] = args[1]
+            self.last_sent.pop(args[0], None)
+            return "success", None
+        if name == "unobserve_property":
+            self.observers.pop(args[0], None)
+            return "success", None
+        if name == "seek":
+            target = float(args[0])
+            mode = args[1] if len(args) > 1 else "relative"
+            if mode.startswith("absolute"):
+                self.set_time(target)
+            else:
+                self.set_time((self.time_pos() or 0.0) + target)
+            self.broadcast({"event": "seek"})
+            self.broadcast({"event": "playback-restart"})
+            return "success", None
+        if name == "playlist-next":
+            self.next_item(reason="stop")
+            return "success", None
+        if name == "playlist-prev":
+            self.pos = max(0, self.pos - 1)
+            self.start_item()
+            return "success", None
+        if name in ("loadfile", "loadlist"):
+            target = args[0]
+            items = [target]
+            if name == "loadlist":
+                with open(target, encoding="utf-8") as f:
+                    items = [l.strip() for l in f if l.strip() and not l.startswith("#")]
+            flag = args[1] if len(args) > 1 else "replace"
+            if flag == "replace" or not self.playlist:
+                self.playlist = items
+                self.pos = 0
+                self.start_item()
+            else:
+                self.playlist += items
+            return "success", None
+        if name in (
+            "show-text",
+            "overlay-add",
+            "overlay-remove",
+            "client_name",
+            "af",
+            "vf",
+            "script-message",
+            "stop",
+        ):
+            return "success", None
+        if name == "quit":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return "success", None
+        return "invalid parameter", None
+
+    def serve_client(self, conn):
+        self.clients.append(conn)
+        buffer = b""
+        try:
+            while self.running:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    if not line.strip():
+                        continue
+                    try:
+                        msg = json.loads(line)
+                    except ValueError:
+                        continue
+                    with self.lock:
+                        try:
+                            error, data = self.handle(msg.get("command", [""]))
+                        except Exception as e:
+                            error, data = f"error: {e}", None
+                    reply = {"error": error, "request_id": msg.get("request_id", 0)}
+                    if data is not None:
+                        reply["data"] = data
+                    conn.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+        finally:
+            if conn in self.clients:
+                self.clients.remove(conn)
+            conn.close()
+
+    def shutdown(self, *_):
+        time.sleep(env_float("FAKE_MPV_EXIT_MS", 20) / 1000)
+        self.running = False
+        self.broadcast({"event": "shutdown"})
+        path = self.options.get("input-ipc-server")
+        if path and os.path.exists(path):
+            os.unlink(path)
+        os._exit(0)
+
+    def run(self):
+        if "FAKE_MPV_EXIT_CODE" in os.environ:
+            sys.exit(int(os.environ["FAKE_MPV_EXIT_CODE"]))
+        signal.signal(signal.SIGTERM, self.shutdown)
+        signal.signal(signal.SIGINT, self.shutdown)
+        time.sleep(env_float("FAKE_MPV_STARTUP_MS", 50) / 1000)
+
+        server = None
+        path = self.options.get("input-ipc-server")
+        if path:
+            if os.path.exists(path):
+                os.unlink(path)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.listen(16)
+            threading.Thread(target=self.accept, args=(server,), daemon=True).start()
+
+        time.sleep(env_float("FAKE_MPV_FIRST_FRAME_MS", 30) / 1000)
+        with self.lock:
+            self.first_frame_at = time.monotonic()
+            if self.playlist:
+                self.start_item()
+        self.tick()
+        if server is not None:
+            server.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def accept(self, server):
+        while self.running:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.serve_client, args=(conn,), daemon=True).start()
+
+
+def main():
+    FakeMpv(sys.argv[1:]).run()
+
+
+if __name__ == "__main__":
+    main()
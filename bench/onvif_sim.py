@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Pi-Ekran: ONVIF/RTSP cihaz simülatörü
+Çok sayıda kamerayı loopback adresleri üzerinde taklit eder.
+
+Her cihaz 127.0.1.1'den başlayan ayrı bir loopback adresidir. Tek bir HTTP
+sunucusu (ONVIF devicemgmt/media SOAP) ve tek bir RTSP sunucusu (OPTIONS)
+bağlantının geldiği yerel adrese bakarak hangi cihazın yanıt vereceğini seçer.
+
+Hata türleri cihaz sırasına göre, oranlarla dağıtılır:
+    auth    GetStreamUri "NotAuthorized" SOAP hatası döndürür
+    slow    her yanıt --slow-ms kadar gecikir
+    hang    bağlantıyı kabul eder ama hiç yanıt vermez
+    error   HTTP 500 ve geçersiz gövde döndürür
+
+Kullanım:
+    python bench/onvif_sim.py --devices 200 --port 18080 --auth 0.2 --slow 0.1
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIRST_DEVICE = (127, 0, 1, 1)
+FAULT_KINDS = ("auth", "slow", "hang", "error")
+
+ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"'
+    ' xmlns:tds="http://www.onvif.org/ver10/device/wsdl"'
+    ' xmlns:trt="http://www.onvif.org/ver10/media/wsdl"'
+    ' xmlns:tt="http://www.onvif.org/ver10/schema"'
+    ' xmlns:ter="http://www.onvif.org/ver10/error">'
+    "<s:Body>{body}</s:Body></s:Envelope>"
+)
+
+FAULT = (
+    "<s:Fault><s:Code><s:Value>s:Sender</s:Value>"
+    "<s:Subcode><s:Value>{code}</s:Value></s:Subcode></s:Code>"
+    '<s:Reason><s:Text xml:lang="en">{reason}</s:Text></s:Reason></s:Fault>'
+)
+
+ACTION_RE = re.compile(rb"<(?:[\w.-]+:)?Body[^>]*>\s*<(?:[\w.-]+:)?(\w+)")
+
+
+def device_ip(index):
+    """index. cihazın loopback adresi (0 tabanlı)"""
+    a, b, c, d = FIRST_DEVICE
+    value = (b << 16) + (c << 8) + d + index
+    return f"{a}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+
+def assign_faults(count, rates, seed=0):
+    """Cihaz adreslerine hata türü ata; tekrar üretilebilir olsun diye tohumlu"""
+    rng = random.Random(seed)
+    indices = list(range(count))
+    rng.shuffle(indices)
+    faults, offset = {}, 0
+    for kind in FAULT_KINDS:
+        n = int(round(count * rates.get(kind, 0)))
+        for index in indices[offset : offset + n]:
+            faults[device_ip(index)] = kind
+        offset += n
+    return faults
+
+
+class OnvifSimulator:
+    """ONVIF HTTP ve RTSP sunucularını aynı süreçte çalıştır"""
+
+    def __init__(
+        self,
+        devices=50,
+        port=18080,
+        rtsp_port=18554,
+        latency_ms=0,
+        slow_ms=2000,
+        hang_s=60,
+        rates=None,
+        seed=0,
+    ):
+        self.devices = {device_ip(i): i for i in range(devices)}
+        self.port = port
+        self.rtsp_port = rtsp_port
+        self.latency = latency_ms / 1000.0
+        self.slow = slow_ms / 1000.0
+        self.hang = hang_s
+        self.faults = assign_faults(devices, rates or {}, seed)
+        self.stats = {"requests": 0, "rtsp": 0, "faults": 0}
+        self.lock = threading.Lock()
+        self.servers = []
+
+    def hosts(self):
+        return list(self.devices)
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def delay(self, ip):
+        """Cihazın hata türüne göre yanıtı beklet; False dönerse yanıt verilmez"""
+        kind = self.faults.get(ip)
+        if kind == "hang":
+            time.sleep(self.hang)
+            return False
+        wait = self.latency + (self.slow if kind == "slow" else 0)
+        if wait:
+            time.sleep(wait)
+        return True
+
+    # -- SOAP yanıtları ---------------------------------------------------
+    def soap(self, ip, action):
+        index = self.devices[ip]
+        base = f"http://{ip}:{self.port}/onvif"
+        if action == "GetCapabilities":
+            return (
+                "<tds:GetCapabilitiesResponse><tds:Capabilities>"
+                f"<tt:Device><tt:XAddr>{base}/device_service</tt:XAddr></tt:Device>"
+                f"<tt:Media><tt:XAddr>{base}/media_service</tt:XAddr>"
+                "<tt:StreamingCapabilities><tt:RTPMulticast>false</tt:RTPMulticast>"
+                "<tt:RTP_TCP>true</tt:RTP_TCP><tt:RTP_RTSP_TCP>true</tt:RTP_RTSP_TCP>"
+                "</tt:StreamingCapabilities></tt:Media>"
+                "</tds:Capabilities></tds:GetCapabilitiesResponse>"
+            )
+        if action == "GetHostname":
+            return (
+                "<tds:GetHostnameResponse><tds:HostnameInformation>"
+                f"<tt:FromDHCP>false</tt:FromDHCP><tt:Name>simcam-{index:04d}</tt:Name>"
+                "</tds:HostnameInformation></tds:GetHostnameResponse>"
+            )
+        if action == "GetSystemDateAndTime":
+            now = time.gmtime()
+            return (
+                "<tds:GetSystemDateAndTimeResponse><tds:SystemDateAndTime>"
+                "<tt:DateTimeType>NTP</tt:DateTimeType><tt:DaylightSavings>false</tt:DaylightSavings>"
+                f"<tt:UTCDateTime><tt:Time><tt:Hour>{now.tm_hour}</tt:Hour>"
+                f"<tt:Minute>{now.tm_min}</tt:Minute><tt:Second>{now.tm_sec}</tt:Second></tt:Time>"
+                f"<tt:Date><tt:Year>{now.tm_year}</tt:Year><tt:Month>{now.tm_mon}</tt:Month>"
+                f"<tt:Day>{now.tm_mday}</tt:Day></tt:Date></tt:UTCDateTime>"
+                "</tds:SystemDateAndTime></tds:GetSystemDateAndTimeResponse>"
+            )
+        if action == "GetProfiles":
+            return (
+                "<trt:GetProfilesResponse>"
+                '<trt:Profiles token="profile_1" fixed="true"><tt:Name>main</tt:Name></trt:Profiles>'
+                '<trt:Profiles token="profile_2" fixed="true"><tt:Name>sub</tt:Name></trt:Profiles>'
+                "</trt:GetProfilesResponse>"
+            )
+        if action == "GetStreamUri":
+            if self.faults.get(ip) == "auth":
+                return None
+            return (
+                "<trt:GetStreamUriResponse><trt:MediaUri>"
+                f"<tt:Uri>rtsp://{ip}:{self.rtsp_port}/stream1</tt:Uri>"
+                "<tt:InvalidAfterConnect>false</tt:InvalidAfterConnect>"
+                "<tt:InvalidAfterReboot>false</tt:InvalidAfterReboot>"
+                "<tt:Timeout>PT0S</tt:Timeout>"
+                "</trt:MediaUri></trt:GetStreamUriResponse>"
+            )
+        return ""
+
+    def http_handler(self):
+        sim = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                ip = self.connection.getsockname()[0]
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                sim.count("requests")
+                if ip not in sim.devices or not sim.delay(ip):
+                    self.close_connection = True
+                    return
+                if sim.faults.get(ip) == "error":
+                    self.respond(500, b"internal error", "text/plain")
+                    return
+                match = ACTION_RE.search(body)
+                action = match.group(1).decode() if match else ""
+                content = sim.soap(ip, action)
+                if content is None:
+                    sim.count("faults")
+                    fault = FAULT.format(code="ter:NotAuthorized", reason="Sender not Authorized")
+                    self.respond(400, ENVELOPE.format(body=fault).encode())
+                elif content == "":
+                    sim.count("faults")
+                    fault = FAULT.format(code="ter:ActionNotSupported", reason=action)
+                    self.respond(500, ENVELOPE.format(body=fault).encode())
+                else:
+                    self.respond(200, ENVELOPE.format(body=content).encode())
+
+            def respond(self, status, payload, content_type="application/soap+xml; charset=utf-8"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def rtsp_handler(self):
+        sim = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                ip = self.connection.getsockname()[0]
+                sim.count("rtsp")
+                if ip not in sim.devices or not sim.delay(ip):
+                    return
+                request = []
+                for line in self.rfile:
+                    if line in (b"\r\n", b"\n"):
+                        break
+                    request.append(line.decode("latin-1").strip())
+                cseq = next(
+                    (l.split(":", 1)[1].strip() for l in request if l.lower().startswith("cseq:")),
+                    "1",
+                )
+                self.wfile.write(
+                    (
+                        f"RTSP/1.0 200 OK\r\nCSeq: {cseq}\r\n"
+                        "Public: OPTIONS, DESCRIBE, SETUP, PLAY, TEARDOWN\r\n\r\n"
+                    ).encode("ascii")
+                )
+
+        return Handler
+
+    def start(self):
+        # Tüm loopback adreslerini tek sokette dinlemek için joker adrese
+        # bağlanılır; loopback dışından gelen bağlantılar yanıtsız kapanır.
+        ThreadingHTTPServer.allow_reuse_address = True
+        ThreadingHTTPServer.daemon_threads = True
+        http_server = ThreadingHTTPServer(("0.0.0.0", self.port), self.http_handler())
+        http_server.request_queue_size = 1024
+
+        class RtspServer(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+            request_queue_size = 1024
+
+        rtsp_server = RtspServer(("0.0.0.0", self.rtsp_port), self.rtsp_handler())
+        self.port = http_server.server_address[1]
+        self.rtsp_port = rtsp_server.server_address[1]
+        for server in (http_server, rtsp_server):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.servers = []
+
+
+def wait_for_port(host, port, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ONVIF/RTSP kamera simülatörü")
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--rtsp-port", type=int, default=18554)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--slow-ms", type=float, default=2000)
+    parser.add_argument("--hang-s", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    for kind in FAULT_KINDS:
+        parser.add_argument(f"--{kind}", type=float, default=0.0, help=f"'{kind}' cihaz oranı")
+    args = parser.parse_args(argv)
+
+    sim = OnvifSimulator(
+        devices=args.devices,
+        port=args.port,
+        rtsp_port=args.rtsp_port,
+        latency_ms=args.latency_ms,
+        slow_ms=args.slow_ms,
+        hang_s=args.hang_s,
+        rates={kind: getattr(args, kind) for kind in FAULT_KINDS},
+        seed=args.seed,
+    ).start()
+    wait_for_port(device_ip(0), sim.port)
+    # Üst süreç hazır olunduğunu bu satırdan anlar
+    print(
+        json.dumps(
+            {
+                "ready": True,
+                "port": sim.port,
+                "rtsp_port": sim.rtsp_port,
+                "hosts": [device_ip(0), device_ip(args.devices - 1)],
+                "faults": {k: list(sim.faults.values()).count(k) for k in FAULT_KINDS},
+            }
+        ),
+        flush=True,
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
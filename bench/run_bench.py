@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Pi-Ekran: Performans ölçüm paketi
+Sahte mpv (bench/fake_mpv.py) ile ekran gerektirmeden çalışır.
+
+Ölçülenler:
+    switch    kaynak değiştirme gecikmesi ve ilk kareye kadar geçen süre
+    http      /status ve liste endpoint'lerinin eşzamanlı istemcilerle verimi
+    lock      MediaPlayer.lock bekleme süreleri (geçişler sırasında)
+    upload    /upload yazma hızı (MB/s), benzersiz ve yinelenen içerik
+
+Kullanım:
+    python bench/run_bench.py [--quick] [--only switch,http] [--output sonuc.json]
+
+Sonuçlar karşılaştırılabilir JSON olarak yazılır.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FAKE_MPV = os.path.join(BENCH_DIR, "fake_mpv.py")
+
+BENCHMARKS = ("switch", "http", "lock", "upload")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(values, scale=1000.0, unit="ms"):
+    """Süre listesini (saniye) ms cinsinden özetle"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "unit": unit,
+        "mean": round(statistics.mean(values) * scale, 3),
+        "p50": round(percentile(values, 50) * scale, 3),
+        "p95": round(percentile(values, 95) * scale, 3),
+        "p99": round(percentile(values, 99) * scale, 3),
+        "max": round(max(values) * scale, 3),
+    }
+
+
+class TimedLock:
+    """Bekleme süresini kaydeden kilit sarmalayıcısı"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = []
+
+    def acquire(self, *args, **kwargs):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(*args, **kwargs)
+        self.waits.append(time.perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Workspace:
+    """Geçici medya dizinleri, sahte mpv ve uygulama örneği"""
+
+    def __init__(self, video_count):
+        self.root = tempfile.mkdtemp(prefix="pi-ekran-bench-")
+        self.video_dir = os.path.join(self.root, "videos")
+        self.image_dir = os.path.join(self.root, "images")
+        self.bin_dir = os.path.join(self.root, "bin")
+        for d in (self.video_dir, self.image_dir, self.bin_dir):
+            os.makedirs(d)
+
+        wrapper = os.path.join(self.bin_dir, "mpv")
+        with open(wrapper, "w", encoding="utf-8") as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_MPV}" "$@"\n')
+        os.chmod(wrapper, 0o755)
+        os.environ["PATH"] = self.bin_dir + os.pathsep + os.environ.get("PATH", "")
+        os.environ.setdefault("FAKE_MPV_STARTUP_MS", "50")
+        os.environ.setdefault("FAKE_MPV_FIRST_FRAME_MS", "30")
+
+        for i in range(video_count):
+            with open(os.path.join(self.video_dir, f"clip{i:04d}.mp4"), "wb") as f:
+                f.write(os.urandom(256 + i))
+        for i in range(4):
+            with open(os.path.join(self.image_dir, f"slide{i}.png"), "wb") as f:
+                f.write(os.urandom(128))
+
+        config_file = os.path.join(self.root, "config.json")
+        with open(config_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ipc_socket": os.path.join(self.root, "mpv.sock"),
+                    "mpv_options": ["--no-config"],
+                    "cameras": [{"name": "Sim", "url": "rtsp://127.0.0.1:8554/sim"}],
+                    "log_level": "WARNING",
+                },
+                f,
+            )
+
+        sys.path.insert(0, REPO_DIR)
+        import app
+
+        self.app = app
+        app.CONFIG_FILE = config_file
+        app.VIDEO_DIR = self.video_dir
+        app.IMAGE_DIR = self.image_dir
+        app.MPV_LOG_FILE = os.path.join(self.root, "mpv.log")
+        app.PLAYLIST_DIR = os.path.join(self.root, "playlists")
+        app.app.config["UPLOAD_FOLDER"] = self.video_dir
+        app.app.config["IMAGE_UPLOAD_FOLDER"] = self.image_dir
+        app.app.config["LOGIN_DISABLED"] = True
+        app.library = app.MediaLibrary()
+        app.player = app.MediaPlayer()
+        self.player = app.player
+        self.server = None
+
+    def start_server(self):
+        from werkzeug.serving import make_server
+
+        self.server = make_server("127.0.0.1", 0, self.app.app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_port
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+        self.player.stop_current()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def wait_first_frame(player, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if player.ipc.get_property("estimated-frame-number") is not None:
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def bench_switch(ws, args):
+    """Video/slayt/kamera arasında geçiş gecikmesi"""
+    player = ws.player
+    actions = [
+        ("video", lambda: player.play_video(["clip0000.mp4"])),
+        ("slideshow", lambda: player.play_slideshow(None, 5)),
+        ("video_multi", lambda: player.play_video(["clip0001.mp4", "clip0002.mp4"])),
+        ("camera", lambda: player.play_camera("Sim")),
+    ]
+    calls, first_frames, per_source = [], [], {}
+    failures = 0
+    for i in range(args.switches):
+        name, action = actions[i % len(actions)]
+        start = time.perf_counter()
+        success, _ = action()
+        returned = time.perf_counter()
+        if not success or not wait_first_frame(player):
+            failures += 1
+            continue
+        calls.append(returned - start)
+        first_frames.append(time.perf_counter() - start)
+        per_source.setdefault(name, []).append(returned - start)
+    player.stop_current()
+    return {
+        "switch_call": summarize(calls),
+        "time_to_first_frame": summarize(first_frames),
+        "per_source": {k: summarize(v) for k, v in per_source.items()},
+        "failures": failures,
+    }
+
+
+def http_load(port, path, clients, duration, headers=None):
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker():
+        local, local_status = [], {}
+        while time.monotonic() < stop_at:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers or {})
+                resp = conn.getresponse()
+                resp.read()
+                local_status[resp.status] = local_status.get(resp.status, 0) + 1
+            except OSError:
+                local_status["error"] = local_status.get("error", 0) + 1
+                continue
+            finally:
+                conn.close()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            for k, v in local_status.items():
+                statuses[k] = statuses.get(k, 0) + v
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency": summarize(latencies),
+        "statuses": {str(k): v for k, v in statuses.items()},
+    }
+
+
+def bench_http(ws, args):
+    """Eşzamanlı istemcilerle endpoint verimi"""
+    port = ws.server.server_port if ws.server else ws.start_server()
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", "/videos")
+    etag = conn.getresponse().getheader("ETag")
+    conn.close()
+
+    targets = {
+        "status": ("/status", None),
+        "videos_full": ("/videos", None),
+        "videos_page": ("/videos?limit=50&sort=size&order=desc&details=1", None),
+        "videos_not_modified": ("/videos", {"If-None-Match": etag}),
+        "cameras": ("/cameras", None),
+    }
+    return {
+        name: http_load(port, path, args.clients, args.duration, headers)
+        for name, (path, headers) in targets.items()
+    }
+
+
+def bench_lock(ws, args):
+    """Geçişler sırasında get_status'un kilit bekleme süreleri"""
+    player = ws.player
+    timed = TimedLock()
+    original = player.lock
+    player.lock = timed
+    stop = threading.Event()
+    status_latencies = []
+
+    def reader():
+        local = []
+        while not stop.is_set():
+            start = time.perf_counter()
+            player.get_status()
+            local.append(time.perf_counter() - start)
+            time.sleep(0.001)
+        status_latencies.extend(local)
+
+    readers = [threading.Thread(target=reader) for _ in range(args.clients)]
+    for t in readers:
+        t.start()
+    try:
+        for i in range(max(2, args.switches // 2)):
+            player.play_video([f"clip{i % 3:04d}.mp4"])
+    finally:
+        stop.set()
+        for t in readers:
+            t.join()
+        player.stop_current()
+        player.lock = original
+
+    waits = timed.waits
+    return {
+        "acquisitions": len(waits),
+        "lock_wait": summarize(waits),
+        "contended_over_10ms": sum(1 for w in waits if w > 0.01),
+        "get_status_latency": summarize(status_latencies),
+    }
+
+
+def post_upload(port, filename, payload):
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="files[]"; filename="{filename}"\r\n'
+        "Content-Type: video/mp4\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    start = time.perf_counter()
+    conn.putrequest("POST", "/upload")
+    conn.putheader("Content-Type", f"multipart/form-data; boundary={boundary}")
+    conn.putheader("Content-Length", str(len(head) + len(payload) + len(tail)))
+    conn.endheaders()
+    conn.send(head)
+    view = memoryview(payload)
+    for offset in range(0, len(payload), 1024 * 1024):
+        conn.send(view[offset : offset + 1024 * 1024])
+    conn.send(tail)
+    resp = conn.getresponse()
+    resp.read()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return resp.status, elapsed
+
+
+def bench_upload(ws, args):
+    """Yükleme hızı: benzersiz içerik ve aynı içeriğin tekrar yüklenmesi"""
+    port = ws.server.server_port if ws.server else ws.start_server()
+    size = args.upload_mb * 1024 * 1024
+    payload = os.urandom(size)
+    unique, duplicate = [], []
+    for i in range(args.uploads):
+        status, elapsed = post_upload(port, f"unique{i}.mp4", payload[i:] + payload[:i])
+        if status == 200:
+            unique.append(size / elapsed / (1024 * 1024))
+        status, elapsed = post_upload(port, f"dup{i}.mp4", payload)
+        if status == 200 and i > 0:
+            duplicate.append(size / elapsed / (1024 * 1024))
+
+    def stats(values):
+        if not values:
+            return {"count": 0}
+        return {
+            "count": len(values),
+            "unit": "MB/s",
+            "mean": round(statistics.mean(values), 2),
+            "min": round(min(values), 2),
+            "max": round(max(values), 2),
+        }
+
+    return {"size_mb": args.upload_mb, "unique": stats(unique), "duplicate": stats(duplicate)}
+
+
+def git_revision():
+    try:
+        return (
+            subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR)
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pi-Ekran performans ölçümleri")
+    parser.add_argument("--quick", action="store_true", help="kısa ölçüm (CI için)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS))
+    parser.add_argument("--output", help="JSON sonuç dosyası (varsayılan: stdout)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="endpoint başına saniye")
+    parser.add_argument("--switches", type=int, default=12)
+    parser.add_argument("--videos", type=int, default=500, help="kütüphanedeki dosya sayısı")
+    parser.add_argument("--upload-mb", type=int, default=64)
+    parser.add_argument("--uploads", type=int, default=3)
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.duration, args.switches, args.upload_mb, args.uploads = 1.0, 4, 8, 2
+        args.clients = min(args.clients, 4)
+
+    selected = [b for b in args.only.split(",") if b]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"bilinmeyen ölçüm: {', '.join(sorted(unknown))}")
+
+    ws = Workspace(args.videos)
+    results = {}
+    try:
+        for name in selected:
+            started = time.perf_counter()
+            results[name] = globals()[f"bench_{name}"](ws, args)
+            results[name]["elapsed_s"] = round(time.perf_counter() - started, 2)
+            print(f"[{name}] tamamlandı ({results[name]['elapsed_s']} sn)", file=sys.stderr)
+    finally:
+        ws.close()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "only")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -196,7 +196,7 @@ class PiEkranController {
         // Butonları güncelle
         this.updateButtons(status);
         if (cams && cams.cameras) {
-            this.renderCameraList(cams.cameras);
+            this.renderCameraList(cams.cameras, cams.snapshot_ttl);
         }
     }
     
@@ -355,7 +355,7 @@ class PiEkranController {
         try {
             const response = await apiFetch('/videos');
             const data = await response.json();
-            this.renderVideoList(data.videos || []);
+            this.renderVideoList(data.videos || [], data.problems || {});
         } catch (e) {
             this.addLog('Video listesi alınamadı', 'error');
         }
@@ -365,13 +365,13 @@ class PiEkranController {
         try {
             const response = await apiFetch('/cameras');
             const data = await response.json();
-            this.renderCameraList(data.cameras || []);
+            this.renderCameraList(data.cameras || [], data.snapshot_ttl);
         } catch (e) {
             this.addLog('Kamera listesi alınamadı', 'error');
         }
     }
 
-    renderVideoList(list) {
+    renderVideoList(list, problems = {}) {
         this.elements.videoList.innerHTML = '';
         list.forEach(name => {
             const item = document.createElement('div');
@@ -383,6 +383,13 @@ class PiEkranController {
             cb.value = name;
             label.appendChild(cb);
             label.appendChild(document.createTextNode(' ' + name));
+            if (problems[name]) {
+                const warn = document.createElement('span');
+                warn.className = 'media-problem';
+                warn.textContent = ' ⚠';
+                warn.title = problems[name].join(', ');
+                label.appendChild(warn);
+            }
 
             const deleteBtn = document.createElement('button');
             deleteBtn.innerHTML = '&times;';
@@ -395,12 +402,31 @@ class PiEkranController {
         });
     }
 
-    renderCameraList(list) {
+    renderCameraList(list, ttl) {
+        // Anlık görüntüler sunucuda ttl saniye önbelleklenir; aynı dilimlerle yenilenir
+        const bucket = Math.floor(Date.now() / ((ttl || 10) * 1000));
+        const key = JSON.stringify(list.map(cam => cam.name));
+        if (key === this.cameraListKey) {
+            this.elements.cameraList.querySelectorAll('.camera-snapshot').forEach(img => {
+                img.src = `${img.dataset.src}&t=${bucket}`;
+            });
+            return;
+        }
+        this.cameraListKey = key;
         this.elements.cameraList.innerHTML = '';
         list.forEach(cam => {
             const btn = document.createElement('button');
-            btn.textContent = cam.name;
             btn.className = 'camera-item';
+            const snapshot = document.createElement('img');
+            snapshot.className = 'camera-snapshot';
+            snapshot.loading = 'lazy';
+            snapshot.alt = '';
+            snapshot.dataset.src = `/cameras/snapshot?name=${encodeURIComponent(cam.name)}`;
+            snapshot.src = `${snapshot.dataset.src}&t=${bucket}`;
+            snapshot.addEventListener('error', () => { snapshot.hidden = true; });
+            snapshot.addEventListener('load', () => { snapshot.hidden = false; });
+            btn.appendChild(snapshot);
+            btn.appendChild(document.createTextNode(cam.name));
             btn.addEventListener('click', () => this.playCameraByName(cam.name));
             this.elements.cameraList.appendChild(btn);
         });
@@ -0,0 +1,227 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeIPC:
+    def __init__(self):
+        self.commands = []
+        self.listeners = []
+        self.up = True
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def command(self, *args, timeout=None):
+        if not self.up:
+            raise app.MpvIPCError("MPV soketi bulunamadı")
+        self.commands.append(args)
+
+    send_nowait = command
+
+    def disconnect(self):
+        for callback in self.listeners:
+            callback({"event": "ipc-disconnected"})
+
+
+class FakePlayer:
+    def __init__(self):
+        self.ipc = FakeIPC()
+
+
+def fake_renderer(text, settings, ticker=False):
+    width = 400 if ticker else 100
+    height = 10
+    return bytes([len(text) % 256]) * (width * height * 4), width, height
+
+
+@pytest.fixture
+def engine(tmp_path):
+    player = FakePlayer()
+    clock = Clock()
+    settings = {"buffer_path": str(tmp_path / "overlay.bgra"), "screen_width": 200, "screen_height": 100}
+    eng = app.AnnouncementEngine(player, settings, renderer=fake_renderer, clock=clock)
+    yield eng, player.ipc, clock
+    eng.buffer.close()
+
+
+def overlay_adds(ipc, overlay_id):
+    return [c for c in ipc.commands if c[0] == "overlay-add" and c[1] == overlay_id]
+
+
+def test_priority_preempts_and_resumes_with_remaining_time(engine):
+    eng, ipc, clock = engine
+    low = eng.add("normal", priority=0, duration=10)
+    assert eng.tick() == low["id"]
+    clock.now += 4
+    eng.tick()
+
+    high = eng.add("acil", priority=5, duration=3)
+    assert eng.tick() == high["id"]
+    clock.now += 3
+    assert eng.tick() == low["id"]
+    remaining = next(i for i in eng.items if i["id"] == low["id"])["remaining"]
+    assert remaining == pytest.approx(6)
+
+    clock.now += 6
+    assert eng.tick() is None
+    assert ipc.commands[-1] == ("overlay-remove", app.BANNER_OVERLAY_ID)
+
+
+def test_switching_banner_reuses_prerendered_frame(engine):
+    eng, ipc, clock = engine
+    rendered = []
+
+    def counting(text, settings, ticker=False):
+        rendered.append(text)
+        return fake_renderer(text, settings, ticker)
+
+    eng.renderer = counting
+    first = eng.add("bir", duration=5)
+    second = eng.add("iki", priority=1, duration=5)
+    assert rendered == ["bir", "iki"]
+    eng.tick()
+    eng.remove(second["id"])
+    eng.tick()
+    assert rendered == ["bir", "iki"]
+
+    adds = overlay_adds(ipc, app.BANNER_OVERLAY_ID)
+    assert [a[5] for a in adds] == [eng.frames[second["id"]]["offset"], eng.frames[first["id"]]["offset"]]
+    assert adds[-1][4] == eng.buffer.path and adds[-1][6] == "bgra"
+
+
+def test_compaction_writes_to_inactive_half_and_readds_banner(tmp_path):
+    player = FakePlayer()
+    # Her yarıya iki kare sığar (100x10 BGRA = 4000 bayt, 64 bayt hizalı)
+    settings = {
+        "buffer_path": str(tmp_path / "overlay.bgra"),
+        "buffer_mb": 4 * 4032 / (1024 * 1024),
+        "screen_width": 200,
+        "screen_height": 100,
+    }
+    eng = app.AnnouncementEngine(player, settings, renderer=fake_renderer, clock=Clock())
+    try:
+        shown = eng.add("ekranda", priority=5, duration=30)
+        eng.tick()
+        old_offset = eng.frames[shown["id"]]["offset"]
+        gone = eng.add("silinecek", duration=30)
+        eng.remove(gone["id"])
+        before = bytes(eng.buffer.map[:eng.buffer.half])
+
+        eng.add("yeni", duration=30)
+        # mpv'nin okuduğu yarı değişmedi; şerit diğer yarıdan yeniden eklendi
+        assert bytes(eng.buffer.map[:eng.buffer.half]) == before
+        new_offset = eng.frames[shown["id"]]["offset"]
+        assert old_offset < eng.buffer.half <= new_offset
+        adds = overlay_adds(player.ipc, app.BANNER_OVERLAY_ID)
+        assert adds[-1][5] == new_offset and eng.banner_state[1] == new_offset
+        assert gone["id"] not in eng.frames
+    finally:
+        eng.buffer.close()
+
+
+def test_scheduled_and_expired_announcements(engine):
+    eng, ipc, clock = engine
+    later = eng.add("sonra", start_at=clock.now + 60)
+    eng.add("kısa", expires_at=clock.now + 1, duration=30)
+    assert eng.status()["announcements"][0]["state"] in ("queued", "scheduled")
+    clock.now += 2
+    assert eng.tick() is None
+    assert [i["id"] for i in eng.items] == [later["id"]]
+    clock.now += 60
+    assert eng.tick() == later["id"]
+
+    with pytest.raises(ValueError):
+        eng.add("geçmiş", expires_at=clock.now - 1)
+    with pytest.raises(ValueError):
+        eng.add("  ")
+
+
+def test_ticker_scrolls_by_offset_only(engine):
+    eng, ipc, clock = engine
+    eng.add("kayan yazı", kind="ticker", duration=60)
+    eng.tick()
+    clock.now += 0.5
+    eng.tick()
+    adds = overlay_adds(ipc, app.TICKER_OVERLAY_ID)
+    assert len(adds) == 2
+    first, second = adds
+    shift = int(0.5 * eng.settings["ticker_speed"]) % (400 - 200)
+    assert second[5] - first[5] == shift * 4
+    # Görünen pencere ekran genişliğinde, satır adımı şeridin tam genişliği
+    assert second[7] == 200 and second[9] == 400 * 4
+
+
+def test_overlays_restored_after_mpv_restart(engine):
+    eng, ipc, clock = engine
+    item = eng.add("kalıcı", duration=30)
+    eng.tick()
+    assert len(overlay_adds(ipc, app.BANNER_OVERLAY_ID)) == 1
+    eng.tick()
+    assert len(overlay_adds(ipc, app.BANNER_OVERLAY_ID)) == 1
+
+    ipc.disconnect()
+    ipc.up = False
+    eng.tick()
+    ipc.up = True
+    eng.tick()
+    adds = overlay_adds(ipc, app.BANNER_OVERLAY_ID)
+    assert len(adds) == 2
+    assert adds[-1][5] == eng.frames[item["id"]]["offset"]
+
+
+def test_osd_fallback_without_renderer(engine):
+    eng, ipc, clock = engine
+    eng.renderer = lambda text, settings, ticker=False: None
+    eng.add("metin", duration=7)
+    eng.tick()
+    eng.tick()
+    assert ipc.commands == [("show-text", "metin", 7000)]
+
+
+def test_render_text_without_pillow_returns_none():
+    with patch.dict(sys.modules, {"PIL": None}):
+        assert app.render_text("metin", dict(app.ANNOUNCEMENT_DEFAULTS)) is None
+
+
+def test_announce_endpoint_queues(engine, monkeypatch):
+    eng, ipc, clock = engine
+    monkeypatch.setattr(app, "announcements", eng)
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        client = app.app.test_client()
+        res = client.post("/announce", json={"message": "Merhaba", "priority": 2}).json
+        assert res["success"] and res["announcement"]["priority"] == 2
+        assert client.post("/announce", json={"message": "x", "kind": "popup"}).json["success"] is False
+        listed = client.get("/announcements").json["announcements"]
+        assert [i["text"] for i in listed] == ["Merhaba"]
+        assert client.delete("/announcements", json={"id": "bir"}).json["success"] is False
+        assert client.delete("/announcements", json={"id": listed[0]["id"]}).json["success"]
+        assert client.get("/announcements").json["announcements"] == []
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
+
+
+def test_render_text_is_premultiplied_bgra():
+    pytest.importorskip("PIL")
+    settings = dict(app.ANNOUNCEMENT_DEFAULTS, screen_width=320, background="#FF000080")
+    data, width, height = app.render_text("Duyuru", settings)
+    assert width == 320 and len(data) == width * height * 4
+    # Köşe pikseli yalnızca arka plan: yarı saydam kırmızı, ön çarpımlı
+    assert tuple(data[:4]) == (0, 0, 128, 128)
+
+    data, width, height = app.render_text("Kayan", settings, ticker=True)
+    assert width > 2 * 320 and len(data) == width * height * 4
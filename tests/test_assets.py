@@ -0,0 +1,50 @@
+import gzip
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+def test_build_static_assets_fingerprints_and_compresses(tmp_path):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (static_dir / "site.css").write_text("body { color: red; }")
+    (static_dir / "logo.png").write_bytes(b"png")
+    cache_dir = tmp_path / "cache"
+
+    with patch.object(app, "STATIC_DIR", str(static_dir)), \
+        patch.object(app, "ASSET_CACHE_DIR", str(cache_dir)), \
+        patch.dict(app.asset_manifest, clear=True), \
+        patch.dict(app.asset_lookup, clear=True):
+        manifest = app.build_static_assets()
+
+        assert list(manifest) == ["site.css"]
+        entry = manifest["site.css"]
+        assert entry["file"].startswith("site.") and entry["file"].endswith(".css")
+        with open(entry["variants"]["gzip"], "rb") as f:
+            assert gzip.decompress(f.read()) == b"body { color: red; }"
+
+        client = app.app.test_client()
+        res = client.get(f"/assets/{entry['file']}", headers={"Accept-Encoding": "gzip"})
+        assert res.status_code == 200
+        assert res.headers["Content-Encoding"] == "gzip"
+        assert "immutable" in res.headers["Cache-Control"]
+        assert res.headers["Vary"] == "Accept-Encoding"
+
+        plain = client.get(f"/assets/{entry['file']}", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in plain.headers
+        assert plain.data == b"body { color: red; }"
+
+        # Yeniden başlatmadan değişen dosya eski özet adıyla sunulmaz
+        (static_dir / "site.css").write_text("body { color: blue; }")
+        again = client.get(f"/assets/{entry['file']}", headers={"Accept-Encoding": "identity"})
+        assert again.data == b"body { color: red; }"
+
+
+def test_asset_url_uses_fingerprint():
+    with app.app.test_request_context():
+        url = app.asset_url("style.css")
+    assert url.startswith("/assets/style.")
+    assert url != "/assets/style.css"
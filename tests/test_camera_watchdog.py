@@ -0,0 +1,109 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Proc:
+    def poll(self):
+        return None
+
+
+class FakeIPC:
+    def __init__(self):
+        self.props = {"time-pos": 0.0, "estimated-frame-number": 0, "paused-for-cache": False}
+
+    def get_property(self, name, default=None):
+        return self.props.get(name, default)
+
+
+class FakePlayer:
+    def __init__(self):
+        self.ipc = FakeIPC()
+        self.current_source = "camera"
+        self.current_process = Proc()
+        self.current_camera = {"name": "Kapı", "url": "rtsp://127.0.0.1:1/x"}
+        self.camera_stalled = False
+        self.camera_fallback = False
+        self.calls = []
+
+    def restart_camera(self):
+        self.calls.append("restart")
+        self.current_source = "camera"
+        self.current_process = Proc()
+        self.camera_fallback = False
+        return True, ""
+
+    def play_fallback(self):
+        self.calls.append("fallback")
+        self.current_source = "video"
+        self.current_process = Proc()
+        self.camera_fallback = True
+        return True, ""
+
+
+def make_watchdog(probe=lambda url: False):
+    player = FakePlayer()
+    clock = Clock()
+    settings = {"stall_window": 10, "backoff_initial": 2, "backoff_max": 8, "fallback_after": 30}
+    return app.CameraWatchdog(player, settings, probe=probe, clock=clock), player, clock
+
+
+def advance(watchdog, clock, seconds, step=1.0, progress=False):
+    for _ in range(int(seconds / step)):
+        clock.now += step
+        if progress:
+            watchdog.player.ipc.props["time-pos"] += step
+        watchdog.check()
+
+
+def test_frozen_stream_triggers_reconnect_with_backoff():
+    watchdog, player, clock = make_watchdog()
+    advance(watchdog, clock, 5, progress=True)
+    assert not player.camera_stalled
+
+    advance(watchdog, clock, 11)
+    assert player.camera_stalled
+    assert player.calls == ["restart"]
+
+    advance(watchdog, clock, 10)
+    # 2 sn, ardından 4 sn geri çekilme
+    assert player.calls.count("restart") >= 2
+    assert watchdog.backoff > 2
+
+
+def test_recovery_is_recorded():
+    watchdog, player, clock = make_watchdog()
+    advance(watchdog, clock, 3, progress=True)
+    advance(watchdog, clock, 12)
+    assert watchdog.stall is not None
+    advance(watchdog, clock, 3, progress=True)
+
+    report = watchdog.report()
+    assert report["current"] is None
+    assert report["history"][0]["outcome"] == "recovered"
+    assert report["history"][0]["camera"] == "Kapı"
+    assert not player.camera_stalled
+
+
+def test_prolonged_outage_falls_back_and_returns():
+    reachable = {"ok": False}
+    watchdog, player, clock = make_watchdog(probe=lambda url: reachable["ok"])
+    advance(watchdog, clock, 3, progress=True)
+    advance(watchdog, clock, 40)
+    assert "fallback" in player.calls
+    assert player.current_source == "video"
+
+    reachable["ok"] = True
+    player.calls.clear()
+    advance(watchdog, clock, 10)
+    assert player.calls and player.calls[0] == "restart"
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+import app
+
+pytest.importorskip("onvif")
+from onvif_sim import OnvifSimulator, device_ip  # noqa: E402
+
+
+@pytest.fixture
+def simulator():
+    sim = OnvifSimulator(
+        devices=5, port=0, rtsp_port=0, hang_s=5, rates={"auth": 0.2, "hang": 0.2, "error": 0.2}
+    ).start()
+    yield sim
+    sim.stop()
+
+
+def test_discovery_against_simulator(simulator):
+    found = []
+    started = time.monotonic()
+    cameras = app.discover_onvif_cameras(
+        progress_callback=lambda item: found.append(item) if item["event"] == "found" else None,
+        hosts=simulator.hosts() + [device_ip(50)],
+        ports=[simulator.port],
+        timeout=1,
+    )
+    # Yanıt vermeyen cihaz taramayı zaman aşımından fazla bekletmemeli
+    assert time.monotonic() - started < 4
+
+    by_ip = {c["ip"]: c for c in cameras}
+    faults = simulator.faults
+    healthy = [ip for ip in simulator.hosts() if ip not in faults]
+    assert set(by_ip) == set(healthy) | {ip for ip, kind in faults.items() if kind == "auth"}
+    assert len(found) == len(cameras)
+
+    for ip in healthy:
+        assert by_ip[ip]["hostname"].startswith("simcam-")
+        assert by_ip[ip]["rtsp_url"] == f"rtsp://{ip}:{simulator.rtsp_port}/stream1"
+        assert app.probe_rtsp(by_ip[ip]["rtsp_url"], timeout=1)
+
+    auth_ip = next(ip for ip, kind in faults.items() if kind == "auth")
+    assert by_ip[auth_ip]["rtsp_url"] == ""
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+FAKE_MPV = os.path.join(os.path.dirname(__file__), "..", "bench", "fake_mpv.py")
+
+
+@pytest.fixture
+def fake_mpv(tmp_path):
+    sock = str(tmp_path / "mpv.sock")
+    env = dict(os.environ, FAKE_MPV_STARTUP_MS="0", FAKE_MPV_FIRST_FRAME_MS="0", FAKE_MPV_DURATION="0.3")
+    proc = subprocess.Popen(
+        [sys.executable, FAKE_MPV, f"--input-ipc-server={sock}", "--loop-playlist=inf", "a.mp4", "b.mp4"],
+        env=env,
+    )
+    ipc = app.MpvIPC(sock)
+    assert ipc.wait_ready(5)
+    yield proc, ipc
+    ipc.close()
+    proc.terminate()
+    proc.wait(5)
+
+
+def test_ipc_properties_and_commands(fake_mpv):
+    _, ipc = fake_mpv
+    assert ipc.get_property("playlist-count") == 2
+    ipc.command("seek", 0.1, "absolute+exact")
+    assert ipc.get_property("time-pos") >= 0.1
+    ipc.set_property("speed", 1.05)
+    assert ipc.get_property("speed") == 1.05
+    with pytest.raises(app.MpvIPCError):
+        ipc.command("no-such-command")
+
+
+def test_observed_playlist_pos_events(fake_mpv):
+    _, ipc = fake_mpv
+    events = []
+    ipc.add_listener(events.append)
+    ipc.observe("playlist-pos", 1)
+    deadline = time.time() + 3
+    while time.time() < deadline and not any(
+        e.get("name") == "playlist-pos" and e.get("data") == 1 for e in events
+    ):
+        time.sleep(0.05)
+    assert any(e.get("event") == "file-loaded" for e in events)
+    assert any(e.get("name") == "playlist-pos" and e.get("data") == 1 for e in events)
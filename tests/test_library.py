@@ -0,0 +1,123 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+@pytest.fixture
+def client(tmp_path):
+    video_dir = tmp_path / "videos"
+    image_dir = tmp_path / "images"
+    video_dir.mkdir()
+    image_dir.mkdir()
+    for name in ("c.mp4", "a.mp4", "b.mp4"):
+        (video_dir / name).write_bytes(b"x" * (ord(name[0]) - 96))
+    app.app.config["LOGIN_DISABLED"] = True
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), \
+        patch.object(app, "IMAGE_DIR", str(image_dir)), \
+        patch.object(app, "library", app.MediaLibrary()), \
+        patch.dict(app.app.config, {"UPLOAD_FOLDER": str(video_dir)}):
+        yield app.app.test_client()
+    app.app.config["LOGIN_DISABLED"] = False
+
+
+def test_videos_etag_returns_304(client):
+    first = client.get("/videos")
+    assert first.status_code == 200
+    assert first.json["videos"] == ["a.mp4", "b.mp4", "c.mp4"]
+    etag = first.headers["ETag"]
+
+    second = client.get("/videos", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_videos_cursor_pagination(client):
+    page = client.get("/videos?limit=2&sort=size&order=desc").json
+    assert page["videos"] == ["c.mp4", "b.mp4"]
+    assert page["total"] == 3
+    rest = client.get(f"/videos?limit=2&sort=size&order=desc&cursor={page['next_cursor']}").json
+    assert rest["videos"] == ["a.mp4"]
+    assert rest["next_cursor"] is None
+
+    # İmleç sıralamasıyla birlikte kullanılmalı
+    for query in ("sort=name&order=desc", "sort=size&order=asc"):
+        res = client.get(f"/videos?limit=2&{query}&cursor={page['next_cursor']}")
+        assert res.status_code == 400 and res.json["success"] is False
+    assert client.get("/videos?cursor=bozuk").status_code == 400
+
+
+def test_etag_not_reused_across_restarts(client):
+    etag = client.get("/videos").headers["ETag"]
+    with patch.object(app, "BOOT_ID", "yeniden"), patch.object(app, "library", app.MediaLibrary()):
+        assert client.get("/videos", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_bulk_delete_changes_etag(client):
+    etag = client.get("/videos").headers["ETag"]
+    res = client.post("/bulk_delete", json={"videos": ["a.mp4", "missing.mp4"]}).json
+    assert res["videos"]["a.mp4"] == "ok"
+    assert res["videos"]["missing.mp4"] != "ok"
+
+    after = client.get("/videos", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.json["videos"] == ["b.mp4", "c.mp4"]
+
+
+def test_upload_check_links_existing_content(client):
+    digest = app.hash_file(os.path.join(app.VIDEO_DIR, "b.mp4"))
+    res = client.post(
+        "/upload_check",
+        json={"hash": digest, "size": 2, "filename": "promo.mp4", "link": True},
+    ).json
+    assert res["present"] is True
+    assert res["name"] == "b.mp4"
+    assert res["linked"] == "promo.mp4"
+    assert os.path.samefile(
+        os.path.join(app.VIDEO_DIR, "b.mp4"), os.path.join(app.VIDEO_DIR, "promo.mp4")
+    )
+
+    missing = client.post("/upload_check", json={"hash": "00" * 32, "size": 2}).json
+    assert missing["present"] is False
+
+
+def test_find_by_hash_hashes_only_same_size_candidates(client):
+    hashed = []
+    real = app.hash_file
+    with patch.object(app, "hash_file", lambda path: hashed.append(os.path.basename(path)) or real(path)):
+        digest = real(os.path.join(app.VIDEO_DIR, "b.mp4"))
+        assert app.library.find_by_hash("video", digest, 2)["name"] == "b.mp4"
+        assert hashed == ["b.mp4"]
+        assert app.library.find_by_hash("video", digest) is not None
+        assert app.library.find_by_hash("video", "00" * 32) is None
+    assert hashed == ["b.mp4"]
+
+
+def test_duplicates_report_wasted_bytes(client):
+    with open(os.path.join(app.VIDEO_DIR, "copy.mp4"), "wb") as f:
+        f.write(b"xxx")
+    report = client.get("/library/duplicates").json
+    assert report["videos"][0]["files"] == ["c.mp4", "copy.mp4"]
+    assert report["videos_wasted_bytes"] == 3
+
+
+def test_upload_hashes_and_links_duplicate(client):
+    import io
+
+    res = client.post(
+        "/upload",
+        data={"files[]": (io.BytesIO(b"xx"), "again.mp4")},
+        content_type="multipart/form-data",
+    )
+    assert res.json["success"]
+    assert os.path.samefile(
+        os.path.join(app.VIDEO_DIR, "b.mp4"), os.path.join(app.VIDEO_DIR, "again.mp4")
+    )
+    assert app.library.refresh("video")["again.mp4"]["hash"] == app.hash_file(
+        os.path.join(app.VIDEO_DIR, "b.mp4")
+    )
+    assert not [f for f in os.listdir(app.VIDEO_DIR) if f.endswith((".part", ".link"))]
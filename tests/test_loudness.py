@@ -0,0 +1,149 @@
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+EBUR128_OUTPUT = """
+[Parsed_ebur128_0 @ 0x55d0] t: 9.99  TARGET:-23 LUFS    M: -19.1 S: -19.6     I: -19.8 LUFS       LRA:   4.1 LU
+[Parsed_ebur128_0 @ 0x55d0] Summary:
+
+  Integrated loudness:
+    I:         -19.5 LUFS
+    Threshold: -29.8 LUFS
+
+  Loudness range:
+    LRA:         5.3 LU
+    Threshold: -39.8 LUFS
+    LRA low:   -23.7 LUFS
+    LRA high:  -18.4 LUFS
+
+  True peak:
+    Peak:       -0.6 dBFS
+"""
+
+
+def test_analyze_parses_ebur128_summary_and_runs_low_priority():
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        if "/v/sessiz.mp4" in cmd:
+            return subprocess.CompletedProcess(cmd, 1, "", "Stream map '0:a:0' matches no streams.\n")
+        return subprocess.CompletedProcess(cmd, 0, "", EBUR128_OUTPUT)
+
+    with patch("subprocess.run", run), patch("shutil.which", return_value="/usr/bin/x"):
+        result = app.analyze_loudness("/v/spot.mp4")
+        assert app.analyze_loudness("/v/sessiz.mp4") == {"audio": False}
+    assert result == {"audio": True, "integrated": -19.5, "true_peak": -0.6, "lra": 5.3}
+    assert calls[0][:5] == ["nice", "-n", "19", "ionice", "-c"]
+    assert "ebur128=peak=true" in calls[0] and not any("loudnorm" in a for a in calls[0])
+
+
+@pytest.fixture
+def env(tmp_path):
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    with patch.object(app, "VIDEO_DIR", str(video_dir)):
+        library = app.MediaLibrary(str(tmp_path / "index.json"))
+        yield library, video_dir
+
+
+def wait_idle(analyzer):
+    deadline = time.monotonic() + 5
+    while analyzer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_worker_measures_once_and_reuses_duplicates(env):
+    library, video_dir = env
+    (video_dir / "a.mp4").write_bytes(b"a" * 100)
+    (video_dir / "kopya.mp4").write_bytes(b"a" * 100)
+    (video_dir / "b.mp4").write_bytes(b"b" * 100)
+    library.ensure_hashes("video")
+    measured = []
+
+    def analyze(path, timeout=None):
+        measured.append(os.path.basename(path))
+        return {"audio": True, "integrated": -30.0, "true_peak": -12.0, "lra": 3.0}
+
+    analyzer = app.LoudnessAnalyzer(library, None, analyze=analyze)
+    with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
+        assert analyzer.scan() == 3
+        wait_idle(analyzer)
+        assert analyzer.scan() == 0
+    assert sorted(measured) in (["a.mp4", "b.mp4"], ["b.mp4", "kopya.mp4"])
+    assert library.refresh("video")["kopya.mp4"]["loudness"]["integrated"] == -30.0
+
+    # Ölçümler dizinde saklanır; dosya değişince yeniden ölçülür
+    reloaded = app.MediaLibrary(library.index_file)
+    assert reloaded.refresh("video")["a.mp4"]["loudness"] is not None
+    (video_dir / "b.mp4").write_bytes(b"yeni" * 100)
+    reloaded.invalidate("video")
+    assert reloaded.refresh("video")["b.mp4"]["loudness"] is None
+
+
+def test_gain_respects_target_true_peak_and_limits(env):
+    library, video_dir = env
+    samples = {
+        "sessiz.mp4": {"audio": True, "integrated": -30.0, "true_peak": -12.0},
+        "tepeli.mp4": {"audio": True, "integrated": -30.0, "true_peak": -3.0},
+        "yuksek.mp4": {"audio": True, "integrated": -14.0, "true_peak": 0.5},
+        "cok_sessiz.mp4": {"audio": True, "integrated": -60.0, "true_peak": -40.0},
+        "sesi_yok.mp4": {"audio": False},
+    }
+    for name, result in samples.items():
+        (video_dir / name).write_bytes(b"x")
+        library.record_loudness("video", name, result)
+    analyzer = app.LoudnessAnalyzer(library, {"target_lufs": -23, "max_true_peak": -1, "max_gain_db": 12})
+    assert analyzer.gain("sessiz.mp4") == 7.0
+    assert analyzer.gain("tepeli.mp4") == 2.0
+    assert analyzer.gain("yuksek.mp4") == -9.0
+    assert analyzer.gain("cok_sessiz.mp4") == 12.0
+    assert analyzer.gain("sesi_yok.mp4") is None
+    # mpv yazılım sesi kübik: +7 dB ≈ %131
+    assert analyzer.volume("sessiz.mp4", 100) == pytest.approx(100 * 10 ** (7 / 60))
+
+    # Durum raporu tüm kazançları tek kütüphane taramasından hesaplar
+    with patch.object(library, "refresh", wraps=library.refresh) as refresh:
+        report = analyzer.status(gains=True)
+    assert refresh.call_count == 1
+    assert report["measured"] == 5 and report["gains"]["tepeli.mp4"] == 2.0
+
+
+def test_play_video_applies_static_per_file_volume(env, tmp_path):
+    library, video_dir = env
+    for name in ("a.mp4", "b.mp4"):
+        (video_dir / name).write_bytes(b"x")
+    library.record_loudness("video", "a.mp4", {"audio": True, "integrated": -17.0, "true_peak": -2.0})
+    cfg = tmp_path / "config.json"
+    cfg.write_text('{"mpv_options": ["--volume=80"]}')
+    spawned = []
+
+    class Proc:
+        def __init__(self, cmd):
+            self.cmd = cmd
+
+        def poll(self):
+            return None
+
+    def spawn(cmd, **kwargs):
+        spawned.append(Proc(cmd))
+        return spawned[-1]
+
+    with patch.object(app, "CONFIG_FILE", str(cfg)), patch.object(app, "MPV_LOG_FILE", str(tmp_path / "mpv.log")):
+        player = app.MediaPlayer()
+    with patch.object(app, "loudness", app.LoudnessAnalyzer(library)), \
+        patch("shutil.which", return_value="/usr/bin/mpv"), patch("subprocess.Popen", spawn), \
+        patch("time.sleep"), patch.object(app, "library"):
+        assert player.play_video(["a.mp4", "b.mp4"])[0]
+    cmd = spawned[0].cmd
+    a, b = str(video_dir / "a.mp4"), str(video_dir / "b.mp4")
+    start = cmd.index("--{")
+    assert cmd[start:] == ["--{", f"--volume={80 * 10 ** (-6 / 60):.1f}", a, "--}", b]
+    assert not any(arg.startswith("--af") for arg in cmd)
@@ -0,0 +1,163 @@
+import copy
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+CONFIG = {
+    "mpv_options": ["--fullscreen", "--no-osc"],
+    "default_video": "ana.mp4",
+    "schedule": [{"days": ["Monday"], "start": "08:00", "end": "09:00", "source": "camera"}],
+    "outputs": [
+        {
+            "name": "hdmi2",
+            "mpv_options": ["--drm-connector=HDMI-A-2", "--audio-device=alsa/hdmi:CARD=vc4hdmi1"],
+            "default_video": "ikinci.mp4",
+            "schedule": [
+                {"days": ["Monday"], "start": "10:00", "end": "11:00", "source": "video", "video": "b.mp4"}
+            ],
+        },
+        {"name": "hdmi2"},
+        {"mpv_options": []},
+    ],
+}
+
+
+class FakeProcess:
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    for name in ("a.mp4", "b.mp4"):
+        (video_dir / name).write_bytes(b"x")
+    config = copy.deepcopy(CONFIG)
+    config["outputs"][0]["announcements"] = {"buffer_path": str(tmp_path / "overlay-hdmi2.bgra")}
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), patch.object(app, "MPV_LOG_FILE", str(tmp_path / "mpv.log")):
+        primary = app.MediaPlayer(config=config)
+        extra = app.create_outputs(primary)
+        yield primary, extra, video_dir
+
+
+def test_outputs_get_own_socket_options_and_schedule(outputs):
+    primary, extra, video_dir = outputs
+    assert list(extra) == ["hdmi2"]
+    second = extra["hdmi2"]["player"]
+    assert second.config is primary.config and second.output["name"] == "hdmi2"
+    assert (primary.name, primary.ipc_socket) == ("main", app.MPV_SOCKET)
+    assert second.ipc_socket == app.MPV_SOCKET + "-hdmi2" and second.ipc is not primary.ipc
+    assert second.lock is not primary.lock
+    assert second.mpv_options() == CONFIG["mpv_options"] + CONFIG["outputs"][0]["mpv_options"]
+    assert primary.mpv_options() == CONFIG["mpv_options"]
+    assert second.playlist_file_name("reklam") == "hdmi2-reklam"
+    assert extra["hdmi2"]["announcements"].buffer.path.endswith("overlay-hdmi2.bgra")
+    assert app.default_overlay_path("hdmi2") != app.default_overlay_path()
+
+    second._scheduler = MagicMock()
+    second.add_schedule_jobs()
+    jobs = {c.kwargs["id"]: c.kwargs for c in second._scheduler.add_job.call_args_list}
+    assert jobs["schedule-0-start"]["hour"] == 10 and len(jobs) == 2
+
+
+def test_source_switch_on_one_output_does_not_block_the_other(outputs):
+    primary, extra, video_dir = outputs
+    second = extra["hdmi2"]["player"]
+    spawned = []
+
+    def spawn(cmd, **kwargs):
+        spawned.append(FakeProcess(cmd))
+        return spawned[-1]
+
+    result = {}
+    with patch("shutil.which", return_value="/usr/bin/mpv"), patch("subprocess.Popen", spawn), \
+        patch("time.sleep"), patch.object(app, "library"):
+        # Ana çıkış kaynak değiştirirken kilidini tutuyor
+        with primary.lock:
+            worker = threading.Thread(target=lambda: result.update(ok=second.play_video(["b.mp4"])))
+            worker.start()
+            worker.join(timeout=2)
+            assert not worker.is_alive()
+    assert result["ok"][0] is True
+    cmd = spawned[0].cmd
+    assert f"--input-ipc-server={second.ipc_socket}" in cmd and "--drm-connector=HDMI-A-2" in cmd
+    assert second.get_status()["output"] == "hdmi2"
+    assert primary.current_process is None
+
+
+def test_endpoints_take_output_selector(outputs, monkeypatch):
+    primary, extra, video_dir = outputs
+    monkeypatch.setattr(app, "extra_outputs", extra)
+    second = extra["hdmi2"]["player"]
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        client = app.app.test_client()
+        with patch.object(second, "play_camera", return_value=(True, "ok")) as play, \
+            patch.object(app.player, "play_camera") as main_play:
+            res = client.post("/play_camera", json={"name": "Kapı", "output": "hdmi2"}).json
+        assert res["success"] and res["status"]["output"] == "hdmi2"
+        play.assert_called_once_with("Kapı")
+        main_play.assert_not_called()
+
+        assert client.post("/stop", json={"output": "hdmi3"}).json == {
+            "success": False,
+            "message": "Çıkış bulunamadı",
+        }
+        assert client.get("/status?output=hdmi2").json["output"] == "hdmi2"
+        queued = client.post("/announce", json={"message": "İkinci ekran", "output": "hdmi2"}).json
+        assert queued["success"]
+        listed = client.get("/announcements?output=hdmi2").json["announcements"]
+        assert [i["text"] for i in listed] == ["İkinci ekran"]
+        names = [o["output"] for o in client.get("/outputs").json["outputs"]]
+        assert names == [app.player.name, "hdmi2"]
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
+
+
+def test_output_default_log_and_synced_schedule(outputs, monkeypatch, tmp_path):
+    primary, extra, video_dir = outputs
+    second = extra["hdmi2"]["player"]
+    assert primary.mpv_log_file == app.MPV_LOG_FILE
+    assert second.mpv_log_file == str(tmp_path / "mpv-hdmi2.log")
+
+    # Başka ekranın mpv hataları bu çıkışın hata mesajına karışmaz
+    (tmp_path / "mpv.log").write_text("ana ekran hatası\n")
+    (tmp_path / "mpv-hdmi2.log").write_text("hdmi2 hatası\n")
+
+    def crash(cmd, **kwargs):
+        process = FakeProcess(cmd)
+        process.returncode = 1
+        return process
+
+    with patch("shutil.which", return_value="/usr/bin/mpv"), patch("subprocess.Popen", crash), \
+        patch("time.sleep"), patch.object(app, "library"):
+        success, message = second.play_video(["b.mp4"])
+    assert success is False and "hdmi2 hatası" in message and "ana ekran" not in message
+
+    # Arayüzden kaydedilen "videos/..." değeri dosya adına indirgenir
+    second.output["default_video"] = "videos/b.mp4"
+    state = extra["hdmi2"]["state"]
+    with patch.object(second, "play_video", return_value=(True, "ok")) as play, \
+        patch.object(state, "resume", return_value=False), patch.object(state, "start"), \
+        patch.object(second, "start_scheduler"):
+        app.start_output(extra["hdmi2"])
+    play.assert_called_once_with(["b.mp4"])
+
+    monkeypatch.setattr(app, "player", primary)
+    monkeypatch.setattr(app, "extra_outputs", extra)
+    with patch.object(primary, "save_config"), patch.object(primary, "reload_schedule") as main_reload, \
+        patch.object(second, "reload_schedule") as second_reload:
+        assert app.apply_synced_config({"schedule": []}, ["schedule"]) == ["schedule"]
+    main_reload.assert_called_once_with()
+    second_reload.assert_called_once_with()
@@ -0,0 +1,208 @@
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+class FakeProcess:
+    def __init__(self, cmd=None):
+        self.cmd = cmd
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class FakeIPC:
+    def __init__(self):
+        self.props = {}
+        self.calls = 0
+
+    def add_listener(self, callback):
+        pass
+
+    def observe(self, name, observe_id):
+        pass
+
+    def get_property(self, name, default=None):
+        self.calls += 1
+        return self.props.get(name, default)
+
+
+class FakePlayer:
+    def __init__(self):
+        self.ipc = FakeIPC()
+        self.current_process = FakeProcess()
+        self.current_source = "video"
+        self.current_playlist = None
+        self.current_camera = None
+        self.camera_fallback = False
+        self.automation_paused = False
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    video_dir = tmp_path / "videos"
+    image_dir = tmp_path / "images"
+    video_dir.mkdir()
+    image_dir.mkdir()
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        (video_dir / name).write_bytes(b"x")
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), patch.object(app, "IMAGE_DIR", str(image_dir)):
+        yield tmp_path, video_dir
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_snapshot_written_on_change_and_heartbeat_only(dirs):
+    tmp_path, video_dir = dirs
+    player = FakePlayer()
+    player.ipc.props = {
+        "playlist": [{"filename": str(video_dir / n)} for n in ("b.mp4", "a.mp4")],
+        "path": str(video_dir / "a.mp4"),
+        "time-pos": 12.34,
+    }
+    clock = Clock(1000.0)
+    state_file = tmp_path / "state.json"
+    state = app.PlaybackState(player, None, str(state_file), clock=clock)
+    assert state.save() is True
+    saved = json.loads(state_file.read_text())
+    assert saved == {
+        "source": "video",
+        "automation_paused": False,
+        "items": ["b.mp4", "a.mp4"],
+        "path": str(video_dir / "a.mp4"),
+        "anchor": 987.7,
+        "saved": 1000.0,
+    }
+
+    # Oynatma sürdükçe çapa sabit kalır; dosya her örnekte yazılmaz
+    calls = player.ipc.calls
+    for _ in range(4):
+        clock.now += 1
+        player.ipc.props["time-pos"] += 1
+        assert state.save() is False
+    assert player.ipc.calls == calls + 8
+
+    # Konum heartbeat aralığında tazelenir; çökmede en fazla bu kadar geride kalınır
+    clock.now += 1
+    player.ipc.props["time-pos"] += 1
+    assert state.save() is True
+    assert app.PlaybackState.position(json.loads(state_file.read_text())) == 17.3
+    assert not os.path.exists(str(tmp_path / "state.json.tmp"))
+
+    # Öğe değişimi ve duraklatma/atlama hemen yazılır
+    player.ipc.props.update(path=str(video_dir / "b.mp4"), **{"time-pos": 0.0})
+    assert state.save() is True
+    clock.now += 10
+    assert state.save() is True
+    assert state.save() is False
+    assert state.save(force=True) is True
+
+    # Açılış görseli veya ölü süreç mevcut kaydı ezmez
+    player.current_source = "splash"
+    assert state.save(force=True) is False
+    player.current_source = "video"
+    player.current_process.returncode = 1
+    assert state.save(force=True) is False
+    assert json.loads(state_file.read_text())["path"] == str(video_dir / "b.mp4")
+
+
+def test_resume_seeks_saved_item_once(dirs):
+    tmp_path, video_dir = dirs
+    (tmp_path / "config.json").write_text("{}")
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({
+        "source": "video",
+        "automation_paused": False,
+        "items": ["b.mp4", "silindi.mp4", "a.mp4"],
+        "path": str(video_dir / "a.mp4"),
+        "anchor": 957.5,
+        "saved": 1000.0,
+    }))
+    spawned = []
+
+    def spawn(cmd, **kwargs):
+        spawned.append(FakeProcess(cmd))
+        return spawned[-1]
+
+    with patch.object(app, "CONFIG_FILE", str(tmp_path / "config.json")):
+        player = app.MediaPlayer()
+    state = app.PlaybackState(player, None, str(state_file))
+    a, b = str(video_dir / "a.mp4"), str(video_dir / "b.mp4")
+    with patch("shutil.which", return_value="/usr/bin/mpv"), patch("subprocess.Popen", spawn), \
+        patch("time.sleep"), patch.object(app, "library"), \
+        patch.object(player.ipc, "wait_ready", return_value=True), \
+        patch.object(player.ipc, "get_property", lambda name, default=None: a if name == "path" else default), \
+        patch.object(player.ipc, "command") as command:
+        assert state.resume() is True
+    cmd = spawned[0].cmd
+    # Konum tek seferlik atlamayla verilir; --start döngünün her turuna uygulanırdı
+    assert cmd[-2:] == [b, a]
+    assert "--playlist-start=1" in cmd
+    assert not [arg for arg in cmd if arg.startswith("--start")]
+    command.assert_called_once_with("seek", 42.5, "absolute")
+    assert player.automation_paused is False and player.resume_point is None
+
+
+def test_resume_playlist_seeks_over_ipc(dirs):
+    tmp_path, video_dir = dirs
+    (tmp_path / "config.json").write_text("{}")
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({
+        "source": "playlist",
+        "playlist": "p",
+        "path": str(video_dir / "b.mp4"),
+        "anchor": 90.0,
+        "saved": 100.0,
+    }))
+    with patch.object(app, "CONFIG_FILE", str(tmp_path / "config.json")), \
+        patch.object(app, "PLAYLIST_DIR", str(tmp_path / "playlists")):
+        player = app.MediaPlayer()
+        player.config["playlists"] = {
+            "p": {"items": [{"type": "video", "file": "a.mp4"}, {"type": "video", "file": "b.mp4"}]}
+        }
+        props = {"path": str(video_dir / "b.mp4"), "playlist-pos": 1}
+        spawned = []
+        with patch("shutil.which", return_value="/usr/bin/mpv"), \
+            patch("subprocess.Popen", lambda cmd, **kw: spawned.append(cmd) or FakeProcess(cmd)), \
+            patch("time.sleep"), patch.object(app, "library"), \
+            patch.object(player.ipc, "wait_ready", return_value=True), \
+            patch.object(player.ipc, "get_property", lambda name, default=None: props.get(name, default)), \
+            patch.object(player.ipc, "command") as command:
+            assert app.PlaybackState(player, None, str(state_file)).resume() is True
+    assert "--playlist-start=1" in spawned[0]
+    assert not any(arg.startswith("--start") for arg in spawned[0])
+    command.assert_called_once_with("seek", 10.0, "absolute")
+
+
+def test_invalid_saved_source_falls_back_to_default(dirs):
+    tmp_path, video_dir = dirs
+    state_file = tmp_path / "state.json"
+    player = FakePlayer()
+    player.config = {"cameras": [{"name": "Kapı", "url": "rtsp://x"}], "playlists": {}}
+    state = app.PlaybackState(player, None, str(state_file))
+    assert state.resume() is False
+
+    for saved in (
+        {"source": "camera", "camera": "Silinen"},
+        {"source": "playlist", "playlist": "yok"},
+        {"source": "video", "items": ["silindi.mp4"]},
+        {"source": None},
+    ):
+        state_file.write_text(json.dumps(saved))
+        assert state.resume() is False
+
+    state_file.write_text("{bozuk")
+    assert state.resume() is False
@@ -2,6 +2,8 @@ import os
 import sys
 from unittest.mock import patch
 
+import pytest
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import app
 
@@ -10,6 +12,12 @@ patcher = patch.object(app.MediaPlayer, "start_scheduler", lambda self: None)
 patcher.start()
 
 
+@pytest.fixture(autouse=True)
+def isolated_library(tmp_path, monkeypatch):
+    # Oynatma kayıtları gerçek cache/library_index.json dosyasına yazılmasın
+    monkeypatch.setattr(app, "library", app.MediaLibrary(str(tmp_path / "library_index.json")))
+
+
 def test_play_video_mpv_missing(tmp_path):
     config = tmp_path / "config.json"
     config.write_text("{}")
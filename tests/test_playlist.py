@@ -0,0 +1,202 @@
+import os
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+@pytest.fixture(autouse=True)
+def isolated_library(tmp_path, monkeypatch):
+    # Oynatma kayıtları gerçek cache/library_index.json dosyasına yazılmasın
+    monkeypatch.setattr(app, "library", app.MediaLibrary(str(tmp_path / "library_index.json")))
+
+
+def test_weighted_order_interleaves_by_weight():
+    items = [{"file": "ad.png", "weight": 1}, {"file": "promo.mp4", "weight": 3}]
+    sequence = [i["file"] for i in app.order_playlist_items(items, "weighted")]
+    assert sequence.count("promo.mp4") == 3
+    assert sequence.count("ad.png") == 1
+    assert sequence[0] == "promo.mp4" and sequence[-1] == "promo.mp4"
+
+
+def test_compile_playlist_mixes_media(tmp_path):
+    video_dir = tmp_path / "videos"
+    image_dir = tmp_path / "images"
+    video_dir.mkdir()
+    image_dir.mkdir()
+    (video_dir / "a.mp4").write_bytes(b"v")
+    (image_dir / "ad.png").write_bytes(b"i")
+    playlist = {
+        "items": [
+            {"type": "video", "file": "a.mp4"},
+            {"type": "image", "file": "ad.png", "duration": 8},
+            {"type": "image", "file": "missing.png"},
+            {"type": "camera", "name": "Kapı", "duration": 30},
+        ],
+        "order": "sequential",
+    }
+    cameras = [{"name": "Kapı", "url": "rtsp://cam/1"}]
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), \
+        patch.object(app, "IMAGE_DIR", str(image_dir)), \
+        patch.object(app, "PLAYLIST_DIR", str(tmp_path / "playlists")):
+        entries = app.compile_playlist(playlist, cameras, random.Random(1))
+        path = app.write_playlist_file("karma", entries)
+
+    assert [e["type"] for e in entries] == ["video", "image", "camera"]
+    assert entries[1]["duration"] == 8
+    content = open(path, encoding="utf-8").read().splitlines()
+    assert content[0] == "#EXTM3U"
+    assert "#EXTINF:8,ad.png" in content
+    assert "rtsp://cam/1" in content
+
+
+def test_validate_playlist_rejects_bad_items():
+    _, error = app.validate_playlist({"items": [{"type": "audio", "file": "x"}]})
+    assert error
+    playlist, error = app.validate_playlist(
+        {"items": [{"type": "image", "file": "a.png", "duration": "5"}], "order": "shuffle"}
+    )
+    assert error is None
+    assert playlist["items"][0]["duration"] == 5.0
+
+
+def test_play_playlist_loads_single_file(tmp_path):
+    cfg = tmp_path / "config.json"
+    cfg.write_text("{}")
+    (tmp_path / "a.mp4").write_bytes(b"v")
+    with patch.object(app, "CONFIG_FILE", str(cfg)), \
+        patch.object(app, "VIDEO_DIR", str(tmp_path)), \
+        patch.object(app, "PLAYLIST_DIR", str(tmp_path / "playlists")):
+        player = app.MediaPlayer()
+        player.config["playlists"] = {"p": {"items": [{"type": "video", "file": "a.mp4"}]}}
+
+        class DummyProc:
+            def poll(self):
+                return None
+
+        with patch("shutil.which", return_value="/usr/bin/mpv"), \
+            patch("subprocess.Popen", return_value=DummyProc()) as popen_mock, \
+            patch("time.sleep"), \
+            patch.object(player.ipc, "wait_ready", return_value=True):
+            success, _ = player.play_playlist("p")
+
+    assert success
+    cmd = popen_mock.call_args[0][0]
+    assert any(arg.startswith("--playlist=") for arg in cmd)
+    assert os.path.join(str(tmp_path), "a.mp4") not in cmd
+    assert player.current_source == "playlist"
+
+
+def test_timed_item_advances_playlist(tmp_path):
+    cfg = tmp_path / "config.json"
+    cfg.write_text("{}")
+    with patch.object(app, "CONFIG_FILE", str(cfg)):
+        player = app.MediaPlayer()
+    player.current_source = "playlist"
+    player.playlist_entries = [
+        {"type": "video", "path": "a.mp4", "duration": None},
+        {"type": "image", "path": "x.png", "duration": 0.01},
+    ]
+    player._playlist_ids = {7: player.playlist_entries[0], 8: player.playlist_entries[1]}
+
+    with patch.object(player.ipc, "command") as command:
+        player._on_playlist_event({"event": "start-file", "playlist_entry_id": 8})
+        player._on_playlist_event({"event": "file-loaded"})
+        # Geç gelen konum değişikliği zamanlayıcıyı iptal etmez
+        player._on_playlist_event({"event": "property-change", "name": "playlist-pos", "data": 1})
+        player._item_timer.join(1)
+    command.assert_called_with("playlist-next", "force")
+
+
+class FakeIPC:
+    def __init__(self, props):
+        self.props = props
+        self.commands = []
+
+    def add_listener(self, callback):
+        pass
+
+    def observe(self, name, observe_id):
+        pass
+
+    def wait_ready(self, timeout=5.0):
+        return True
+
+    def get_property(self, name, default=None):
+        return self.props.get(name, default)
+
+    def command(self, *args, timeout=None):
+        self.commands.append(args)
+
+    def close(self):
+        pass
+
+
+def test_first_timed_item_starts_without_events(tmp_path):
+    cfg = tmp_path / "config.json"
+    cfg.write_text("{}")
+    (tmp_path / "a.png").write_bytes(b"i")
+    (tmp_path / "b.mp4").write_bytes(b"v")
+    with patch.object(app, "CONFIG_FILE", str(cfg)), \
+        patch.object(app, "VIDEO_DIR", str(tmp_path)), \
+        patch.object(app, "IMAGE_DIR", str(tmp_path)), \
+        patch.object(app, "PLAYLIST_DIR", str(tmp_path / "playlists")):
+        player = app.MediaPlayer()
+        player.config["playlists"] = {
+            "p": {
+                "items": [
+                    {"type": "image", "file": "a.png", "duration": 0.05},
+                    {"type": "video", "file": "b.mp4"},
+                ]
+            }
+        }
+        # mpv ilk öğeyi IPC bağlantısından önce açtı; olay hiç gelmeyecek
+        player.ipc = FakeIPC({"playlist": [{"id": 1}, {"id": 2}], "playlist-pos": 0})
+
+        class DummyProc:
+            def poll(self):
+                return None
+
+        with patch("shutil.which", return_value="/usr/bin/mpv"), \
+            patch("subprocess.Popen", return_value=DummyProc()), \
+            patch("time.sleep"), patch.object(app, "library"):
+            assert player.play_playlist("p")[0]
+        player._item_timer.join(1)
+    assert player.ipc.commands == [("playlist-next", "force")]
+    assert player._entry_for_id(2)["path"].endswith("b.mp4")
+
+
+def test_shuffled_loop_reshuffles_each_pass(tmp_path):
+    cfg = tmp_path / "config.json"
+    cfg.write_text("{}")
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        (tmp_path / name).write_bytes(b"v")
+    with patch.object(app, "CONFIG_FILE", str(cfg)), \
+        patch.object(app, "VIDEO_DIR", str(tmp_path)), \
+        patch.object(app, "PLAYLIST_DIR", str(tmp_path / "playlists")):
+        player = app.MediaPlayer()
+        playlist = {"order": "shuffle", "items": [{"type": "video", "file": n} for n in ("a.mp4", "b.mp4", "c.mp4")]}
+        player.current_source = "playlist"
+        player.current_playlist = "p"
+        player.current_process = object()
+        player._shuffle_playlist = playlist
+        player.playlist_entries = app.compile_playlist(playlist, [])
+        old = player.playlist_entries
+        player._playlist_ids = {i + 1: e for i, e in enumerate(old)}
+        # Silinmeyen çalan öğe (3) + yeni tur (5, 6, 7)
+        player.ipc = FakeIPC({"playlist": [{"id": 3}, {"id": 5}, {"id": 6}, {"id": 7}]})
+
+        player._on_playlist_event({"event": "start-file", "playlist_entry_id": 1})
+        assert player.ipc.commands == []
+        with patch("threading.Thread.start", lambda t: t.run()):
+            player._on_playlist_event({"event": "start-file", "playlist_entry_id": 3})
+
+    assert player.ipc.commands[0] == ("playlist-clear",)
+    assert player.ipc.commands[1][0] == "loadlist" and player.ipc.commands[1][2] == "append"
+    assert player.playlist_entries is not old
+    assert player._entry_for_id(5) is player.playlist_entries[0]
+    assert player._entry_for_id(3) is old[2]
@@ -0,0 +1,163 @@
+import os
+import random
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeIPC:
+    def __init__(self):
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def observe(self, name, observe_id):
+        pass
+
+    def emit(self, event, **fields):
+        for callback in self.listeners:
+            callback(dict(fields, event=event))
+
+    def path(self, path):
+        self.emit("property-change", name="path", id=app.TELEMETRY_OBSERVE_ID, data=path)
+
+
+class FakePlayer:
+    def __init__(self):
+        self.ipc = FakeIPC()
+        self.current_source = "playlist"
+        self.current_playlist = "reklam"
+
+
+@pytest.fixture
+def env(tmp_path):
+    video_dir = tmp_path / "videos"
+    image_dir = tmp_path / "images"
+    video_dir.mkdir()
+    image_dir.mkdir()
+    player = FakePlayer()
+    clock = Clock()
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), patch.object(app, "IMAGE_DIR", str(image_dir)):
+        log = app.ProofOfPlayLog(player, None, str(tmp_path / "pop.db"), clock=clock)
+        yield log, player.ipc, clock, str(video_dir), str(image_dir)
+
+
+def test_plays_recorded_from_mpv_events(env):
+    log, ipc, clock, video_dir, image_dir = env
+    spot = os.path.join(video_dir, "spot.mp4")
+    ipc.path(spot)
+    ipc.emit("file-loaded")
+    clock.now += 15
+    ipc.emit("end-file", reason="eof")
+    # Tek dosyalık döngü: yol bildirimi gelmez
+    ipc.emit("file-loaded")
+    clock.now += 15
+    ipc.emit("end-file", reason="eof")
+    # file-loaded yeni yoldan önce gelirse kayıt düzeltilir
+    ipc.emit("file-loaded")
+    ipc.path(os.path.join(image_dir, "afis.png"))
+    clock.now += 5
+    ipc.emit("end-file", reason="stop")
+    ipc.path("rtsp://10.0.0.5/stream")
+    clock.now += 30
+    ipc.emit("ipc-disconnected")
+
+    assert not os.path.exists(log.db_path)
+    assert log.flush() == 3
+    plays = log.plays()
+    assert [(p["kind"], p["name"], p["duration"], p["reason"]) for p in plays] == [
+        ("image", "afis.png", 5.0, "stop"),
+        ("video", "spot.mp4", 15.0, "eof"),
+        ("video", "spot.mp4", 15.0, "eof"),
+    ]
+    assert plays[0]["playlist"] == "reklam"
+
+    summary = log.summary()
+    assert summary[0] == {
+        "kind": "video",
+        "name": "spot.mp4",
+        "plays": 2,
+        "completed": 2,
+        "airtime": 30.0,
+        "first_started": plays[2]["started"],
+        "last_started": plays[1]["started"],
+    }
+
+
+def test_summary_matches_raw_rows_across_rollups(env):
+    log, ipc, clock, video_dir, image_dir = env
+    rng = random.Random(7)
+    base = 1_700_000_000.0
+    rows = []
+    for _ in range(400):
+        started = base + rng.uniform(0, 3 * 86400)
+        name = rng.choice(["a.mp4", "b.mp4", "c.mp4"])
+        duration = rng.choice([10.0, 15.0, 30.0])
+        reason = rng.choice(["eof", "stop"])
+        rows.append(("video", name, "video", None, started, started + duration, duration, reason))
+    log.pending.extend(rows)
+    clock.now = base + 4 * 86400
+
+    for _ in range(20):
+        start = base + rng.uniform(-3600, 2 * 86400)
+        end = start + rng.uniform(60, 86400 * 1.5)
+        expected = {}
+        for _, name, _, _, started, _, duration, reason in rows:
+            if start <= started < end:
+                plays, completed, airtime = expected.get(name, (0, 0, 0.0))
+                expected[name] = (plays + 1, completed + (reason == "eof"), airtime + duration)
+        got = {i["name"]: (i["plays"], i["completed"], i["airtime"]) for i in log.summary(start, end)}
+        assert got == {k: (p, c, round(a, 3)) for k, (p, c, a) in expected.items()}
+
+    per_day = {}
+    for r in rows:
+        if r[1] == "a.mp4" and r[4] >= base + 1800:
+            day = datetime.fromtimestamp(r[4]).strftime("%Y-%m-%d")
+            per_day[day] = per_day.get(day, 0) + 1
+    days = log.summary(start=base + 1800, bucket="day", name="a.mp4")
+    assert {i["bucket"]: i["plays"] for i in days} == per_day
+    hours = log.summary(start=base + 1800, bucket="hour", name="a.mp4")
+    assert sum(i["plays"] for i in hours) == sum(per_day.values())
+
+
+def test_prune_keeps_rollups(env):
+    log, ipc, clock, video_dir, image_dir = env
+    old = clock.now - 200 * 86400
+    log.pending.append(("video", "eski.mp4", "video", None, old, old + 10, 10.0, "eof"))
+    log.flush()
+    assert log.prune() == 1
+    assert log.plays(start=0) == []
+    assert [(i["name"], i["plays"]) for i in log.summary(start=0)] == [("eski.mp4", 1)]
+
+
+def test_proof_of_play_endpoints(env, monkeypatch):
+    log, ipc, clock, video_dir, image_dir = env
+    ipc.path(os.path.join(video_dir, "spot.mp4"))
+    clock.now += 20
+    ipc.emit("end-file", reason="eof")
+    monkeypatch.setattr(app, "proof_of_play", log)
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        client = app.app.test_client()
+        res = client.get(f"/proof_of_play?start={int(clock.now) - 3600}&bucket=hour").json
+        assert res["success"] and res["items"][0]["airtime"] == 20.0
+        assert client.get("/proof_of_play?bucket=week").json["success"] is False
+        assert client.get("/proof_of_play?start=dün").json["success"] is False
+        plays = client.get("/proof_of_play/plays?name=spot.mp4").json["plays"]
+        assert [p["reason"] for p in plays] == ["eof"]
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
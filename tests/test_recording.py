@@ -0,0 +1,149 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+NOW = 1_700_000_000.0
+SETTINGS = dict(app.RECORDING_DEFAULTS, segment_seconds=10, max_age_minutes=2, max_size_mb=1)
+
+
+class FakeProcess:
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.returncode = None
+        self.exited = threading.Event()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self.exited.wait(timeout)
+        return self.returncode
+
+    def terminate(self):
+        self.exit(0)
+
+    kill = terminate
+
+    def exit(self, code):
+        self.returncode = code
+        self.exited.set()
+
+
+class FakeSpawn:
+    def __init__(self):
+        self.processes = []
+
+    def __call__(self, cmd, **kwargs):
+        self.processes.append(FakeProcess(cmd))
+        return self.processes[-1]
+
+
+def write_segment(directory, start, size=1000):
+    name = datetime.fromtimestamp(start).strftime(app.RECORDING_NAME_FORMAT) + app.RECORDING_SUFFIX
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"\x47" * size)
+    return path
+
+
+def test_recording_command_copies_stream_without_reencode(tmp_path):
+    cmd = app.recording_command("rtsp://10.0.0.5/stream1", str(tmp_path), SETTINGS)
+    assert cmd[0] == "ffmpeg"
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    assert cmd[cmd.index("-rtsp_transport") + 1] == "tcp"
+    assert cmd[cmd.index("-segment_time") + 1] == "10"
+    assert cmd[cmd.index("-map") + 1] == "0:v:0" and cmd.count("-map") == 1
+    assert not any(arg.startswith(("-vf", "-c:v", "-vcodec")) for arg in cmd)
+    assert cmd[-1].endswith(app.RECORDING_NAME_FORMAT + app.RECORDING_SUFFIX)
+
+
+def test_ring_is_bounded_by_age_and_size(tmp_path):
+    directory = str(tmp_path)
+    recorder = app.CameraRecorder("Kapı", "rtsp://x", SETTINGS, directory, FakeSpawn(), clock=lambda: NOW)
+    # 4 dakikalık kayıt, 10 sn'lik parçalar; en yenisi hâlâ yazılıyor
+    for i in range(24):
+        write_segment(directory, NOW - 240 + i * 10)
+    kept = recorder.refresh()
+    assert kept[0]["start"] == NOW - 130  # bitişi 2 dk sınırının içinde kalan ilk parça
+    assert len(os.listdir(directory)) == len(kept) == 13
+
+    recorder.settings = dict(SETTINGS, max_size_mb=5000 / (1024 * 1024))
+    kept = recorder.refresh()
+    assert [s["start"] for s in kept] == [NOW - 50 + i * 10 for i in range(5)]
+
+    # Boyut sınırı en yeni parçayı asla silmez
+    recorder.settings = dict(SETTINGS, max_size_mb=0)
+    assert len(recorder.refresh()) == 1
+
+
+def test_replay_selects_last_minutes_and_returns_to_live(tmp_path):
+    directory = str(tmp_path / "kayit")
+    os.makedirs(directory)
+    recorder = app.CameraRecorder("Kapı", "rtsp://x", SETTINGS, directory, FakeSpawn(), clock=lambda: NOW)
+    for i in range(12):
+        write_segment(directory, NOW - 115 + i * 10)
+    recorder.refresh()
+    segments = recorder.replay_segments(0.5)
+    assert [s["start"] for s in segments] == [NOW - 35, NOW - 25, NOW - 15, NOW - 5]
+
+    cfg = tmp_path / "config.json"
+    cfg.write_text("{}")
+    spawn = FakeSpawn()
+    with patch.object(app, "CONFIG_FILE", str(cfg)), patch.object(app, "PLAYLIST_DIR", str(tmp_path / "pl")):
+        player = app.MediaPlayer()
+        with patch("shutil.which", return_value="/usr/bin/mpv"), patch("subprocess.Popen", spawn), \
+            patch("time.sleep"), patch.object(player, "play_camera") as live:
+            success, _ = player.play_replay("Kapı", segments)
+            assert success and player.current_source == "tekrar"
+            playlist = next(a for a in spawn.processes[0].cmd if a.startswith("--playlist="))
+            lines = open(playlist.split("=", 1)[1]).read().splitlines()
+            assert [l for l in lines if not l.startswith("#")] == [s["path"] for s in segments]
+
+            spawn.processes[0].exit(0)
+            deadline = time.monotonic() + 2
+            while not live.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+            live.assert_called_once_with("Kapı")
+
+
+def test_manager_restarts_crashed_recorder_and_follows_config(tmp_path):
+    class Player:
+        config = {"cameras": [{"name": "Kapı", "url": "rtsp://a"}, {"name": "Depo", "url": "rtsp://b"}]}
+
+    now = [NOW]
+    spawn = FakeSpawn()
+    manager = app.RecordingManager(
+        Player(), {"cameras": ["Kapı"], "restart_delay": 5}, str(tmp_path), spawn, clock=lambda: now[0]
+    )
+    manager.check()
+    assert list(manager.recorders) == ["Kapı"] and len(spawn.processes) == 1
+
+    spawn.processes[0].exit(1)
+    manager.check()
+    assert len(spawn.processes) == 1  # yeniden başlatma gecikmesi
+    now[0] += 5
+    manager.check()
+    assert len(spawn.processes) == 2 and manager.recorders["Kapı"].restarts == 1
+
+    Player.config["cameras"][0]["url"] = "rtsp://yeni"
+    manager.check()
+    assert spawn.processes[1].returncode == 0
+    assert "rtsp://yeni" in spawn.processes[2].cmd
+
+
+def test_replay_endpoint_requires_recording(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "camera_recorder", app.RecordingManager(app.player, {}, str(tmp_path)))
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        res = app.app.test_client().post("/replay", json={"camera": "Yok", "minutes": 1}).json
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
+    assert res["success"] is False
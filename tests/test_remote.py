@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask, jsonify, request, send_from_directory
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """Geri döngü adresinde çalışan merkezi içerik sunucusu"""
+    root = tmp_path / "origin"
+    root.mkdir()
+    server_app = Flask("origin")
+    control = {"truncate": None, "requests": []}
+
+    @server_app.route("/manifest.json")
+    def manifest():
+        files = [{"url": f"media/{name}"} for name in sorted(os.listdir(root))]
+        response = jsonify({"files": files})
+        response.add_etag()
+        return response.make_conditional(request)
+
+    @server_app.route("/media/<name>")
+    def media(name):
+        control["requests"].append((name, request.headers.get("Range"), request.headers.get("If-None-Match")))
+        response = send_from_directory(root, name, max_age=0)
+        limit = control["truncate"]
+        if limit is not None and response.status_code == 200:
+            body = b"".join(response.response)
+            response.direct_passthrough = False
+
+            def cut():
+                yield body[:limit]
+                raise ConnectionError("bağlantı koptu")
+
+            response.response = cut()
+        return response
+
+    server = make_server("127.0.0.1", 0, server_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", root, control
+    server.shutdown()
+
+
+def make_fetcher(tmp_path, sources, **kwargs):
+    dirs = {"video": tmp_path / "videos", "image": tmp_path / "images"}
+    for d in dirs.values():
+        d.mkdir(exist_ok=True)
+    fetcher = app.RemoteFetcher(
+        sources,
+        str(tmp_path / "remote_state.json"),
+        target_dirs={k: str(v) for k, v in dirs.items()},
+        timeout=5,
+        **kwargs,
+    )
+    return fetcher, dirs["video"]
+
+
+def test_manifest_download_and_conditional_revalidation(origin, tmp_path):
+    url, root, control = origin
+    (root / "promo.mp4").write_bytes(os.urandom(200 * 1024))
+    (root / "afis.png").write_bytes(os.urandom(1024))
+    sources = [{"manifest": f"{url}/manifest.json"}]
+
+    fetcher, video_dir = make_fetcher(tmp_path, sources)
+    result = fetcher.run()
+    assert sorted(result["files"]) == ["afis.png", "promo.mp4"]
+    assert (video_dir / "promo.mp4").read_bytes() == (root / "promo.mp4").read_bytes()
+    assert (tmp_path / "images" / "afis.png").exists()
+
+    # Yeni örnek durum dosyasından doğrulayıcıları okur: her şey 304
+    fetcher, _ = make_fetcher(tmp_path, sources)
+    again = fetcher.run()
+    assert again["files"] == [] and sorted(again["unchanged"]) == ["afis.png", "promo.mp4"]
+    assert again["fetched_bytes"] == 0
+    assert all(inm for _, _, inm in control["requests"][-2:])
+
+    new_content = os.urandom(150 * 1024)
+    (root / "promo.mp4").write_bytes(new_content)
+    os.utime(root / "promo.mp4", (1_900_000_000, 1_900_000_000))
+    third = fetcher.run()
+    assert third["files"] == ["promo.mp4"]
+    assert (video_dir / "promo.mp4").read_bytes() == new_content
+
+
+def test_interrupted_download_resumes_with_range(origin, tmp_path):
+    url, root, control = origin
+    data = os.urandom(300 * 1024)
+    (root / "uzun.mp4").write_bytes(data)
+    sources = [f"{url}/media/uzun.mp4"]
+
+    control["truncate"] = 120 * 1024
+    fetcher, video_dir = make_fetcher(tmp_path, sources)
+    failed = fetcher.run()
+    assert "uzun.mp4" in failed["errors"]
+    assert not (video_dir / "uzun.mp4").exists()
+    part = video_dir / ("uzun.mp4" + app.REMOTE_PART_SUFFIX)
+    assert part.stat().st_size == 120 * 1024
+
+    control["truncate"] = None
+    fetcher, _ = make_fetcher(tmp_path, sources)
+    result = fetcher.run()
+    assert result["files"] == ["uzun.mp4"]
+    assert result["resumed_bytes"] == 120 * 1024
+    assert result["fetched_bytes"] == len(data) - 120 * 1024
+    assert control["requests"][-1][1] == f"bytes={120 * 1024}-"
+    assert (video_dir / "uzun.mp4").read_bytes() == data
+    assert not part.exists()
+
+
+def test_hash_mismatch_and_disk_preflight_keep_old_file(origin, tmp_path):
+    url, root, control = origin
+    (root / "promo.mp4").write_bytes(b"yeni" * 1000)
+    fetcher, video_dir = make_fetcher(
+        tmp_path, [{"url": f"{url}/media/promo.mp4", "hash": "0" * 64}]
+    )
+    (video_dir / "promo.mp4").write_bytes(b"eski")
+    result = fetcher.run()
+    assert "Özet doğrulanamadı" in result["errors"]["promo.mp4"]
+    assert (video_dir / "promo.mp4").read_bytes() == b"eski"
+
+    fetcher, _ = make_fetcher(
+        tmp_path, [f"{url}/media/promo.mp4"], preflight=lambda size: (False, "Yetersiz disk alanı")
+    )
+    assert fetcher.run()["errors"]["promo.mp4"] == "Yetersiz disk alanı"
+    assert (video_dir / "promo.mp4").read_bytes() == b"eski"
+
+
+def test_prefetch_job_runs_before_scheduled_slot():
+    assert app.shift_schedule(["tue", "thu"], 0, 10, 30) == (["mon", "wed"], 23, 40)
+    assert app.shift_schedule(["mon"], 18, 0, 30) == (["mon"], 17, 30)
+
+    player = app.MediaPlayer.__new__(app.MediaPlayer)
+    player.output = None
+    player.config = {
+        "remote_sources": {"enabled": True, "lead_minutes": 45},
+        "playlists": {"sabah": {"items": [{"type": "video", "file": "a.mp4"}, {"type": "camera"}]}},
+        "schedule": [
+            {"days": ["Monday"], "start": "08:15", "end": "09:00", "source": "playlist", "playlist": "sabah"},
+            {"days": ["Monday"], "start": "18:00", "end": "19:00", "source": "camera"},
+        ],
+    }
+    player._scheduler = MagicMock()
+    player.add_schedule_jobs()
+    prefetch = [c for c in player._scheduler.add_job.call_args_list if c.kwargs["id"].endswith("prefetch")]
+    assert len(prefetch) == 1
+    assert prefetch[0].kwargs["hour"] == 7 and prefetch[0].kwargs["minute"] == 30
+    assert app.rule_media(player.config["schedule"][0], player.config) == [("video", "a.mp4")]
+
+    with patch.object(app, "run_remote_fetch") as run, patch.object(app.player, "config", player.config):
+        app.prefetch_rule(player.config["schedule"][0])
+    run.assert_called_once_with(only=[("video", "a.mp4")])
@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+from flask import Response
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+def server_timing(response):
+    entries = {}
+    for item in response.headers["Server-Timing"].split(", "):
+        name, dur = item.split(";dur=")
+        entries[name] = float(dur)
+    return entries
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "request_timing", app.RequestTiming({"slow_ms": 10_000}))
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        yield app.app.test_client()
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
+
+
+def test_server_timing_reports_phases_and_logs_slow_requests(client, monkeypatch):
+    res = client.get("/outputs")
+    phases = server_timing(res)
+    assert list(phases)[0] == "auth" and list(phases)[-2:] == ["handler", "total"]
+    assert "json" in phases and phases["total"] >= phases["handler"]
+    assert not app.request_timing.slow
+
+    # Şifre doğrulaması oturum aşamasına yazılır
+    monkeypatch.setitem(app.app.config, "PASSWORD_HASH", app.generate_password_hash("gizli"))
+    app.request_timing.settings["slow_ms"] = 0
+    app.app.config["LOGIN_DISABLED"] = False
+    res = client.post("/login", data={"username": "yanlis", "password": "x"})
+    # Oturumsuz istemci süreleri göremez; kullanıcı adı doğruluğu sızmaz
+    assert "Server-Timing" not in res.headers
+    assert "Server-Timing" not in client.get("/outputs").headers
+    app.app.config["LOGIN_DISABLED"] = True
+    slow = client.get("/request_timings").json["slow_requests"]
+    assert [entry["path"] for entry in slow] == ["/login", "/outputs"]
+    assert slow[0]["status"] == 200 and set(slow[0]["phases"]) >= {"auth", "handler", "total"}
+
+
+def test_deliberate_waits_are_not_slow(client, monkeypatch):
+    psutil = pytest.importorskip("psutil")
+    app.request_timing.settings["slow_ms"] = 200
+    monkeypatch.setattr(psutil, "cpu_percent", lambda interval=None: time.sleep(0.3) or 5.0)
+    res = client.get("/system_info")
+    assert server_timing(res)["cpu"] >= 300
+    assert client.post("/profile", json={"seconds": 0.3}).json["success"]
+    assert not app.request_timing.slow
+
+
+def test_player_lock_wait_counted_only_inside_requests():
+    timing = app.RequestTiming()
+    lock = app.TimedLock()
+    holder_ready = threading.Event()
+
+    def hold():
+        with lock:
+            holder_ready.set()
+            time.sleep(0.1)
+
+    with app.app.test_request_context("/stop"):
+        app.g.pop("request_timing", None)
+        timing.begin()
+        timing.ready()
+        threading.Thread(target=hold).start()
+        holder_ready.wait()
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(app, "request_timing", timing)
+            with lock:
+                pass
+            mp.setitem(app.app.config, "LOGIN_DISABLED", True)
+            response = timing.finish(Response())
+    phases = server_timing(response)
+    assert phases["lock"] >= 50 and phases["handler"] >= phases["lock"]
+
+    # İstek dışındaki kilit kullanımı yok sayılır
+    with lock:
+        assert lock.locked()
+    assert not lock.locked()
+
+
+def spin(stop):
+    while not stop.is_set():
+        pass
+
+
+def test_profiler_aggregates_live_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=spin, args=(stop,), name="dondurucu")
+    worker.start()
+    profiler = app.SamplingProfiler({"max_profile_seconds": 0.2})
+    try:
+        stacks, ticks = profiler.sample(5, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+    report = profiler.report(stacks, ticks)
+    assert ticks >= 5 and report["threads"]["dondurucu"] == ticks
+    functions = {f["function"]: f for f in report["functions"]}
+    assert "test_request_timing.py:spin" in functions
+    assert functions["test_request_timing.py:spin"]["total"] == ticks
+    assert all(not s["stack"].endswith("sample") for s in report["stacks"])
+    lines = profiler.collapsed(stacks).splitlines()
+    assert any(line.startswith("dondurucu;") and ":spin:" in line for line in lines)
+
+    profiler.lock.acquire()
+    try:
+        with pytest.raises(RuntimeError):
+            profiler.sample(0.1)
+    finally:
+        profiler.lock.release()
+
+
+def test_profile_endpoint(client):
+    stop = threading.Event()
+    worker = threading.Thread(target=spin, args=(stop,), name="dondurucu")
+    worker.start()
+    try:
+        res = client.post("/profile", json={"seconds": 0.05, "interval": 0.005}).json
+        text = client.post("/profile", json={"seconds": 0.05, "format": "collapsed"})
+    finally:
+        stop.set()
+        worker.join()
+    assert res["success"] and res["ticks"] > 0 and res["threads"]["dondurucu"] == res["ticks"]
+    assert text.mimetype == "text/plain" and b"dondurucu;" in text.data
+    assert client.post("/profile", json={"seconds": "uzun"}).json["success"] is False
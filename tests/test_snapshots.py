@@ -0,0 +1,179 @@
+import base64
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask, Response, request
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 100
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowGrab:
+    """Kare çözmeyi taklit eder; eşzamanlı çekim sayısını ölçer"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    def __call__(self, url, width=640, timeout=5):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(url)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return JPEG + url.encode()
+
+
+def test_grid_costs_one_fetch_per_camera_per_interval():
+    clock = Clock()
+    grab = SlowGrab()
+    snaps = app.CameraSnapshots({"ttl": 10, "max_workers": 4}, rtsp_grab=grab, clock=clock)
+    cameras = [{"name": f"Kamera {i}", "url": f"rtsp://10.0.0.{i}/s"} for i in range(16)]
+
+    # Üç tarayıcı sekmesi aynı 16 kameralık ızgarayı aynı anda ister
+    with ThreadPoolExecutor(max_workers=48) as pool:
+        results = list(pool.map(snaps.get, cameras * 3))
+    assert len(grab.calls) == 16 and snaps.fetches == 16
+    assert grab.peak <= 4
+    assert all(data == JPEG + cam["url"].encode() for (data, error), cam in zip(results, cameras * 3))
+
+    clock.now += 9
+    snaps.get(cameras[0])
+    assert len(grab.calls) == 16
+    clock.now += 2
+    snaps.get(cameras[0])
+    assert len(grab.calls) == 17
+
+
+def test_onvif_snapshot_uri_resolved_once_with_rtsp_fallback():
+    clock = Clock()
+    grab = SlowGrab(delay=0)
+    uris, fetched = [], []
+
+    def onvif_uri(camera, timeout):
+        uris.append(camera["ip"])
+        if camera["ip"] == "10.0.0.9":
+            raise RuntimeError("ONVIF yok")
+        return f"http://{camera['ip']}/snap.jpg"
+
+    def http_fetch(url, username, password, timeout):
+        fetched.append((url, username))
+        if "10.0.0.2" in url:
+            raise RuntimeError("401")
+        return JPEG
+
+    snaps = app.CameraSnapshots(
+        {"ttl": 1}, onvif_uri=onvif_uri, http_fetch=http_fetch, rtsp_grab=grab, clock=clock
+    )
+    onvif = {"name": "A", "url": "rtsp://10.0.0.1/s", "ip": "10.0.0.1", "port": 80, "username": "admin"}
+    broken = {"name": "B", "url": "rtsp://10.0.0.2/s", "ip": "10.0.0.2", "port": 80}
+    legacy = {"name": "C", "url": "rtsp://10.0.0.9/s", "ip": "10.0.0.9", "port": 80}
+    for _ in range(2):
+        assert snaps.get(onvif) == (JPEG, None)
+        assert snaps.get(broken)[0].endswith(b"rtsp://10.0.0.2/s")
+        assert snaps.get(legacy)[0].endswith(b"rtsp://10.0.0.9/s")
+        clock.now += 2
+    assert sorted(uris) == ["10.0.0.1", "10.0.0.2", "10.0.0.9"]
+    assert fetched[0] == ("http://10.0.0.1/snap.jpg", "admin")
+    assert grab.calls == ["rtsp://10.0.0.2/s", "rtsp://10.0.0.9/s"] * 2
+
+    # Bulunamayan ONVIF adresi kalıcı olarak önbelleklenmez
+    clock.now += 60
+    snaps.get(legacy)
+    snaps.get(onvif)
+    assert sorted(uris) == ["10.0.0.1", "10.0.0.2", "10.0.0.9", "10.0.0.9"]
+
+    # Hatalar da TTL boyunca önbellekte kalır
+    failing = app.CameraSnapshots({"ttl": 10}, rtsp_grab=lambda *a: 1 / 0, clock=clock)
+    camera = {"name": "D", "url": "rtsp://x"}
+    assert failing.get(camera)[0] is None and failing.get(camera)[1] == "division by zero"
+    assert failing.fetches == 1
+
+
+def test_slow_capture_returns_stale_image_without_blocking():
+    clock = Clock()
+    release = threading.Event()
+    frames = iter([JPEG + b"eski", JPEG + b"yeni"])
+
+    def grab(url, width=640, timeout=5):
+        data = next(frames)
+        if data.endswith(b"yeni"):
+            release.wait(5)
+        return data
+
+    snaps = app.CameraSnapshots({"ttl": 10, "timeout": 0.05}, rtsp_grab=grab, clock=clock)
+    camera = {"name": "Kapı", "url": "rtsp://kapi/s"}
+    assert snaps.get(camera) == (JPEG + b"eski", None)
+    clock.now += 11
+    started = time.monotonic()
+    assert snaps.get(camera) == (JPEG + b"eski", None)
+    assert time.monotonic() - started < 1
+
+    # Önbellekte görüntü yoksa hata döner; çekim arka planda tamamlanır
+    slow = app.CameraSnapshots({"timeout": 0.05}, rtsp_grab=lambda *a: release.wait(5) and JPEG, clock=clock)
+    assert slow.get({"name": "Bahçe", "url": "rtsp://bahce/s"}) == (None, "zaman aşımı")
+    release.set()
+    deadline = time.monotonic() + 5
+    while snaps.fetches < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert snaps.get(camera) == (JPEG + b"yeni", None)
+
+
+def test_http_snapshot_uses_camera_credentials():
+    camera_app = Flask("kamera")
+
+    @camera_app.route("/snap.jpg")
+    def snap():
+        expected = "Basic " + base64.b64encode(b"admin:gizli").decode()
+        if request.headers.get("Authorization") != expected:
+            return Response(status=401, headers={"WWW-Authenticate": 'Basic realm="cam"'})
+        return Response(JPEG, mimetype="image/jpeg")
+
+    server = make_server("127.0.0.1", 0, camera_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/snap.jpg"
+        assert app.fetch_http_snapshot(url, "admin", "gizli", timeout=5) == JPEG
+        with pytest.raises(Exception):
+            app.fetch_http_snapshot(url, "admin", "yanlis", timeout=5)
+    finally:
+        server.shutdown()
+
+
+def test_snapshot_endpoint_serves_cached_jpeg(monkeypatch):
+    grab = SlowGrab(delay=0)
+    monkeypatch.setattr(app, "snapshots", app.CameraSnapshots({"ttl": 10}, rtsp_grab=grab))
+    monkeypatch.setitem(app.player.config, "cameras", [{"name": "Kapı", "url": "rtsp://kapi/s"}])
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        client = app.app.test_client()
+        res = client.get("/cameras/snapshot?name=Kapı")
+        assert res.mimetype == "image/jpeg" and res.data.startswith(b"\xff\xd8")
+        assert res.headers["Cache-Control"] == "private, max-age=10"
+        again = client.get("/cameras/snapshot?name=Kapı", headers={"If-None-Match": res.headers["ETag"]})
+        assert again.status_code == 304
+        assert len(grab.calls) == 1
+        assert client.get("/cameras").json["snapshot_ttl"] == 10
+        assert client.get("/cameras/snapshot?name=Yok").json["success"] is False
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+def test_display_ready_checks_x11_socket():
+    with patch.dict(os.environ, {"DISPLAY": ":7", "WAYLAND_DISPLAY": ""}):
+        with patch("os.path.exists", return_value=False) as exists:
+            assert not app.display_ready()
+        exists.assert_called_with("/tmp/.X11-unix/X7")
+
+
+def test_display_ready_checks_wayland_socket(tmp_path):
+    (tmp_path / "wayland-1").touch()
+    env = {"WAYLAND_DISPLAY": "wayland-1", "XDG_RUNTIME_DIR": str(tmp_path)}
+    with patch.dict(os.environ, env):
+        assert app.display_ready()
+
+
+def test_media_ready_requires_mount(tmp_path):
+    with patch.object(app, "VIDEO_DIR", str(tmp_path)):
+        assert app.media_ready({})
+        assert not app.media_ready({"media_mount": str(tmp_path)})
+
+
+def test_wait_until_returns_as_soon_as_ready():
+    calls = []
+
+    def check():
+        calls.append(1)
+        return len(calls) >= 3
+
+    assert app.wait_until(check, timeout=5, interval=0)
+    assert len(calls) == 3
+    assert not app.wait_until(lambda: False, timeout=0, interval=0)
+
+
+def test_startup_timer_report():
+    timer = app.StartupTimer()
+    timer.mark("one")
+    timer.mark("two")
+    report = timer.report()
+    assert [p["phase"] for p in report["phases"]] == ["one", "two"]
+    assert report["total"] == report["phases"][-1]["at"]
+
+
+def test_scheduler_not_started_at_import():
+    assert app.player._scheduler is None or not app.player._scheduler.running
+
+
+def test_pillow_not_imported_at_startup():
+    code = "import sys, app; print('PIL' in sys.modules)"
+    root = os.path.dirname(os.path.abspath(app.__file__))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=60)
+    assert result.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,187 @@
+import io
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+KB = 1024
+DAY = 86400
+
+
+class FakeDisk:
+    """statvfs yerine: kapasiteden, dizindeki benzersiz inode boyutları düşülür"""
+
+    def __init__(self, root, capacity):
+        self.root = root
+        self.capacity = capacity
+
+    def used(self):
+        seen, total = set(), 0
+        for base, _, files in os.walk(self.root):
+            for name in files:
+                st = os.lstat(os.path.join(base, name))
+                if st.st_ino not in seen:
+                    seen.add(st.st_ino)
+                    total += st.st_size
+        return total
+
+    def __call__(self, path):
+        used = self.used()
+        return SimpleNamespace(
+            f_frsize=1, f_blocks=self.capacity, f_bfree=self.capacity - used, f_bavail=self.capacity - used
+        )
+
+
+class FakePlayer:
+    playlist_file_name = app.MediaPlayer.playlist_file_name
+    playlist_files = app.MediaPlayer.playlist_files
+
+    def __init__(self, output=None):
+        self.config = {"default_video": "default.mp4", "schedule": [], "playlists": {}}
+        self.output = output
+        self.name = output["name"] if output else app.PRIMARY_OUTPUT
+        self.current_media = []
+        self.current_playlist = None
+        self.current_replay = None
+
+
+def write(path, size, age_days=0):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    stamp = time.time() - age_days * DAY
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.fixture
+def env(tmp_path):
+    dirs = {name: tmp_path / name for name in ("videos", "images", "logs", "playlists")}
+    for d in dirs.values():
+        d.mkdir()
+    library = app.MediaLibrary(str(tmp_path / "library_index.json"))
+    player = FakePlayer()
+    disk = FakeDisk(str(tmp_path), 1000 * KB)
+    settings = {
+        "reserve_mb": 100 / 1024,
+        "high_water_percent": 80,
+        "low_water_percent": 50,
+        "evict_media": True,
+        "protect_recent_hours": 24,
+        "log_keep_mb": 10 / 1024,
+    }
+    with patch.object(app, "VIDEO_DIR", str(dirs["videos"])), \
+        patch.object(app, "IMAGE_DIR", str(dirs["images"])), \
+        patch.object(app, "LOG_DIR", str(dirs["logs"])), \
+        patch.object(app, "PLAYLIST_DIR", str(dirs["playlists"])), \
+        patch.object(app, "BASE_DIR", str(tmp_path)):
+        manager = app.StorageManager(player, library, settings, statvfs=disk)
+        yield SimpleNamespace(dirs=dirs, library=library, player=player, disk=disk, storage=manager)
+
+
+def test_cache_tiers_are_evicted_before_media(env):
+    v = env.dirs["videos"]
+    write(v / "old.mp4", 200 * KB, age_days=30)
+    write(v / "abandoned.mp4.part", 300 * KB, age_days=2)
+    write(env.dirs["logs"] / "app.log", 100 * KB)
+    write(env.dirs["playlists"] / "eski.m3u", 1 * KB)
+
+    report = env.storage.evict(target_free=env.disk.capacity - 230 * KB)
+    tiers = [a["tier"] for a in report["actions"]]
+    assert tiers == ["partial", "playlists", "logs"]
+    assert (v / "old.mp4").exists()
+    assert os.path.getsize(env.dirs["logs"] / "app.log") <= 10 * KB
+
+
+def test_active_playlists_of_all_outputs_are_kept(env):
+    p = env.dirs["playlists"]
+    second = FakePlayer({"name": "hdmi2"})
+    env.storage.others = [second]
+    second.current_playlist = "ogle"
+    env.player.current_replay = "Kapı"
+    kept = [app.playlist_file_basename(n) for n in ("hdmi2-ogle", "replay-Kapı")]
+    for name in kept + ["ogle.m3u", "hdmi2-aksam.m3u"]:
+        write(p / name, 1 * KB)
+
+    report = env.storage.evict(target_free=env.disk.capacity)
+    assert sorted(os.path.basename(a["path"]) for a in report["actions"] if a["tier"] == "playlists") == [
+        "hdmi2-aksam.m3u", "ogle.m3u"
+    ]
+    assert sorted(os.listdir(p)) == sorted(kept)
+
+
+def test_lru_media_eviction_respects_protection(env):
+    v, i = env.dirs["videos"], env.dirs["images"]
+    write(v / "default.mp4", 120 * KB, age_days=90)
+    write(v / "scheduled.mp4", 120 * KB, age_days=90)
+    env.player.config["default_video"] = "videos/default.mp4"
+    write(v / "playing.mp4", 120 * KB, age_days=90)
+    write(v / "fresh.mp4", 120 * KB)
+    write(v / "older.mp4", 120 * KB, age_days=60)
+    write(v / "newer.mp4", 120 * KB, age_days=20)
+    write(i / "listed.png", 120 * KB, age_days=90)
+    env.player.config["schedule"] = [{"source": "video", "video": "videos/scheduled.mp4"}]
+    env.player.config["playlists"] = {"p": {"items": [{"type": "image", "file": "listed.png"}]}}
+    env.player.current_media = [("video", "playing.mp4")]
+    # newer.mp4 yakın zamanda oynatılmamış ama older.mp4 daha eski kullanılmış
+    env.library.played["video"]["older.mp4"] = time.time() - 40 * DAY
+
+    assert [g["files"][0]["name"] for g in env.storage.media_candidates()] == ["older.mp4", "newer.mp4"]
+
+    env.storage.settings["low_water_percent"] = 75
+    report = env.storage.enforce()
+    assert [a["files"][0]["name"] for a in report["actions"]] == ["older.mp4"]
+    remaining = sorted(os.listdir(v))
+    assert "older.mp4" not in remaining and "newer.mp4" in remaining
+    assert env.disk(str(v)).f_bavail >= report["target_free"]
+
+
+def test_hard_linked_copies_evicted_together_and_counted_once(env):
+    v = env.dirs["videos"]
+    write(v / "a.mp4", 300 * KB, age_days=30)
+    os.link(v / "a.mp4", v / "b.mp4")
+    write(v / "c.mp4", 300 * KB, age_days=30)
+    os.link(v / "c.mp4", v / "default.mp4")
+
+    usage = env.storage.usage()
+    assert [e["files"] for e in usage["evictable"]] == [
+        [{"kind": "video", "name": "a.mp4"}, {"kind": "video", "name": "b.mp4"}]
+    ]
+    assert usage["evictable"][0]["bytes"] == 300 * KB
+
+    report = env.storage.evict(target_free=env.disk.capacity)
+    assert report["freed_bytes"] == 300 * KB
+    assert sorted(os.listdir(v)) == ["c.mp4", "default.mp4"]
+
+
+def test_preflight_rejects_when_space_cannot_be_freed(env):
+    env.storage.settings["evict_media"] = False
+    write(env.dirs["videos"] / "big.mp4", 900 * KB, age_days=30)
+    ok, message = env.storage.preflight(50 * KB)
+    assert not ok and "Yetersiz disk alanı" in message
+    assert (env.dirs["videos"] / "big.mp4").exists()
+
+    env.storage.settings["evict_media"] = True
+    ok, _ = env.storage.preflight(50 * KB)
+    assert ok and not (env.dirs["videos"] / "big.mp4").exists()
+
+
+def test_upload_rejected_before_reading_body(env):
+    write(env.dirs["videos"] / "default.mp4", 900 * KB)
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        with patch.object(app, "storage", env.storage):
+            res = app.app.test_client().post(
+                "/upload",
+                data={"files[]": (io.BytesIO(b"y" * 10 * KB), "new.mp4")},
+                content_type="multipart/form-data",
+            )
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
+    assert res.json["success"] is False
+    assert not (env.dirs["videos"] / "new.mp4").exists()
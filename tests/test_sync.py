@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+BLOCK = 64 * 1024
+
+
+@pytest.fixture
+def peer(tmp_path):
+    """Geri döngü adresinde çalışan yayıncı örneği"""
+    video_dir = tmp_path / "leader_videos"
+    image_dir = tmp_path / "leader_images"
+    video_dir.mkdir()
+    image_dir.mkdir()
+    config = dict(app.player.config, sync={"token": "secret", "block_size": BLOCK})
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), \
+        patch.object(app, "IMAGE_DIR", str(image_dir)), \
+        patch.object(app, "library", app.MediaLibrary()), \
+        patch.object(app.player, "config", config):
+        server = make_server("127.0.0.1", 0, app.app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_port}", video_dir
+        server.shutdown()
+
+
+def make_client(peer_url, tmp_path, **kwargs):
+    dirs = {"video": tmp_path / "follower_videos", "image": tmp_path / "follower_images"}
+    for d in dirs.values():
+        d.mkdir(exist_ok=True)
+    client = app.SyncClient(
+        peer_url, "secret", target_dirs={k: str(v) for k, v in dirs.items()}, **kwargs
+    )
+    return client, dirs["video"]
+
+
+def test_sync_rejects_bad_token(peer, tmp_path):
+    url, _ = peer
+    client = app.SyncClient(url, "wrong", target_dirs={"video": str(tmp_path), "image": str(tmp_path)})
+    with pytest.raises(Exception):
+        client.fetch_manifest()
+
+
+def test_sync_transfers_only_changed_blocks(peer, tmp_path):
+    url, leader_dir = peer
+    original = os.urandom(5 * BLOCK)
+    changed = original[: 2 * BLOCK] + os.urandom(BLOCK) + original[3 * BLOCK :]
+    (leader_dir / "promo.mp4").write_bytes(changed)
+
+    client, follower_dir = make_client(url, tmp_path, bandwidth_limit_kbps=0)
+    (follower_dir / "promo.mp4").write_bytes(original)
+
+    result = client.run()
+    assert result["files"] == ["promo.mp4"]
+    assert result["fetched_bytes"] == BLOCK
+    assert result["reused_bytes"] == 4 * BLOCK
+    assert (follower_dir / "promo.mp4").read_bytes() == changed
+
+    again = client.run()
+    assert again["files"] == []
+
+
+def test_sync_resumes_partial_transfer(peer, tmp_path):
+    url, leader_dir = peer
+    data = os.urandom(4 * BLOCK)
+    (leader_dir / "clip.mp4").write_bytes(data)
+
+    client, follower_dir = make_client(url, tmp_path)
+    (follower_dir / ("clip.mp4" + app.SYNC_PART_SUFFIX)).write_bytes(data[: 3 * BLOCK])
+
+    result = client.run()
+    assert result["resumed_bytes"] == 3 * BLOCK
+    assert result["fetched_bytes"] == BLOCK
+    assert (follower_dir / "clip.mp4").read_bytes() == data
+    assert not (follower_dir / ("clip.mp4" + app.SYNC_PART_SUFFIX)).exists()
+
+
+def test_delete_extraneous_keeps_protected_media(peer, tmp_path):
+    url, leader_dir = peer
+    (leader_dir / "promo.mp4").write_bytes(b"p" * 10)
+
+    client, follower_dir = make_client(
+        url, tmp_path, delete_extraneous=True, protected=lambda: {("video", "playing.mp4")}
+    )
+    (follower_dir / "playing.mp4").write_bytes(b"x")
+    (follower_dir / "old.mp4").write_bytes(b"y")
+
+    result = client.run()
+    assert result["removed"] == ["old.mp4"]
+    assert sorted(os.listdir(follower_dir)) == ["playing.mp4", "promo.mp4"]
+
+
+def test_rate_limiter_caps_throughput():
+    limiter = app.RateLimiter(100 * 1024)
+    with patch("time.sleep") as sleep:
+        limiter.consume(100 * 1024)
+        limiter.consume(50 * 1024)
+    assert sleep.call_args[0][0] == pytest.approx(0.5, abs=0.05)
@@ -0,0 +1,171 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeIPC:
+    def __init__(self):
+        self.props = {}
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def observe(self, name, observe_id):
+        pass
+
+    def get_property(self, name, default=None):
+        return self.props.get(name, default)
+
+    def emit(self, msg):
+        for callback in self.listeners:
+            callback(msg)
+
+    def load(self, path):
+        self.props.update({
+            "path": path,
+            "estimated-frame-number": 0,
+            "frame-drop-count": 0,
+            "decoder-frame-drop-count": 0,
+        })
+        self.emit({"event": "property-change", "id": app.TELEMETRY_OBSERVE_ID, "name": "path", "data": path})
+
+
+class FakeProcess:
+    pid = os.getpid()
+
+    def poll(self):
+        return None
+
+
+class FakePlayer:
+    def __init__(self):
+        self.ipc = FakeIPC()
+        self.current_process = FakeProcess()
+        self.current_source = "playlist"
+
+
+@pytest.fixture
+def env(tmp_path):
+    video_dir = tmp_path / "videos"
+    image_dir = tmp_path / "images"
+    video_dir.mkdir()
+    image_dir.mkdir()
+    for name in ("a.mp4", "b.mp4"):
+        (video_dir / name).write_bytes(b"x" * 10)
+    player = FakePlayer()
+    clock = Clock()
+    with patch.object(app, "VIDEO_DIR", str(video_dir)), patch.object(app, "IMAGE_DIR", str(image_dir)):
+        tel = app.PlaybackTelemetry(player, {"min_frames": 100}, str(tmp_path / "telemetry.json"), clock=clock)
+        yield tel, player.ipc, clock, video_dir
+
+
+def play(ipc, tel, clock, frames, dropped, decoder_dropped=0, fps=25.0, steps=2):
+    """Öğeyi ``steps`` örnek boyunca eşit artışlarla oynat"""
+    ipc.props.update({"estimated-vf-fps": fps, "container-fps": 25.0, "hwdec-current": "drm"})
+    ipc.props["video-params"] = {"w": 1920, "h": 1080, "pixelformat": "yuv420p"}
+    for step in range(1, steps + 1):
+        clock.now += 2
+        ipc.props["estimated-frame-number"] = frames * step // steps
+        ipc.props["frame-drop-count"] = dropped * step // steps
+        ipc.props["decoder-frame-drop-count"] = decoder_dropped * step // steps
+        tel.poll()
+
+
+def test_stats_aggregated_per_file_and_loop_restart(env):
+    tel, ipc, clock, video_dir = env
+    a, b = str(video_dir / "a.mp4"), str(video_dir / "b.mp4")
+    ipc.load(a)
+    play(ipc, tel, clock, frames=250, dropped=20, fps=18.0)
+    ipc.emit({"event": "end-file", "reason": "eof"})
+    ipc.load(b)
+    play(ipc, tel, clock, frames=250, dropped=0)
+    # Tek dosyalık döngü: yol değişmez, sayaçlar sıfırlanır
+    ipc.emit({"event": "end-file", "reason": "eof"})
+    ipc.props.update({"estimated-frame-number": 0, "frame-drop-count": 0})
+    play(ipc, tel, clock, frames=250, dropped=0)
+    ipc.emit({"event": "end-file", "reason": "eof"})
+
+    first = tel.summary("video", "a.mp4")
+    assert first["plays"] == 1 and first["frames"] == 250
+    assert first["drop_percent"] == 8.0
+    assert first["hwdec"] == "drm" and first["video_params"] == "1920x1080 yuv420p"
+    assert first["problems"] == ["Kare kaybı %8.0", "Düşük kare hızı (18.0/25 fps)"]
+
+    second = tel.summary("video", "b.mp4")
+    assert second["plays"] == 2 and second["frames"] == 500
+    assert second["problems"] == []
+    assert tel.problems("video") == {"a.mp4": first["problems"]}
+
+
+def test_short_skip_is_not_counted_as_play(env):
+    tel, ipc, clock, video_dir = env
+    ipc.load(str(video_dir / "a.mp4"))
+    clock.now += 1
+    ipc.load(str(video_dir / "b.mp4"))
+    assert tel.summary("video", "a.mp4") is None
+
+    clock.now += 10
+    ipc.emit({"event": "ipc-disconnected"})
+    assert tel.summary("video", "b.mp4")["plays"] == 1
+
+
+def test_stats_persist_and_reset_when_file_replaced(env):
+    tel, ipc, clock, video_dir = env
+    ipc.load(str(video_dir / "a.mp4"))
+    play(ipc, tel, clock, frames=200, dropped=50)
+    ipc.emit({"event": "end-file", "reason": "eof"})
+    tel.save()
+
+    reloaded = app.PlaybackTelemetry(FakePlayer(), {"min_frames": 100}, tel.store_file, clock=clock)
+    assert reloaded.summary("video", "a.mp4")["drop_percent"] == 25.0
+
+    (video_dir / "a.mp4").write_bytes(b"yeniden kodlandi")
+    ipc.load(str(video_dir / "a.mp4"))
+    play(ipc, tel, clock, frames=200, dropped=0)
+    ipc.emit({"event": "end-file", "reason": "eof"})
+    assert tel.summary("video", "a.mp4")["frames"] == 200
+    assert tel.problems("video") == {}
+
+
+def test_library_listing_flags_problem_media(env, monkeypatch):
+    tel, ipc, clock, video_dir = env
+    ipc.load(str(video_dir / "a.mp4"))
+    play(ipc, tel, clock, frames=200, dropped=0, decoder_dropped=40)
+    ipc.emit({"event": "end-file", "reason": "eof"})
+
+    monkeypatch.setattr(app, "telemetry", tel)
+    monkeypatch.setattr(app, "library", app.MediaLibrary())
+    app.app.config["LOGIN_DISABLED"] = True
+    try:
+        client = app.app.test_client()
+        listing = client.get("/videos")
+        assert listing.json["problems"] == {"a.mp4": ["Kod çözücü kare kaybı %20.0"]}
+        detailed = client.get("/videos?details=1").json
+        assert detailed["items"][0]["playback"]["decoder_drop_percent"] == 20.0
+        assert detailed["items"][1]["playback"] is None
+
+        # Sorunsuz yeni oynatma liste ETag'ini değiştirmez
+        ipc.load(str(video_dir / "b.mp4"))
+        play(ipc, tel, clock, frames=200, dropped=0)
+        ipc.emit({"event": "end-file", "reason": "eof"})
+        again = client.get("/videos", headers={"If-None-Match": listing.headers["ETag"]})
+        assert again.status_code == 304
+
+        report = client.get("/telemetry").json
+        assert report["success"] and report["media"]["video"]["b.mp4"]["plays"] == 1
+    finally:
+        app.app.config["LOGIN_DISABLED"] = False
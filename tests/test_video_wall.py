@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import app
+
+
+class FakeIPC:
+    def __init__(self, time_pos, path="/videos/a.mp4", playlist=("a.mp4", "b.mp4")):
+        self.props = {
+            "playlist-pos": 0,
+            "time-pos": time_pos,
+            "path": path,
+            "playlist": [{"filename": f"/videos/{p}"} for p in playlist],
+            "speed": 1.0,
+        }
+        self.commands = []
+
+    def command(self, *args, timeout=None):
+        self.commands.append(args)
+        if args[0] == "get_property":
+            return self.props[args[1]]
+        if args[0] == "seek":
+            self.props["time-pos"] = args[1]
+        return None
+
+    def set_property(self, name, value):
+        self.commands.append(("set_property", name, value))
+        self.props[name] = value
+
+
+SETTINGS = {"tolerance": 0.04, "seek_threshold": 1.0, "speed_gain": 0.5, "max_speed_adjust": 0.05}
+
+
+@pytest.mark.parametrize(
+    "leader_time, local_time, expected",
+    [
+        (10.0, 10.02, ("ok", 1.0)),
+        (10.0, 9.9, ("speed", 1.05)),
+        (10.0, 10.04 + 0.02, ("speed", 0.97)),
+        (10.0, 5.0, ("seek", 10.0)),
+    ],
+)
+def test_decide(leader_time, local_time, expected):
+    wall = app.VideoWallSync(FakeIPC(local_time), SETTINGS)
+    leader = {"file": "a.mp4", "time": leader_time}
+    local = {"file": "a.mp4", "time": local_time}
+    assert wall.decide(leader, local) == expected
+
+
+def test_follower_switches_to_leader_file():
+    ipc = FakeIPC(3.0)
+    wall = app.VideoWallSync(ipc, SETTINGS)
+    wall.apply({"file": "b.mp4", "time": 1.0, "pos": 1})
+    assert ("set_property", "playlist-pos", 1) in ipc.commands
+
+
+def test_leader_and_follower_over_loopback_multicast():
+    settings = dict(SETTINGS, interface="127.0.0.1", port=42431, interval=0.05, name="test-wall")
+    leader_ipc = FakeIPC(20.0)
+    follower_ipc = FakeIPC(12.0)
+    leader = app.VideoWallSync(leader_ipc, dict(settings, role="leader"))
+    follower = app.VideoWallSync(follower_ipc, dict(settings, role="follower"))
+    try:
+        follower.start()
+        leader.start()
+        deadline = time.time() + 3
+        while time.time() < deadline and not follower.stats["seeks"]:
+            time.sleep(0.05)
+    finally:
+        leader.stop()
+        follower.stop()
+    assert follower.stats["messages"] > 0
+    assert follower.stats["seeks"] >= 1
+    assert follower_ipc.props["time-pos"] == pytest.approx(20.0, abs=0.5)